@@ -0,0 +1,106 @@
+"""
+Measures the throughput of `TextChunker` on large TXT and MDX corpora.
+
+The corpora are synthetic unless files are given, and are streamed from disk line by
+line like the search tools do. When embedchain is installed, its character based text
+chunker is timed on the same text for comparison.
+
+    python benchmarks/chunking_benchmark.py --size-mb 20
+    python benchmarks/chunking_benchmark.py --mdx docs/*.mdx --txt notes/*.txt
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from typing import List
+
+from crewai_tools.tools.rag.chunker import TextChunker, TokenCounter
+
+WORDS = "agent crew task tool search embedding vector chunk index query model memory context answer document".split()
+
+
+def sentence(rng: random.Random) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(6, 24))).capitalize() + "."
+
+
+def synthetic_txt(path: str, size: int, rng: random.Random) -> None:
+    with open(path, "w") as file:
+        while file.tell() < size:
+            file.write(" ".join(sentence(rng) for _ in range(rng.randint(2, 8))) + "\n\n")
+
+
+def synthetic_mdx(path: str, size: int, rng: random.Random) -> None:
+    with open(path, "w") as file:
+        while file.tell() < size:
+            file.write(f"# {sentence(rng)}\n\n")
+            for _ in range(rng.randint(2, 5)):
+                file.write(f"## {sentence(rng)}\n\n{sentence(rng)} {sentence(rng)}\n\n")
+                if rng.random() < 0.5:
+                    code = "\n".join(f"tool.run('{rng.choice(WORDS)}')" for _ in range(rng.randint(3, 30)))
+                    file.write(f"```python\n{code}\n```\n\n")
+
+
+def run(label: str, paths: List[str], chunker: TextChunker) -> None:
+    size = sum(os.path.getsize(path) for path in paths)
+    start = time.perf_counter()
+    chunks = []
+    for path in paths:
+        with open(path, "r", encoding="utf-8", errors="replace") as file:
+            chunks.extend(chunker.chunks(file))
+    elapsed = time.perf_counter() - start
+    tokens = chunker.counter.counts([chunk.text for chunk in chunks])
+    print(
+        f"{label:<22}{size / 2**20:>9.1f}{elapsed:>9.2f}{size / 2**20 / elapsed:>9.1f}"
+        f"{len(chunks):>9}{statistics.mean(tokens):>9.0f}{max(tokens):>9}"
+    )
+
+
+def run_embedchain(label: str, paths: List[str], chunk_size: int) -> None:
+    try:
+        from embedchain.chunkers.text import TextChunker as EmbedchainTextChunker
+        from embedchain.config.add_config import ChunkerConfig
+    except ImportError:
+        return
+    chunker = EmbedchainTextChunker(ChunkerConfig(chunk_size=chunk_size * 4, chunk_overlap=0, length_function=len))
+    size = sum(os.path.getsize(path) for path in paths)
+    start = time.perf_counter()
+    count = 0
+    for path in paths:
+        with open(path, "r", encoding="utf-8", errors="replace") as file:
+            count += len(chunker.get_chunks(file.read()))
+    elapsed = time.perf_counter() - start
+    print(f"{label:<22}{size / 2**20:>9.1f}{elapsed:>9.2f}{size / 2**20 / elapsed:>9.1f}{count:>9}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--txt", nargs="*", default=[])
+    parser.add_argument("--mdx", nargs="*", default=[])
+    parser.add_argument("--size-mb", type=float, default=10)
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--chunk-overlap", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        rng = random.Random(args.seed)
+        txt, mdx = args.txt, args.mdx
+        if not txt and not mdx:
+            txt, mdx = [os.path.join(directory, "corpus.txt")], [os.path.join(directory, "corpus.mdx")]
+            synthetic_txt(txt[0], int(args.size_mb * 2**20), rng)
+            synthetic_mdx(mdx[0], int(args.size_mb * 2**20), rng)
+
+        counter = TokenCounter()
+        print(f"tokens counted with {'tiktoken' if counter.encoding is not None else 'the word approximation'}")
+        print(f"{'corpus':<22}{'MiB':>9}{'seconds':>9}{'MiB/s':>9}{'chunks':>9}{'tokens':>9}{'max':>9}")
+        for label, paths, markdown in (("txt", txt, False), ("mdx", mdx, True)):
+            if not paths:
+                continue
+            run(label, paths, TextChunker(args.chunk_size, args.chunk_overlap, markdown=markdown, counter=counter))
+            run_embedchain(f"{label} (embedchain)", paths, args.chunk_size)
+
+
+if __name__ == "__main__":
+    main()
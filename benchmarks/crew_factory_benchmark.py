@@ -0,0 +1,96 @@
+"""
+Measures how long `CrewFactory` takes to build every crew of a large synthetic agency.
+
+The agency JSON defines `--agents` agents spread over `--models` Ollama models and `--crews`
+crews of `--crew-size` agents each, every agent having a task. Crews are built with both
+agent policies, sequentially and on a thread pool, counting the agents and LLM clients
+constructed. Nothing is run, so no model server is needed, but crewai and
+langchain_community must be installed.
+
+    python benchmarks/crew_factory_benchmark.py --crews 200 --agents 50 --workers 8
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import tempfile
+import time
+
+from crewai_tools.tools.agent_factory.agent_factory import AgentFactory
+from crewai_tools.tools.crew_factory.crew_factory import CrewFactory
+from crewai_tools.tools.tool_registry.tool_registry import ToolRegistry
+
+
+def synthetic_agency(agents: int, crews: int, crew_size: int, models: int, rng: random.Random) -> dict:
+    roles = [f"Agent {number}" for number in range(agents)]
+    return {
+        "agents": [
+            {
+                "role": role,
+                "goal": f"Do the work of {role.lower()}",
+                "backstory": f"{role} has done this work for years.",
+                "model_name": f"model-{rng.randrange(models)}",
+                "verbose": False,
+                "tools": [],
+            }
+            for role in roles
+        ],
+        "crews": [
+            {
+                "name": f"Crew {number}",
+                "agents": members,
+                "tasks": [{"description": f"Task of {role} in crew {number}", "agent": role} for role in members],
+                "process": "sequential",
+                "verbose": False,
+            }
+            for number, members in ((number, rng.sample(roles, crew_size)) for number in range(crews))
+        ],
+    }
+
+
+def run(path: str, policy: str, workers: int) -> None:
+    # The factories report what they register, which would interleave with the results.
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        agent_factory = AgentFactory(path, ToolRegistry(json_file=None, entry_point_group=None), agent_policy=policy)
+        built = []
+        create_agent = agent_factory.create_agent
+        agent_factory.create_agent = lambda agent_info: built.append(agent_info["role"]) or create_agent(agent_info)
+        crew_factory = CrewFactory(path, agent_factory, max_workers=workers)
+        loaded = time.perf_counter()
+        crews = crew_factory.get_all_crews()
+        elapsed = time.perf_counter() - loaded
+    print(
+        f"{policy:<8}{workers:>9}{loaded - start:>9.3f}{elapsed:>9.3f}{len(crews):>9}"
+        f"{len(built):>9}{len(agent_factory._llms):>9}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--agents", type=int, default=50)
+    parser.add_argument("--crews", type=int, default=200)
+    parser.add_argument("--crew-size", type=int, default=4)
+    parser.add_argument("--models", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    # Agents without a model_name default to OpenAI, whose client wants a key even if never called.
+    os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "agency.json")
+        agency = synthetic_agency(args.agents, args.crews, args.crew_size, args.models, random.Random(args.seed))
+        with open(path, "w") as file:
+            json.dump(agency, file)
+
+        print(f"{'policy':<8}{'workers':>9}{'load s':>9}{'build s':>9}{'crews':>9}{'agents':>9}{'llms':>9}")
+        for policy in ("shared", "fresh"):
+            for workers in (1, args.workers):
+                run(path, policy, workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Compares full precision search with float16 and int8 quantized search.
+
+Reports recall@k against the exact full precision results, the memory held by the
+vectors and the mean query latency, with and without rescoring the candidates at
+full precision. Vectors are synthetic and clustered, normalized like embeddings.
+
+    python benchmarks/quantization_benchmark.py --vectors 100000 --dim 1536 --k 10
+"""
+import argparse
+import time
+
+import numpy as np
+
+from crewai_tools.adapters.quantization import QuantizedVectors, exact_scores, top_k
+
+
+def clustered_vectors(rng: np.random.Generator, count: int, dim: int, clusters: int) -> np.ndarray:
+    centers = rng.standard_normal((clusters, dim), dtype=np.float32)
+    vectors = centers[rng.integers(clusters, size=count)] + 0.5 * rng.standard_normal((count, dim), dtype=np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def recall(found: np.ndarray, expected: np.ndarray) -> float:
+    return len(np.intersect1d(found, expected)) / len(expected)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--vectors", type=int, default=50000)
+    parser.add_argument("--dim", type=int, default=1536)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--clusters", type=int, default=100)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--rescore-factor", type=int, default=4)
+    parser.add_argument("--metric", choices=["l2", "cosine", "dot"], default="l2")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    vectors = clustered_vectors(rng, args.vectors, args.dim, args.clusters)
+    queries = clustered_vectors(rng, args.queries, args.dim, args.clusters)
+
+    start = time.perf_counter()
+    expected = [top_k(exact_scores(vectors, query, args.metric), args.k)[0] for query in queries]
+    baseline = (time.perf_counter() - start) / len(queries)
+
+    print(f"{args.vectors} vectors of {args.dim} dimensions, {args.queries} queries, recall@{args.k}")
+    print(f"{'mode':<18}{'recall':>8}{'memory MiB':>12}{'latency ms':>12}")
+    print(f"{'float32':<18}{1:>8.3f}{vectors.nbytes / 2**20:>12.1f}{baseline * 1000:>12.2f}")
+
+    for dtype in ("float16", "int8"):
+        quantized = QuantizedVectors.from_array(vectors, dtype)
+        for rescore_factor in (None, args.rescore_factor):
+            recalls = []
+            start = time.perf_counter()
+            for query, exact in zip(queries, expected):
+                if rescore_factor is None:
+                    rows, _ = quantized.search(query, args.k, args.metric)
+                else:
+                    candidates, _ = quantized.search(query, args.k * rescore_factor, args.metric)
+                    best, _ = top_k(exact_scores(vectors[candidates], query, args.metric), args.k)
+                    rows = candidates[best]
+                recalls.append(recall(rows, exact))
+            latency = (time.perf_counter() - start) / len(queries)
+            mode = dtype if rescore_factor is None else f"{dtype} +rescore x{rescore_factor}"
+            print(f"{mode:<18}{np.mean(recalls):>8.3f}{quantized.nbytes / 2**20:>12.1f}{latency * 1000:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,7 @@ from .tools import (
 	DOCXSearchTool,
 	DirectoryReadTool,
 	FileReadTool,
+	FileContentSearchTool,
 	GithubSearchTool,
 	SerperDevTool,
 	TXTSearchTool,
@@ -1,12 +1,24 @@
-from typing import Any
+from typing import Any, Dict, List, Optional
 from crewai_tools.tools.rag.rag_tool import Adapter
 
 class EmbedchainAdapter(Adapter):
     embedchain_app: Any
     summarize: bool = False
+    where: Optional[Dict[str, Any]] = None
+    citation_keys: List[str] = []
 
     def query(self, question: str) -> str:
-        result, sources = self.embedchain_app.query(question, citations=True, dry_run=(not self.summarize))
+        result, sources = self.embedchain_app.query(
+            question, citations=True, dry_run=(not self.summarize), where=self.where
+        )
         if self.summarize:
             return result
-        return "\n\n".join([source[0] for source in sources])
+        return "\n\n".join(self._pack([self._cite(context, metadata) for context, metadata in sources]))
+
+    def _cite(self, context: str, metadata: Dict[str, Any]) -> str:
+        """Prefixes a retrieved chunk with the metadata locating it in its source, e.g. its page."""
+        labels = [f"{key}: {metadata[key]}" for key in self.citation_keys if metadata.get(key) is not None]
+        return f"[{', '.join(labels)}] {context}" if labels else context
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        return self.embedchain_app.embedding_model.embedding_fn(texts)
@@ -1,12 +1,14 @@
 from pathlib import Path
-from typing import Any, Callable
+from typing import Any, Callable, Optional
 
+import numpy as np
 from lancedb import DBConnection as LanceDBConnection
 from lancedb import connect as lancedb_connect
 from lancedb.table import Table as LanceDBTable
 from openai import Client as OpenAIClient
-from pydantic import Field, PrivateAttr
+from pydantic.v1 import Field, PrivateAttr
 
+from crewai_tools.adapters.quantization import Metric, Quantization, QuantizedVectors, exact_scores, top_k
 from crewai_tools.tools.rag.rag_tool import Adapter
 
 
@@ -21,24 +23,42 @@ def _default_embedding_function():
 
 
 class LanceDBAdapter(Adapter):
+    """
+    Searches a LanceDB table.
+
+    With `quantization` set to "float16" or "int8", the table's vectors are loaded once in
+    that compact form and queries are scored in memory against them, instead of by LanceDB.
+    The `top_k * rescore_factor` best candidates are then rescored against their full
+    precision vectors read back from the table, unless `rescore_factor` is None. Quantized
+    scores use `metric`, L2 distances by default like LanceDB's own search. The compact
+    vectors are reloaded whenever the table gets a new version.
+    """
+
     uri: str | Path
     table_name: str
     embedding_function: Callable = Field(default_factory=_default_embedding_function)
     top_k: int = 3
     vector_column_name: str = "vector"
     text_column_name: str = "text"
+    quantization: Optional[Quantization] = None
+    rescore_factor: Optional[int] = 4
+    metric: Metric = "l2"
 
     _db: LanceDBConnection = PrivateAttr()
     _table: LanceDBTable = PrivateAttr()
+    _vectors: Optional[QuantizedVectors] = PrivateAttr(default=None)
+    _vectors_version: Optional[int] = PrivateAttr(default=None)
 
-    def model_post_init(self, __context: Any) -> None:
+    def __init__(self, **data: Any):
+        # Adapters are pydantic v1 models, which have no `model_post_init` hook.
+        super().__init__(**data)
         self._db = lancedb_connect(self.uri)
         self._table = self._db.open_table(self.table_name)
 
-        return super().model_post_init(__context)
-
     def query(self, question: str) -> str:
         query = self.embedding_function([question])[0]
+        if self.quantization is not None:
+            return "\n".join(self._pack(self._quantized_search(np.asarray(query, dtype=np.float32))))
         results = (
             self._table.search(query, vector_column_name=self.vector_column_name)
             .limit(self.top_k)
@@ -46,4 +66,39 @@ class LanceDBAdapter(Adapter):
             .to_list()
         )
         values = [result[self.text_column_name] for result in results]
-        return "\n".join(values)
+        return "\n".join(self._pack(values))
+
+    def embed(self, texts: list[str]) -> list[list[float]]:
+        return self.embedding_function(texts)
+
+    def _quantized_search(self, query: np.ndarray) -> list[str]:
+        vectors = self._quantized_vectors()
+        dataset = self._table.to_lance()
+        if self.rescore_factor is None:
+            rows, _ = vectors.search(query, self.top_k, self.metric)
+            return dataset.take(rows.tolist(), columns=[self.text_column_name]).column(0).to_pylist()
+
+        rows, _ = vectors.search(query, self.top_k * self.rescore_factor, self.metric)
+        candidates = dataset.take(rows.tolist(), columns=[self.vector_column_name, self.text_column_name])
+        best, _ = top_k(exact_scores(_to_matrix(candidates.column(0)), query, self.metric), self.top_k)
+        texts = candidates.column(1).to_pylist()
+        return [texts[index] for index in best]
+
+    def _quantized_vectors(self) -> QuantizedVectors:
+        """Loads the table's vectors in their compact form, one batch at a time, unless already loaded for its current version."""
+        version = self._table.version
+        if self._vectors is None or self._vectors_version != version:
+            dataset = self._table.to_lance()
+            batches = dataset.to_batches(columns=[self.vector_column_name])
+            self._vectors = QuantizedVectors.from_batches(
+                (_to_matrix(batch.column(0)) for batch in batches), dataset.count_rows(), self.quantization
+            )
+            self._vectors_version = version
+        return self._vectors
+
+
+def _to_matrix(column: Any) -> np.ndarray:
+    """Converts an Arrow column of fixed size lists to a float32 matrix."""
+    if hasattr(column, "combine_chunks"):
+        column = column.combine_chunks()
+    return column.flatten().to_numpy(zero_copy_only=False).astype(np.float32, copy=False).reshape(len(column), -1)
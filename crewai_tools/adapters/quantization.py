@@ -0,0 +1,119 @@
+from typing import Iterable, Literal, Tuple
+
+import numpy as np
+
+Quantization = Literal["float16", "int8"]
+Metric = Literal["l2", "cosine", "dot"]
+
+_BLOCK_ROWS = 4096
+
+
+class QuantizedVectors:
+    """
+    Vectors kept in memory in a compact form, scored against queries without expanding them all.
+
+    With `float16` every component is stored on two bytes. With `int8` every vector is scaled
+    by its own factor so its largest component maps to 127, and stored on one byte per
+    component along with that scale. The exact norm of every vector is kept as well, so L2
+    distances and cosine similarities come out of a single dot product.
+
+    Scores are similarities, higher is better, an L2 distance being returned negated.
+
+    Attributes:
+        dtype (str): Either "float16" or "int8".
+        dim (int): The number of components of the vectors.
+    """
+
+    def __init__(self, dim: int, capacity: int, dtype: Quantization = "int8"):
+        if dtype not in ("float16", "int8"):
+            raise ValueError(f"Unsupported quantization {dtype}, use float16 or int8")
+        self.dtype = dtype
+        self.dim = dim
+        self._codes = np.empty((capacity, dim), dtype=np.float16 if dtype == "float16" else np.int8)
+        self._scales = np.ones(capacity, dtype=np.float32)
+        self._norms = np.empty(capacity, dtype=np.float32)
+        self._size = 0
+
+    @classmethod
+    def from_array(cls, vectors: np.ndarray, dtype: Quantization = "int8") -> "QuantizedVectors":
+        vectors = np.asarray(vectors, dtype=np.float32)
+        quantized = cls(vectors.shape[1], len(vectors), dtype)
+        quantized.add(vectors)
+        return quantized
+
+    @classmethod
+    def from_batches(cls, batches: Iterable[np.ndarray], count: int, dtype: Quantization = "int8") -> "QuantizedVectors":
+        """Quantizes `count` vectors arriving in batches, never holding more than one batch at full precision."""
+        quantized = None
+        for batch in batches:
+            batch = np.asarray(batch, dtype=np.float32)
+            if quantized is None:
+                quantized = cls(batch.shape[1], count, dtype)
+            quantized.add(batch)
+        return quantized if quantized is not None else cls(0, 0, dtype)
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def nbytes(self) -> int:
+        return self._codes[: self._size].nbytes + self._scales[: self._size].nbytes + self._norms[: self._size].nbytes
+
+    def add(self, vectors: np.ndarray) -> None:
+        vectors = np.asarray(vectors, dtype=np.float32)
+        start, end = self._size, self._size + len(vectors)
+        if end > len(self._codes):
+            grown = max(end, 2 * len(self._codes))
+            self._codes = np.resize(self._codes, (grown, self.dim))
+            self._scales = np.resize(self._scales, grown)
+            self._norms = np.resize(self._norms, grown)
+        self._norms[start:end] = np.linalg.norm(vectors, axis=1)
+        if self.dtype == "float16":
+            self._codes[start:end] = vectors
+        else:
+            scales = np.abs(vectors).max(axis=1) / 127
+            scales[scales == 0] = 1
+            self._scales[start:end] = scales
+            self._codes[start:end] = np.rint(vectors / scales[:, None])
+        self._size = end
+
+    def scores(self, query: np.ndarray, metric: Metric = "l2") -> np.ndarray:
+        """Scores every vector against the query, expanding the codes one block of rows at a time."""
+        query = np.asarray(query, dtype=np.float32)
+        dots = np.empty(self._size, dtype=np.float32)
+        for start in range(0, self._size, _BLOCK_ROWS):
+            end = min(start + _BLOCK_ROWS, self._size)
+            dots[start:end] = self._codes[start:end].astype(np.float32) @ query
+        dots *= self._scales[: self._size]
+        return similarities(dots, self._norms[: self._size], query, metric)
+
+    def search(self, query: np.ndarray, k: int, metric: Metric = "l2") -> Tuple[np.ndarray, np.ndarray]:
+        """Returns the row numbers of the `k` best scoring vectors and their scores, best first."""
+        return top_k(self.scores(query, metric), k)
+
+
+def similarities(dots: np.ndarray, norms: np.ndarray, query: np.ndarray, metric: Metric) -> np.ndarray:
+    if metric == "dot":
+        return dots
+    query_norm = float(np.linalg.norm(query))
+    if metric == "cosine":
+        return dots / np.maximum(norms * query_norm, np.finfo(np.float32).tiny)
+    if metric == "l2":
+        return 2 * dots - norms**2 - query_norm**2
+    raise ValueError(f"Unsupported metric {metric}, use l2, cosine or dot")
+
+
+def exact_scores(vectors: np.ndarray, query: np.ndarray, metric: Metric = "l2") -> np.ndarray:
+    """Scores full precision vectors the way `QuantizedVectors.scores` does, to rescore or compare against."""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    query = np.asarray(query, dtype=np.float32)
+    return similarities(vectors @ query, np.linalg.norm(vectors, axis=1), query, metric)
+
+
+def top_k(scores: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=scores.dtype)
+    candidates = np.argpartition(-scores, k - 1)[:k]
+    order = candidates[np.argsort(-scores[candidates], kind="stable")]
+    return order, scores[order]
@@ -4,6 +4,7 @@ from .directory_search_tool.directory_search_tool import DirectorySearchTool
 from .directory_read_tool.directory_read_tool import DirectoryReadTool
 from .docx_search_tool.docx_search_tool import DOCXSearchTool
 from .file_read_tool.file_read_tool import FileReadTool
+from .file_content_search_tool.file_content_search_tool import FileContentSearchTool
 from .github_search_tool.github_search_tool import GithubSearchTool
 from .serper_dev_tool.serper_dev_tool import SerperDevTool
 from .txt_search_tool.txt_search_tool import TXTSearchTool
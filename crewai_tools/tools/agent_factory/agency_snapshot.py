@@ -0,0 +1,267 @@
+import hashlib
+import json
+import os
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from crewai_tools.tools.storage import storage_path
+from crewai_tools.tools.tool_registry.tool_registry import ToolSpec
+
+SNAPSHOT_VERSION = 2
+"""Bumped whenever the layout of snapshots changes, so those saved before are compiled again."""
+
+PROCESSES = ("sequential", "hierarchical")
+
+
+class AgencyConfigError(ValueError):
+    """Raised when the agents, crews or tools JSON files don't define a valid agency, listing every problem found."""
+
+    def __init__(self, problems: List[str]):
+        self.problems = problems
+        super().__init__("Invalid agency configuration:\n" + "\n".join(f"- {problem}" for problem in problems))
+
+
+class AgencySnapshot:
+    """
+    The agents, crews and tools of JSON configuration files, validated and normalized once.
+
+    Agents are keyed by role and crews by name, tools are resolved to the (module, class) they
+    are imported from, and each agent and crew has a fingerprint of its definition, so a newer
+    snapshot of the same files tells which ones changed. Snapshots are saved as JSON under the
+    tools' storage directory along with the size and mtime of the files they were compiled
+    from, and only compiled again once one of those files changes. JSON only holds the
+    normalized definitions, so loading a snapshot can't run code the way unpickling could.
+
+    Attributes:
+        paths (Tuple[str, ...]): The JSON files defining the agents and crews.
+        tools_path (Optional[str]): The JSON file defining the tools, if any.
+        sources (Dict[str, Tuple[int, int]]): The size and mtime of every file compiled.
+        agents (Dict[str, Dict[str, Any]]): Normalized agent definitions keyed by role, in file order.
+        crews (Dict[str, Dict[str, Any]]): Normalized crew definitions keyed by name, in file order.
+        tools (Dict[str, ToolSpec]): Where the tools are imported from, keyed by their names.
+        fingerprints (Dict[Tuple[str, str], str]): Digests of the agent and crew definitions, keyed by ("agent", role) or ("crew", name).
+    """
+
+    def __init__(
+        self,
+        paths: Sequence[str],
+        tools_path: Optional[str],
+        sources: Dict[str, Tuple[int, int]],
+        agents: Dict[str, Dict[str, Any]],
+        crews: Dict[str, Dict[str, Any]],
+        tools: Dict[str, ToolSpec],
+    ):
+        self.paths = tuple(paths)
+        self.tools_path = tools_path
+        self.sources = sources
+        self.agents = agents
+        self.crews = crews
+        self.tools = tools
+        self.fingerprints = {
+            **{("agent", role): _fingerprint([agent, [tools.get(tool["type"]) for tool in agent["tools"]]]) for role, agent in agents.items()},
+            **{("crew", name): _fingerprint(crew) for name, crew in crews.items()},
+        }
+
+    def to_json(self) -> Dict[str, Any]:
+        """Returns the snapshot as JSON data, the fingerprints being computed again on load."""
+        return {
+            "version": SNAPSHOT_VERSION,
+            "paths": list(self.paths),
+            "tools_path": self.tools_path,
+            "sources": self.sources,
+            "agents": self.agents,
+            "crews": self.crews,
+            "tools": list(self.tools.values()),
+        }
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> "AgencySnapshot":
+        """Rebuilds a snapshot saved with `to_json`, raising ValueError if it was saved by another version."""
+        if data.get("version") != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported snapshot version {data.get('version')!r}")
+        sources = {path: tuple(source) if source is not None else None for path, source in data["sources"].items()}
+        tools = {name: ToolSpec(name, module, class_name) for name, module, class_name in data["tools"]}
+        return cls(data["paths"], data["tools_path"], sources, data["agents"], data["crews"], tools)
+
+    def is_current(self) -> bool:
+        """Whether none of the files the snapshot was compiled from changed since."""
+        return all(_source(path) == source for path, source in self.sources.items())
+
+    def changed_agents(self, previous: "AgencySnapshot") -> Set[str]:
+        """Returns the roles of the agents added, removed or modified since a previous snapshot."""
+        return self._changed("agent", previous)
+
+    def changed_crews(self, previous: "AgencySnapshot") -> Set[str]:
+        """Returns the names of the crews added, removed or modified since a previous snapshot, not counting their agents."""
+        return self._changed("crew", previous)
+
+    def _changed(self, kind: str, previous: "AgencySnapshot") -> Set[str]:
+        keys = [key for key in self.fingerprints.keys() | previous.fingerprints.keys() if key[0] == kind]
+        return {name for _, name in keys if self.fingerprints.get((kind, name)) != previous.fingerprints.get((kind, name))}
+
+
+def load_agency(paths: Sequence[str], tools_path: Optional[str] = None, snapshot_path: Optional[str] = None) -> AgencySnapshot:
+    """
+    Returns the snapshot of agency JSON files, loading the saved one while the files are unchanged, compiling and saving it otherwise.
+
+    Parameters:
+        paths (Sequence[str]): JSON files with "agents" and "crews" arrays, merged in order.
+        tools_path (Optional[str]): A JSON file of tool definitions, as read by ToolRegistry. When given,
+            the tool types of the agents are checked against it.
+        snapshot_path (Optional[str]): Where the snapshot is saved, by default a file of the tools' storage directory keyed by the paths.
+    """
+    paths = [os.path.abspath(path) for path in paths]
+    tools_path = os.path.abspath(tools_path) if tools_path else None
+    if snapshot_path is None:
+        key = hashlib.sha256(json.dumps([SNAPSHOT_VERSION, paths, tools_path]).encode("utf-8")).hexdigest()
+        snapshot_path = storage_path("agency", f"{key}.json")
+    try:
+        with open(snapshot_path, "r") as file:
+            snapshot = AgencySnapshot.from_json(json.load(file))
+        if snapshot.paths == tuple(paths) and snapshot.tools_path == tools_path and snapshot.is_current():
+            return snapshot
+    except (OSError, KeyError, TypeError, ValueError, AttributeError):
+        pass
+    snapshot = compile_agency(paths, tools_path)
+    os.makedirs(os.path.dirname(os.path.abspath(snapshot_path)), exist_ok=True)
+    tmp_path = f"{snapshot_path}.tmp"
+    with open(tmp_path, "w") as file:
+        json.dump(snapshot.to_json(), file)
+    os.replace(tmp_path, snapshot_path)
+    return snapshot
+
+
+def compile_agency(paths: Sequence[str], tools_path: Optional[str] = None) -> AgencySnapshot:
+    """
+    Validates and normalizes agency JSON files into a snapshot, without saving it.
+
+    Raises:
+        AgencyConfigError: Listing every problem found in the files.
+    """
+    problems: List[str] = []
+    # The files are stat'ed before they are read, so one changing while it is read is compiled again next time.
+    sources = {path: _source(path) for path in [*paths, *([tools_path] if tools_path else [])]}
+    tools = _compile_tools(tools_path, problems) if tools_path else {}
+    agents: Dict[str, Dict[str, Any]] = {}
+    crews: Dict[str, Dict[str, Any]] = {}
+    definitions = []
+    for path in paths:
+        data = _read_json(path, problems)
+        if data is None:
+            continue
+        if not isinstance(data, dict):
+            problems.append(f"{path}: expected an object with \"agents\" and \"crews\" arrays")
+            continue
+        definitions.append((path, data))
+    for path, data in definitions:
+        for position, agent_info in enumerate(_array(data, "agents", path, problems)):
+            agent = _compile_agent(agent_info, f"{path}: agents[{position}]", tools if tools_path else None, problems)
+            if agent is None:
+                continue
+            if agent["role"] in agents:
+                problems.append(f"{path}: agents[{position}]: role {agent['role']!r} is already defined")
+            else:
+                agents[agent["role"]] = agent
+    for path, data in definitions:
+        for position, crew_info in enumerate(_array(data, "crews", path, problems)):
+            crew = _compile_crew(crew_info, f"{path}: crews[{position}]", agents, problems)
+            if crew is None:
+                continue
+            if crew["name"] in crews:
+                problems.append(f"{path}: crews[{position}]: name {crew['name']!r} is already defined")
+            else:
+                crews[crew["name"]] = crew
+    if problems:
+        raise AgencyConfigError(problems)
+    return AgencySnapshot(paths, tools_path, sources, agents, crews, tools)
+
+
+def _compile_tools(path: str, problems: List[str]) -> Dict[str, ToolSpec]:
+    tools: Dict[str, ToolSpec] = {}
+    data = _read_json(path, problems)
+    if data is None:
+        return tools
+    if not isinstance(data, list):
+        problems.append(f"{path}: expected an array of tools")
+        return tools
+    for position, tool in enumerate(data):
+        if not isinstance(tool, dict) or not all(isinstance(tool.get(field), str) for field in ("name", "module", "class")):
+            problems.append(f"{path}: [{position}]: a tool needs \"name\", \"module\" and \"class\" strings")
+            continue
+        tools[tool["name"]] = ToolSpec(tool["name"], tool["module"], tool["class"])
+    return tools
+
+
+def _compile_agent(agent_info: Any, where: str, tools: Optional[Dict[str, ToolSpec]], problems: List[str]) -> Optional[Dict[str, Any]]:
+    if not isinstance(agent_info, dict):
+        problems.append(f"{where}: expected an object")
+        return None
+    missing = [field for field in ("role", "goal", "backstory") if not isinstance(agent_info.get(field), str) or not agent_info[field]]
+    if missing:
+        problems.append(f"{where}: missing {', '.join(missing)}")
+        return None
+    agent = dict(agent_info)
+    agent["tools"] = []
+    for position, tool_info in enumerate(agent_info.get("tools") or []):
+        if not isinstance(tool_info, dict) or not isinstance(tool_info.get("type"), str):
+            problems.append(f"{where}: tools[{position}]: a tool needs a \"type\"")
+        elif not isinstance(tool_info.get("config", {}), dict):
+            problems.append(f"{where}: tools[{position}]: \"config\" must be an object")
+        elif tools is not None and tool_info["type"] not in tools:
+            problems.append(f"{where}: tools[{position}]: unknown tool type {tool_info['type']!r}")
+        else:
+            agent["tools"].append({"type": tool_info["type"], "config": tool_info.get("config", {})})
+    return agent
+
+
+def _compile_crew(crew_info: Any, where: str, agents: Dict[str, Dict[str, Any]], problems: List[str]) -> Optional[Dict[str, Any]]:
+    if not isinstance(crew_info, dict) or not isinstance(crew_info.get("name"), str):
+        problems.append(f"{where}: a crew needs a \"name\"")
+        return None
+    crew = dict(crew_info)
+    crew["agents"] = list(dict.fromkeys(crew_info.get("agents") or []))
+    unknown = [role for role in crew["agents"] if role not in agents]
+    if unknown:
+        problems.append(f"{where}: unknown agent roles {unknown}")
+    if not crew["agents"]:
+        problems.append(f"{where}: a crew needs agents")
+    crew["process"] = crew_info.get("process") or "sequential"
+    if crew["process"] not in PROCESSES:
+        problems.append(f"{where}: process must be one of {PROCESSES}")
+    crew["tasks"] = []
+    for position, task_info in enumerate(crew_info.get("tasks") or []):
+        if not isinstance(task_info, dict) or not isinstance(task_info.get("description"), str):
+            problems.append(f"{where}: tasks[{position}]: a task needs a \"description\"")
+        elif task_info.get("agent") not in crew["agents"]:
+            problems.append(f"{where}: tasks[{position}]: agent {task_info.get('agent')!r} is not part of the crew")
+        else:
+            crew["tasks"].append(dict(task_info))
+    return crew
+
+
+def _array(data: Dict[str, Any], key: str, path: str, problems: List[str]) -> List[Any]:
+    value = data.get(key, [])
+    if not isinstance(value, list):
+        problems.append(f"{path}: \"{key}\" must be an array")
+        return []
+    return value
+
+
+def _read_json(path: str, problems: List[str]) -> Any:
+    try:
+        with open(path, "r") as file:
+            return json.load(file)
+    except (OSError, ValueError) as e:
+        problems.append(f"{path}: {e}")
+        return None
+
+
+def _source(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_size, stat.st_mtime_ns)
+
+
+def _fingerprint(definition: Any) -> str:
+    return hashlib.sha256(json.dumps(definition, sort_keys=True, default=repr).encode("utf-8")).hexdigest()
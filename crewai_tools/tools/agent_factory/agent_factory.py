@@ -1,7 +1,9 @@
 import json
-from typing import Dict, List, Any, Optional
+import threading
+from typing import Dict, List, Any, Optional, Set
 from crewai import Agent
-from crewai_tools.tools.base_tool import Tool
+from crewai_tools.tools.agent_factory.agency_snapshot import AgencySnapshot, load_agency
+from crewai_tools.tools.base_tool import BaseTool, Tool
 from crewai_tools.tools.tool_registry.tool_registry import ToolRegistry
 from langchain_community.llms.ollama import Ollama
 
@@ -14,14 +16,31 @@ class FactorizedAgent(Agent):
     def whoami(self) -> str:
         return f"{self.role}@{self.llm.model}"
 
+AGENT_POLICIES = ("shared", "fresh")
+"""Whether an agent is built once and shared by every crew, or built anew every time it is asked for."""
+
 class AgentFactory:
     """
     Facilitates the creation of Agent instances from definitions stored in a JSON file,
     using a ToolRegistry for dynamic tool assignment.
 
+    Agents are looked up by role through an index built when the definitions are loaded.
+    With the "shared" policy, each agent is built the first time it is asked for and the
+    same instance is returned afterwards, so crews sharing a role share its agent. With the
+    "fresh" policy, every call builds a new agent, for crews that must not share state.
+    Either way, agents using the same model share one LLM client.
+
+    A compiled factory loads its definitions from an AgencySnapshot, validated once and saved
+    until the JSON files change, and `reload` picks up later edits, rebuilding only the agents
+    whose definitions changed.
+
     Attributes:
         tool_registry (ToolRegistry): Manages tool assignments.
+        share_tools (bool): Whether agents with the same tool configuration share one pooled tool instance.
+        agent_policy (str): "shared" to build each agent once, "fresh" to build one per call.
         json_path (str): Path to the JSON file with agent definitions.
+        tools_json (Optional[str]): Path to the JSON file with tool definitions, "./tools.json" by default.
+        snapshot (Optional[AgencySnapshot]): The compiled definitions, if the factory is compiled.
         agents_data (List[Dict[str, Any]]): Loaded agent definitions from JSON.
 
     Methods:
@@ -33,15 +52,60 @@ class AgentFactory:
 
         get_all_agents() -> List[Agent]:
             Returns a list of all agents defined in the JSON file, instantiated with their respective tools.
+
+        get_agent_by_role(role: str, fresh: Optional[bool] = None) -> Optional[Agent]:
+            Returns the agent of a role, following the agent policy unless told otherwise.
+
+        release_agent(agent: Agent) -> None:
+            Releases the pooled tools held by an agent.
+
+        reload() -> Set[str]:
+            Picks up changes of the compiled JSON files, returning the roles of the agents that changed.
     """
-    def __init__(self, json_path: str, tool_registry = ToolRegistry()):
-        self.tool_registry: ToolRegistry = tool_registry
+    def __init__(
+        self,
+        json_path: str,
+        tool_registry: Optional[ToolRegistry] = None,
+        share_tools: bool = True,
+        agent_policy: str = "shared",
+        compiled: bool = False,
+        tools_json: Optional[str] = None,
+    ):
+        if agent_policy not in AGENT_POLICIES:
+            raise ValueError(f"agent_policy must be one of {AGENT_POLICIES}, not {agent_policy!r}")
         self.json_path: str = json_path
+        self.tools_json: Optional[str] = tools_json
+        self.snapshot: Optional[AgencySnapshot] = load_agency([json_path], tools_json) if compiled else None
+        if tool_registry is None:
+            # Built per factory rather than as a default argument, which would build it at import.
+            if self.snapshot is not None and tools_json:
+                tool_registry = ToolRegistry(json_file=None)
+                for spec in self.snapshot.tools.values():
+                    tool_registry.register_spec(*spec)
+            else:
+                tool_registry = ToolRegistry(json_file=tools_json or "./tools.json")
+        self.tool_registry: ToolRegistry = tool_registry
+        self.share_tools: bool = share_tools
+        self.agent_policy: str = agent_policy
+        self._llms: Dict[str, Ollama] = {}
+        self._lock = threading.Lock()
         self.agents_data: List[Dict[str, Any]] = self.load_agents_data()
+        self._index_agents()
         print(f'Registered {len(self.agents_data)} Agent(s)')
 
+    def _index_agents(self) -> None:
+        """Indexes the agent definitions by role, the first definition of a role winning as in a scan."""
+        self._roles: Dict[str, int] = {}
+        for position, agent_info in enumerate(self.agents_data):
+            self._roles.setdefault(agent_info['role'], position)
+        self._agents: Dict[int, FactorizedAgent] = {}
+        # One lock per definition, so different agents are built concurrently but each one once.
+        self._agent_locks = [threading.Lock() for _ in self.agents_data]
+
     def load_agents_data(self) -> List[Dict[str, Any]]:
-        """Loads and parses agent definitions from JSON."""
+        """Loads and parses agent definitions from JSON, or from the snapshot of a compiled factory."""
+        if self.snapshot is not None:
+            return list(self.snapshot.agents.values())
         with open(self.json_path, 'r') as file:
             data = json.load(file)
         return data.get('agents', [])
@@ -52,36 +116,103 @@ class AgentFactory:
         agent = FactorizedAgent(**basic_attrs)
 
         if "model_name" in agent_info:
-            agent.llm = Ollama(model=agent_info["model_name"])
+            agent.llm = self.llm(agent_info["model_name"])
     
         if "memory" in agent_info:
             agent.memory = agent_info["memory"]
 
         if "tools" in agent_info:
             for tool_info in agent_info["tools"]:
-                tool_class = self.tool_registry.get(tool_info["type"])
-                if tool_class:
-                    tool_instance = tool_class(**tool_info["config"])
+                tool_instance = self._tool(tool_info["type"], tool_info.get("config", {}))
+                if tool_instance is not None:
                     agent.tools.append(tool_instance)
                 else:
-                    print(f'no tool class found for {tool_class}')
+                    print(f'no tool class found for {tool_info["type"]}')
         return agent
 
+    def llm(self, model_name: str) -> Ollama:
+        """Returns the LLM client of a model, shared by every agent of the factory using it."""
+        with self._lock:
+            if model_name not in self._llms:
+                self._llms[model_name] = Ollama(model=model_name)
+            return self._llms[model_name]
+
+    def _tool(self, tool_type: str, config: Dict[str, Any]) -> Optional[BaseTool]:
+        if self.share_tools:
+            return self.tool_registry.acquire(tool_type, config)
+        tool_class = self.tool_registry.get(tool_type)
+        return tool_class(**config) if tool_class else None
+
+    def release_agent(self, agent: FactorizedAgent) -> None:
+        """Releases the shared tools of an agent that is no longer used, so the pool can drop those no other agent holds."""
+        for tool in agent.tools:
+            self.tool_registry.release(tool)
+
     def get_all_agents(self) -> List[FactorizedAgent]:
         """Returns a list of all instantiated agents."""
-        return [self.create_agent(agent_info) for agent_info in self.agents_data]
+        return [self._agent(position) for position in range(len(self.agents_data))]
 
-    def get_agent_by_role(self, role: str) -> Optional[FactorizedAgent]:
+    def get_agent_by_role(self, role: str, fresh: Optional[bool] = None) -> Optional[FactorizedAgent]:
         """
         Fetches a specific agent by its role.
 
         Args:
             role (str): The role of the agent to fetch.
+            fresh (Optional[bool]): Whether to build a new agent rather than return the shared one,
+                None to follow the factory's agent policy.
 
         Returns:
             Optional[Agent]: An instantiated Agent object if found, otherwise None.
         """
-        for agent_info in self.agents_data:
-            if agent_info['role'] == role:
-                return self.create_agent(agent_info)
-        return None
\ No newline at end of file
+        position = self._roles.get(role)
+        if position is None:
+            return None
+        return self._agent(position, fresh)
+
+    def _agent(self, position: int, fresh: Optional[bool] = None) -> FactorizedAgent:
+        if fresh is None:
+            fresh = self.agent_policy == "fresh"
+        if fresh:
+            return self.create_agent(self.agents_data[position])
+        with self._agent_locks[position]:
+            if position not in self._agents:
+                self._agents[position] = self.create_agent(self.agents_data[position])
+            return self._agents[position]
+
+    def reload(self) -> Set[str]:
+        """
+        Picks up changes of the JSON files of a compiled factory, returning the roles of the agents added, removed or modified.
+
+        Only the files' mtimes are checked while they are unchanged, so it can be called before
+        every use. Shared agents whose definitions changed are built again the next time they are
+        asked for, the others are kept. Factories that aren't compiled have nothing to reload.
+
+        Raises:
+            AgencyConfigError: If the changed files are invalid, in which case the current agents are kept.
+        """
+        previous = self.snapshot
+        if previous is None or previous.is_current():
+            return set()
+        snapshot = load_agency(previous.paths, previous.tools_path)
+        changed = snapshot.changed_agents(previous)
+        if self.tools_json:
+            for name, spec in snapshot.tools.items():
+                if previous.tools.get(name) != spec:
+                    self.tool_registry.register_spec(*spec)
+        with self._lock:
+            kept = {
+                self.agents_data[position]['role']: agent
+                for position, agent in self._agents.items()
+                if self.agents_data[position]['role'] not in changed
+            }
+            dropped = [agent for position, agent in self._agents.items() if self.agents_data[position]['role'] in changed]
+            self.snapshot = snapshot
+            self.agents_data = self.load_agents_data()
+            self._index_agents()
+            self._agents.update((self._roles[role], agent) for role, agent in kept.items())
+        if self.share_tools:
+            for agent in dropped:
+                self.release_agent(agent)
+        if changed:
+            print(f'Reloaded {len(changed)} Agent(s)')
+        return changed
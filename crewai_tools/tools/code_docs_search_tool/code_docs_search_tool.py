@@ -1,9 +1,6 @@
 from typing import Optional, Type, Any
 from pydantic.v1 import BaseModel, Field
 
-from embedchain import App
-from embedchain.models.data_type import DataType
-
 from ..rag.rag_tool import RagTool
 
 
@@ -21,6 +18,9 @@ class CodeDocsSearchTool(RagTool):
 	summarize: bool = False
 	args_schema: Type[BaseModel] = CodeDocsSearchToolSchema
 	docs_url: Optional[str] = None
+	crawl_depth: Optional[int] = None
+	max_pages: int = 5000
+	session: Optional[Any] = None
 
 	def __init__(self, docs_url: Optional[str] = None, **kwargs):
 		super().__init__(**kwargs)
@@ -36,6 +36,6 @@ class CodeDocsSearchTool(RagTool):
 		**kwargs: Any,
 	) -> Any:
 		docs_url = kwargs.get('docs_url', self.docs_url)
-		self.app = App()
-		self.app.add(docs_url, data_type=DataType.DOCS_SITE)
+		self._ensure_app()
+		self._index_site(docs_url, "code_docs_search", session=self.session, max_depth=self.crawl_depth, max_pages=self.max_pages)
 		return super()._run(query=search_query)
\ No newline at end of file
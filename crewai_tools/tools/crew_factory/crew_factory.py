@@ -1,44 +1,79 @@
 import json
-from typing import Dict, List, Any
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Set
 from crewai import Crew, Process, Task
 from pydantic import TypeAdapter
+from ..agent_factory.agency_snapshot import AgencySnapshot, load_agency
 from ..agent_factory.agent_factory import AgentFactory
-from langchain_community.llms.ollama import Ollama
+
+MANAGER_MODEL = "research-coordinator"
+"""The model managing hierarchical crews."""
 
 class CrewFactory:
     """
     Factory class for creating Crew objects from a JSON configuration.
 
+    Crews are looked up by name through an index built when the configuration is loaded.
+    Building a crew never modifies its configuration, so a crew can be built again from
+    it, and many crews can be built concurrently on a thread pool. Agents come from the
+    AgentFactory, whose agent policy decides whether crews share them.
+
+    A compiled factory loads its configurations from an AgencySnapshot of its JSON file and
+    the agent factory's, validated together once, so a crew naming an unknown agent fails at
+    startup rather than when it is built.
+
     Attributes:
         json_path (str): Path to the JSON file containing the crew configurations.
         agent_factory (AgentFactory): An instance of the AgentFactory to create agents for the crews.
         crews_data (List[Dict[str, Any]]): Loaded crew configurations from the JSON file.
+        max_workers (Optional[int]): Threads building crews concurrently, None for the executor's default.
+        snapshot (Optional[AgencySnapshot]): The compiled configurations, if the factory is compiled.
     """
-    def __init__(self, json_path: str, agent_factory: AgentFactory):
+    def __init__(self, json_path: str, agent_factory: AgentFactory, max_workers: Optional[int] = None, compiled: bool = False):
         self.json_path = json_path
         self.agent_factory = agent_factory
+        self.max_workers = max_workers
+        self.snapshot: Optional[AgencySnapshot] = None
+        if compiled:
+            paths = list(dict.fromkeys(os.path.abspath(path) for path in (agent_factory.json_path, json_path)))
+            self.snapshot = load_agency(paths, agent_factory.tools_json)
+        self._crew_adapter = TypeAdapter(Crew)
         self.crews_data = self.load_crews_data()
+        self._index_crews()
         print(f'Registered {len(self.crews_data)} Crew(s)')
 
     def load_crews_data(self) -> List[Dict[str, Any]]:
-        """Loads and returns the crew configurations from the JSON file."""
+        """Loads and returns the crew configurations from the JSON file, or from the snapshot of a compiled factory."""
+        if self.snapshot is not None:
+            return list(self.snapshot.crews.values())
         with open(self.json_path, 'r') as file:
             data = json.load(file)
         return data.get('crews', [])
 
-    def create_crew(self, crew_info: Dict[str, Any]) -> Crew:
+    def _index_crews(self) -> None:
+        """Indexes the crew configurations by name, the first configuration of a name winning as in a scan."""
+        self._names: Dict[str, int] = {}
+        for position, crew_info in enumerate(self.crews_data):
+            self._names.setdefault(crew_info.get('name'), position)
+
+    def create_crew(self, crew_info: Dict[str, Any], fresh: Optional[bool] = None) -> Optional[Crew]:
         """
-        Creates a Crew object from the provided configuration.
+        Creates a Crew object from the provided configuration, which is left untouched.
 
         Args:
             crew_info (Dict[str, Any]): The dictionary containing the configuration for the crew.
+            fresh (Optional[bool]): Whether to build new agents for the crew rather than share them,
+                by default as the agent factory's policy says.
 
         Returns:
-            Crew: An instantiated Crew object based on the provided configuration.
+            Crew: An instantiated Crew object based on the provided configuration, or None if it can't be built.
         """
-        
-        # Attempt to match and create agents based on their roles specified in crew_info
-        agents = [self.agent_factory.get_agent_by_role(agent_role) for agent_role in crew_info.get("agents", [])]
+
+        # Attempt to match and create agents based on their roles specified in crew_info,
+        # each role once even if it is listed twice.
+        roles = list(dict.fromkeys(crew_info.get("agents", [])))
+        agents = [self.agent_factory.get_agent_by_role(agent_role, fresh=fresh) for agent_role in roles]
 
         # Filter out None values if any agent was not found
         agents = list(filter(None, agents))
@@ -46,37 +81,44 @@ class CrewFactory:
         if not agents:
             print("Could not find specified agents for the crew.")
             return None
-        
-        updated_tasks = []
+
+        agents_by_role = {agent.role: agent for agent in agents}
+        tasks = []
         for task_info in crew_info.get("tasks", []):
             # Find the corresponding agent instance for each task
-            agent = next((agent for agent in agents if agent.role == task_info.get("agent")), None)
+            agent = agents_by_role.get(task_info.get("agent"))
             if agent:
-                task_info["agent"] = agent
-                updated_tasks.append(Task(**task_info))
+                tasks.append(Task(**{**task_info, "agent": agent}))
             else:
                 print(f"Agent with role {task_info.get('agent')} not found for tasks.")
 
-        # Ensure agents in crew_info are the instantiated Agent objects
-        crew_info["agents"] = agents
-        crew_info["tasks"] = updated_tasks 
-        if crew_info["process"] == "hierarchical":
-            crew_info["manager_llm"] = Ollama(model="research-coordinator")
+        # The crew is validated from a copy holding the instantiated Agent and Task objects.
+        crew_config = {**crew_info, "agents": agents, "tasks": tasks}
+        if crew_info.get("process") == "hierarchical":
+            crew_config["manager_llm"] = self.agent_factory.llm(MANAGER_MODEL)
 
         try:
-            crew_adapter = TypeAdapter(Crew)
-            crew = crew_adapter.validate_python(crew_info)
-            
-            return crew
+            return self._crew_adapter.validate_python(crew_config)
         except Exception as e:
             print(f"Error creating crew: {e}")
+            if fresh or (fresh is None and self.agent_factory.agent_policy == "fresh"):
+                # Agents built for this crew alone give back the pooled tools they hold.
+                for agent in agents:
+                    self.agent_factory.release_agent(agent)
             return None
 
+    def create_crews(self, crews_info: List[Dict[str, Any]], fresh: Optional[bool] = None) -> List[Optional[Crew]]:
+        """Creates the crews of several configurations concurrently, returning them in the same order, see `create_crew`."""
+        if len(crews_info) < 2 or self.max_workers == 1:
+            return [self.create_crew(crew_info, fresh=fresh) for crew_info in crews_info]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return list(executor.map(lambda crew_info: self.create_crew(crew_info, fresh=fresh), crews_info))
+
     def get_all_crews(self) -> List[Crew]:
-        """Returns a list of all Crew objects instantiated from the JSON configuration."""
-        return [self.create_crew(crew_info) for crew_info in self.crews_data if self.create_crew(crew_info)]
+        """Returns a list of all Crew objects instantiated from the JSON configuration, each built once."""
+        return [crew for crew in self.create_crews(self.crews_data) if crew]
 
-    def get_crew_by_name(self, name: str) -> Crew:
+    def get_crew_by_name(self, name: str) -> Optional[Crew]:
         """
         Fetches and instantiates a specific crew by its name from the loaded configurations.
 
@@ -86,11 +128,43 @@ class CrewFactory:
         Returns:
             Crew: The instantiated Crew object, if found; otherwise, None.
         """
-        for crew_info in self.crews_data:
-            if crew_info['name'] == name:
-                return self.create_crew(crew_info)
-        return None
-    
+        crew_info = self.get_crew_config(name)
+        return self.create_crew(crew_info) if crew_info is not None else None
+
+    def get_crew_config(self, name: str) -> Optional[Dict[str, Any]]:
+        """Returns the loaded configuration of a crew by its name, None if there is none."""
+        position = self._names.get(name)
+        return self.crews_data[position] if position is not None else None
+
+    def get_crews_by_name(self, names: List[str]) -> Dict[str, Optional[Crew]]:
+        """Fetches and instantiates several crews concurrently, None standing for those not found or not built."""
+        found = [name for name in dict.fromkeys(names) if name in self._names]
+        crews = dict(zip(found, self.create_crews([self.crews_data[self._names[name]] for name in found])))
+        return {name: crews.get(name) for name in names}
+
+    def reload(self) -> Set[str]:
+        """
+        Picks up changes of the JSON files, returning the names of the crews to build again.
+
+        Those are the crews added, removed or modified, and the crews of the agents the agent
+        factory reloaded. Crews are built on demand, so callers holding built crews only need
+        to build again the ones returned.
+
+        Raises:
+            AgencyConfigError: If the changed files are invalid, in which case the current crews are kept.
+        """
+        roles = self.agent_factory.reload()
+        changed: Set[str] = set()
+        previous = self.snapshot
+        if previous is not None and not previous.is_current():
+            snapshot = load_agency(previous.paths, previous.tools_path)
+            changed = snapshot.changed_crews(previous)
+            self.snapshot = snapshot
+            self.crews_data = self.load_crews_data()
+            self._index_crews()
+        changed.update(crew_info.get('name') for crew_info in self.crews_data if roles & set(crew_info.get('agents', [])))
+        return changed
+
 
 if __name__ == "__main__":
     # Example usage of the CrewFactory
@@ -0,0 +1,173 @@
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple, Union
+
+from crewai import Crew
+from .crew_factory import CrewFactory
+
+
+class CrewJob(NamedTuple):
+    """A crew to run, by name, with the inputs of its kickoff and a timeout overriding the scheduler's."""
+
+    name: str
+    inputs: Optional[Dict[str, Any]] = None
+    timeout: Optional[float] = None
+
+
+class CrewRun(NamedTuple):
+    """
+    The outcome of a crew run.
+
+    Attributes:
+        name (str): The name of the crew.
+        result (Any): What the crew's kickoff returned, None if it failed or timed out.
+        error (Optional[BaseException]): Why the crew couldn't be built or failed, if it did.
+        timed_out (bool): Whether the crew was still running at its deadline.
+        queued (float): Seconds the crew waited for a worker and its models.
+        elapsed (float): Seconds the crew ran, up to its deadline if it timed out.
+    """
+
+    name: str
+    result: Any = None
+    error: Optional[BaseException] = None
+    timed_out: bool = False
+    queued: float = 0.0
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and not self.timed_out
+
+
+def crew_models(crew: Crew) -> Set[str]:
+    """Returns the models the agents and manager of a crew generate with."""
+    llms = [getattr(agent, "llm", None) for agent in crew.agents] + [getattr(crew, "manager_llm", None)]
+    models = {getattr(llm, "model", None) or getattr(llm, "model_name", None) for llm in llms if llm is not None}
+    return {model for model in models if isinstance(model, str)}
+
+
+class CrewScheduler:
+    """
+    Runs the crews of a CrewFactory concurrently, without overloading the model servers.
+
+    At most `max_workers` crews run at once, and at most `model_limits[model]` of them, or
+    `default_model_limit`, use a given model. A crew holds a slot of every model its agents
+    and manager use for its whole run. Crews start in the order they were given, except that
+    a crew waiting for a busy model lets the following crews whose models are free start
+    first, so the workers stay busy.
+
+    A crew still running at its timeout is reported as timed out, but a thread can't be
+    stopped, so it keeps its worker and model slots until it actually returns. Crews run
+    concurrently must not share agents, so every crew is built with agents of its own,
+    whatever the policy of the factory's AgentFactory, and their pooled tools are released
+    once the crew returns. Pooled RAG tools keep the filters of each call apart, so crews
+    can still share them.
+
+    Attributes:
+        crew_factory (CrewFactory): Builds the crews to run.
+        max_workers (int): Crews running at once.
+        model_limits (Dict[str, int]): Crews running at once per model.
+        default_model_limit (Optional[int]): Crews running at once for models without a limit, None for no limit.
+        timeout (Optional[float]): Seconds a crew may run, None for no limit.
+    """
+
+    def __init__(
+        self,
+        crew_factory: CrewFactory,
+        max_workers: int = 4,
+        model_limits: Optional[Dict[str, int]] = None,
+        default_model_limit: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ):
+        limits = [max_workers, *(model_limits or {}).values(), *([default_model_limit] if default_model_limit is not None else [])]
+        if any(limit < 1 for limit in limits):
+            raise ValueError("max_workers and model limits must be at least 1")
+        self.crew_factory = crew_factory
+        self.max_workers = max_workers
+        self.model_limits = dict(model_limits or {})
+        self.default_model_limit = default_model_limit
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="crew")
+        self._condition = threading.Condition()
+        self._running = 0
+        self._models: Counter = Counter()
+
+    def run(self, jobs: Iterable[Union[str, CrewJob]]) -> List[CrewRun]:
+        """
+        Builds and runs crews, by name or as CrewJobs, returning their runs in the same order once all finished or timed out.
+
+        A crew named twice is built and run twice, each time with new agents.
+        """
+        jobs = [CrewJob(job) if isinstance(job, str) else job for job in jobs]
+        submitted = time.perf_counter()
+        configs = [self.crew_factory.get_crew_config(job.name) for job in jobs]
+        found = [position for position, config in enumerate(configs) if config is not None]
+        crews: List[Optional[Crew]] = [None] * len(jobs)
+        for position, crew in zip(found, self.crew_factory.create_crews([configs[position] for position in found], fresh=True)):
+            crews[position] = crew
+        runs: Dict[int, CrewRun] = {}
+        pending = deque()
+        for position, (job, crew) in enumerate(zip(jobs, crews)):
+            if crew is None:
+                runs[position] = CrewRun(job.name, error=LookupError(f"Crew {job.name!r} was not found or could not be built"))
+            else:
+                pending.append((position, job, crew, crew_models(crew)))
+        # Started crews by position, with the time they started and their deadline.
+        started: Dict[int, Tuple[CrewJob, float, Optional[float]]] = {}
+        with self._condition:
+            while pending or started:
+                self._start_ready(pending, started, runs, submitted)
+                now = time.perf_counter()
+                for position, (job, start, deadline) in list(started.items()):
+                    if position in runs:
+                        del started[position]
+                    elif deadline is not None and now >= deadline:
+                        runs[position] = CrewRun(job.name, timed_out=True, queued=start - submitted, elapsed=now - start)
+                        del started[position]
+                if pending or started:
+                    deadlines = [deadline for _, _, deadline in started.values() if deadline is not None]
+                    self._condition.wait(max(min(deadlines) - now, 0) if deadlines else None)
+        return [runs[position] for position in range(len(jobs))]
+
+    def _start_ready(self, pending: deque, started: Dict[int, Tuple[CrewJob, float, Optional[float]]], runs: Dict[int, CrewRun], submitted: float) -> None:
+        """Starts the pending crews whose models have free slots while workers are free, holding the condition."""
+        for entry in list(pending):
+            if self._running >= self.max_workers:
+                return
+            position, job, crew, models = entry
+            if not all(self._models[model] < self._limit(model) for model in models):
+                continue
+            pending.remove(entry)
+            self._running += 1
+            self._models.update(models)
+            start = time.perf_counter()
+            timeout = job.timeout if job.timeout is not None else self.timeout
+            started[position] = (job, start, start + timeout if timeout is not None else None)
+            self._executor.submit(self._kickoff, position, job, crew, models, start, submitted, runs)
+
+    def _kickoff(self, position: int, job: CrewJob, crew: Crew, models: Set[str], start: float, submitted: float, runs: Dict[int, CrewRun]) -> None:
+        result, error = None, None
+        try:
+            result = crew.kickoff(inputs=job.inputs) if job.inputs is not None else crew.kickoff()
+        except Exception as e:
+            error = e
+        finally:
+            # The crew's agents were built for this run, the pooled tools they hold can be given back.
+            for agent in crew.agents:
+                self.crew_factory.agent_factory.release_agent(agent)
+        with self._condition:
+            self._running -= 1
+            self._models.subtract(models)
+            # A crew reported as timed out keeps that outcome.
+            runs.setdefault(position, CrewRun(job.name, result, error, queued=start - submitted, elapsed=time.perf_counter() - start))
+            self._condition.notify_all()
+
+    def _limit(self, model: str) -> float:
+        limit = self.model_limits.get(model, self.default_model_limit)
+        return limit if limit is not None else float("inf")
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stops the worker threads, once the crews they run returned if `wait`."""
+        self._executor.shutdown(wait=wait)
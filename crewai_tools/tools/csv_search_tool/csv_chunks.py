@@ -0,0 +1,88 @@
+import csv
+import hashlib
+from typing import Any, Dict, Iterator, List, Optional
+
+from ..rag.ingestion import Chunk
+
+
+def detect_delimiter(first_line: str) -> str:
+	"""Picks the most frequent of the usual delimiters in the header line, as embedchain's CSV loader does."""
+	delimiters = [",", "\t", ";", "|"]
+	counts = {delimiter: first_line.count(delimiter) for delimiter in delimiters}
+	return max(counts, key=counts.get)
+
+
+def csv_chunks(
+	path: str,
+	embed_columns: Optional[List[str]] = None,
+	metadata_columns: Optional[List[str]] = None,
+	rows_per_chunk: int = 20,
+	chunk_size: int = 2000,
+	app_id: Optional[str] = None,
+	source: Optional[str] = None,
+) -> Iterator[Chunk]:
+	"""
+	Streams a CSV file as chunks of consecutive rows, each starting with the header line.
+
+	Rows are read one at a time and a chunk is yielded as soon as it holds `rows_per_chunk`
+	rows or `chunk_size` characters, so memory stays constant however large the file is.
+	Values of `metadata_columns` are stored as chunk metadata instead of being embedded, and
+	a chunk only groups rows sharing the same metadata values.
+
+	Parameters:
+		path (str): The CSV file.
+		embed_columns (Optional[List[str]]): Columns to embed, defaults to every column not kept as metadata.
+		metadata_columns (Optional[List[str]]): Columns stored as metadata of each chunk.
+		rows_per_chunk (int): Maximum number of rows in a chunk.
+		chunk_size (int): Maximum number of characters in a chunk, a single longer row is kept whole.
+		app_id (Optional[str]): Embedchain app id used to prefix chunk ids.
+		source (Optional[str]): The source the chunks are stored under, added to their ids when given.
+	"""
+	metadata_columns = metadata_columns or []
+	with open(path, newline="") as file:
+		delimiter = detect_delimiter(file.readline())
+		file.seek(0)
+		reader = csv.reader(file, delimiter=delimiter)
+		header = next(reader, None)
+		if header is None:
+			return
+		embed_columns = embed_columns or [column for column in header if column not in metadata_columns]
+		missing = [column for column in embed_columns + metadata_columns if column not in header]
+		if missing:
+			raise ValueError(f"Columns {missing} are not in the header of {path}")
+		embed_indexes = [header.index(column) for column in embed_columns]
+		metadata_indexes = [header.index(column) for column in metadata_columns]
+		header_line = ", ".join(embed_columns)
+
+		def value(row: List[str], index: int) -> str:
+			return row[index] if index < len(row) else ""
+
+		def make_chunk(lines: List[str], first_row: int, last_row: int, metadata: Dict[str, Any]) -> Chunk:
+			text = "\n".join([header_line, *lines])
+			chunk_id = hashlib.sha256(f"{source or path}:{first_row}:{text}".encode("utf-8")).hexdigest()
+			chunk_id = f"{app_id}--{chunk_id}" if app_id is not None else chunk_id
+			chunk_metadata = {
+				"url": path,
+				"first_row": first_row,
+				"last_row": last_row,
+				"data_type": "csv",
+				**metadata,
+			}
+			return Chunk(id=chunk_id, text=text, metadata=chunk_metadata)
+
+		lines: List[str] = []
+		size, first_row, last_row, metadata = len(header_line), 1, 1, {}
+		# Blank lines are skipped and not numbered, as csv.DictReader does.
+		for row_number, row in enumerate(filter(None, reader), start=1):
+			line = ", ".join(value(row, index) for index in embed_indexes)
+			row_metadata = {column: value(row, index) for column, index in zip(metadata_columns, metadata_indexes)}
+			if lines and (len(lines) >= rows_per_chunk or size + len(line) + 1 > chunk_size or row_metadata != metadata):
+				yield make_chunk(lines, first_row, last_row, metadata)
+				lines, size = [], len(header_line)
+			if not lines:
+				first_row, metadata = row_number, row_metadata
+			lines.append(line)
+			last_row = row_number
+			size += len(line) + 1
+		if lines:
+			yield make_chunk(lines, first_row, last_row, metadata)
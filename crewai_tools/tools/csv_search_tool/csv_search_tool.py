@@ -1,10 +1,12 @@
-from typing import Optional, Type, Any
+import hashlib
+import json
+import os
+from typing import Iterator, List, Optional, Type, Any
 from pydantic.v1 import BaseModel, Field
 
-from embedchain import App
-from embedchain.models.data_type import DataType
-
+from ..rag.ingestion import Chunk
 from ..rag.rag_tool import RagTool
+from .csv_chunks import csv_chunks
 
 
 class FixedCSVSearchToolSchema(BaseModel):
@@ -21,6 +23,9 @@ class CSVSearchTool(RagTool):
 	summarize: bool = False
 	args_schema: Type[BaseModel] = CSVSearchToolSchema
 	csv: Optional[str] = None
+	embed_columns: Optional[List[str]] = None
+	metadata_columns: Optional[List[str]] = None
+	rows_per_chunk: int = 20
 
 	def __init__(self, csv: Optional[str] = None, **kwargs):
 		super().__init__(**kwargs)
@@ -35,7 +40,27 @@ class CSVSearchTool(RagTool):
 		search_query: str,
 		**kwargs: Any,
 	) -> Any:
-		csv = kwargs.get('csv', self.csv)
-		self.app = App()
-		self.app.add(csv, data_type=DataType.CSV)
-		return super()._run(query=search_query)
\ No newline at end of file
+		csv = os.path.abspath(kwargs.get('csv', self.csv))
+		self._ensure_app()
+		self._citation_keys = ["first_row", "last_row", *(self.metadata_columns or [])]
+		self._index_file(csv, self._manifest_path(), self._csv_chunks, self._options_source(csv, self._options()))
+		return super()._run(query=search_query)
+
+	def _csv_chunks(self, csv: str, digest: str) -> Iterator[Chunk]:
+		app_id = self.app.config.id if self.app.config is not None else None
+		return csv_chunks(
+			csv,
+			embed_columns=self.embed_columns,
+			metadata_columns=self.metadata_columns,
+			rows_per_chunk=self.rows_per_chunk,
+			app_id=app_id,
+			source=self._options_source(csv, self._options()),
+		)
+
+	def _options(self) -> List[Any]:
+		return [self.embed_columns, self.metadata_columns, self.rows_per_chunk]
+
+	def _manifest_path(self) -> str:
+		# Files are chunked differently for each column selection, so each one gets its own manifest.
+		options = json.dumps(self._options())
+		return self._state_path("csv_search", f"{hashlib.sha256(options.encode('utf-8')).hexdigest()}.json")
@@ -1,11 +1,11 @@
-import os
-from typing import Optional, Type, Any
+from typing import List, Optional, Type, Any
 from pydantic.v1 import BaseModel, Field
 from ..base_tool import BaseTool
+from .directory_walker import DirectoryWalker
 
 class FixedDirectoryReadToolSchema(BaseModel):
 	"""Input for DirectoryReadTool."""
-	pass
+	cursor: Optional[str] = Field(None, description="Optional cursor returned by a previous call, to list the next page of files")
 
 class DirectoryReadToolSchema(FixedDirectoryReadToolSchema):
 	"""Input for DirectoryReadTool."""
@@ -16,6 +16,11 @@ class DirectoryReadTool(BaseTool):
 	description: str = "A tool that can be used to recursively list a directory's content."
 	args_schema: Type[BaseModel] = DirectoryReadToolSchema
 	directory: Optional[str] = None
+	include: Optional[List[str]] = None
+	exclude: List[str] = [".git"]
+	max_depth: Optional[int] = None
+	gitignore: bool = True
+	page_size: int = 1000
 
 	def __init__(self, directory: Optional[str] = None, **kwargs):
 		super().__init__(**kwargs)
@@ -32,7 +37,10 @@ class DirectoryReadTool(BaseTool):
 		directory = kwargs.get('directory', self.directory)
 		if directory[-1] == "/":
 			directory = directory[:-1]
-		files_list = [f"{directory}/{(os.path.join(root, filename).replace(directory, '').lstrip(os.path.sep))}" for root, dirs, files in os.walk(directory) for filename in files]
-		files = "\n- ".join(files_list)
-		return f"File paths: \n-{files}"
-
+		walker = DirectoryWalker(directory, self.include, self.exclude, self.max_depth, self.gitignore)
+		files_list, cursor = walker.page(kwargs.get('cursor'), self.page_size)
+		files = "\n- ".join(f"{directory}/{path}" for path in files_list)
+		listing = f"File paths: \n-{files}"
+		if cursor is not None:
+			listing += f"\n\nMore files follow, call again with cursor: {cursor}"
+		return listing
@@ -0,0 +1,210 @@
+import os
+import re
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
+from typing import Dict, Iterable, List, NamedTuple, Optional, Pattern, Tuple
+
+
+def glob_pattern(glob: str) -> Pattern:
+	"""Translates a gitignore style glob, where `*` stops at slashes and `**` doesn't, to a regular expression."""
+	parts, index = [], 0
+	while index < len(glob):
+		if glob.startswith("**/", index):
+			parts.append("(?:.*/)?")
+			index += 3
+		elif glob.startswith("**", index):
+			parts.append(".*")
+			index += 2
+		elif glob[index] == "*":
+			parts.append("[^/]*")
+			index += 1
+		elif glob[index] == "?":
+			parts.append("[^/]")
+			index += 1
+		elif glob[index] == "[" and "]" in glob[index + 1 :]:
+			end = glob.index("]", index + 1)
+			parts.append("[" + glob[index + 1 : end].replace("!", "^", 1).replace("\\", "\\\\") + "]")
+			index = end + 1
+		else:
+			parts.append(re.escape(glob[index]))
+			index += 1
+	return re.compile("".join(parts) + r"\Z")
+
+
+class PathFilter:
+	"""
+	Globs matched against paths relative to a base directory.
+
+	A glob with a slash is matched against the whole relative path, and one without against
+	the name of the file or directory only, as in `.gitignore` files.
+	"""
+
+	def __init__(self, globs: Iterable[str]):
+		self.globs = [glob.strip("/") for glob in globs]
+		self._patterns = [(glob_pattern(glob), "/" in glob) for glob in self.globs]
+
+	def __bool__(self) -> bool:
+		return bool(self._patterns)
+
+	def matches(self, path: str) -> bool:
+		name = path.rsplit("/", 1)[-1]
+		return any(pattern.match(path if anchored else name) for pattern, anchored in self._patterns)
+
+
+class IgnoreRule(NamedTuple):
+	base: str
+	pattern: Pattern
+	anchored: bool
+	negated: bool
+	directory_only: bool
+
+
+def gitignore_rules(path: str, base: str) -> List[IgnoreRule]:
+	"""Parses a `.gitignore` file of the directory `base`, relative to the walked root."""
+	rules = []
+	try:
+		with open(path, "r", encoding="utf-8", errors="replace") as file:
+			lines = file.read().splitlines()
+	except OSError:
+		return rules
+	for line in lines:
+		line = line.rstrip()
+		if not line or line.startswith("#"):
+			continue
+		negated = line.startswith("!")
+		line = line[1:] if negated else line.replace("\\!", "!").replace("\\#", "#")
+		directory_only = line.endswith("/")
+		line = line.rstrip("/")
+		anchored = "/" in line
+		rules.append(IgnoreRule(base, glob_pattern(line.lstrip("/")), anchored, negated, directory_only))
+	return rules
+
+
+def is_ignored(rules: List[IgnoreRule], path: str, is_dir: bool) -> bool:
+	"""Applies `.gitignore` rules in order to a path relative to the walked root, the last matching rule winning."""
+	ignored = False
+	name = path.rsplit("/", 1)[-1]
+	for rule in rules:
+		if rule.directory_only and not is_dir:
+			continue
+		if rule.base and not path.startswith(f"{rule.base}/"):
+			continue
+		relative = path[len(rule.base) + 1 :] if rule.base else path
+		if rule.pattern.match(relative if rule.anchored else name):
+			ignored = not rule.negated
+	return ignored
+
+
+class Snapshot(NamedTuple):
+	"""The files listed under a directory, along with the mtimes proving the listing still holds."""
+
+	files: List[str]
+	mtimes: Dict[str, int]
+
+	def is_current(self, root: str) -> bool:
+		"""Creating, renaming or deleting an entry changes its directory's mtime, so only directories are checked."""
+		try:
+			return all(os.stat(os.path.join(root, path)).st_mtime_ns == mtime for path, mtime in self.mtimes.items())
+		except OSError:
+			return False
+
+
+class DirectoryWalker:
+	"""
+	Lists the files under a directory with `os.scandir`, sorted, pruning what is filtered out.
+
+	Directories matching `exclude` or ignored by the `.gitignore` files found along the way
+	are never entered, and directories deeper than `max_depth` levels below the root are not
+	listed. Listings are cached by process as snapshots revalidated by the mtimes of the
+	directories and `.gitignore` files they were built from, so listing an unchanged tree
+	again costs a `stat` per directory.
+
+	Attributes:
+		root (str): The directory listed.
+		include (PathFilter): Globs the listed files must match, if any.
+		exclude (PathFilter): Globs of the files and directories skipped.
+		max_depth (Optional[int]): Directory levels listed below the root, None for no limit.
+		gitignore (bool): Whether `.gitignore` files are honoured.
+	"""
+
+	_snapshots: "OrderedDict[Tuple, Snapshot]" = OrderedDict()
+	_lock = threading.Lock()
+	max_snapshots = 64
+
+	def __init__(
+		self,
+		root: str,
+		include: Optional[Iterable[str]] = None,
+		exclude: Optional[Iterable[str]] = (".git",),
+		max_depth: Optional[int] = None,
+		gitignore: bool = True,
+	):
+		self.root = os.path.abspath(root)
+		self.include = PathFilter(include or [])
+		self.exclude = PathFilter(exclude or [])
+		self.max_depth = max_depth
+		self.gitignore = gitignore
+
+	def files(self) -> List[str]:
+		"""Returns the paths of the listed files relative to the root, with forward slashes."""
+		key = (self.root, tuple(self.include.globs), tuple(self.exclude.globs), self.max_depth, self.gitignore)
+		with self._lock:
+			snapshot = self._snapshots.get(key)
+		if snapshot is None or not snapshot.is_current(self.root):
+			snapshot = self._walk()
+			with self._lock:
+				self._snapshots[key] = snapshot
+				self._snapshots.move_to_end(key)
+				while len(self._snapshots) > self.max_snapshots:
+					self._snapshots.popitem(last=False)
+		return snapshot.files
+
+	def page(self, cursor: Optional[str] = None, page_size: int = 1000) -> Tuple[List[str], Optional[str]]:
+		"""
+		Returns up to `page_size` files listed after the `cursor` path, and the cursor of the next page if any.
+
+		The cursor is the last path of the previous page, so pages don't skip or repeat files
+		when others are added or removed in between.
+		"""
+		files = self.files()
+		start = bisect_right(files, cursor.split("/"), key=_path_key) if cursor else 0
+		page = files[start : start + page_size]
+		return page, page[-1] if start + page_size < len(files) else None
+
+	def _walk(self) -> Snapshot:
+		files, mtimes = [], {}
+		rules: List[IgnoreRule] = []
+		stack: List[Tuple[str, int]] = [("", 0)]
+		while stack:
+			directory, depth = stack.pop()
+			path = os.path.join(self.root, directory)
+			try:
+				mtimes[directory or "."] = os.stat(path).st_mtime_ns
+				with os.scandir(path) as scanned:
+					entries = list(scanned)
+			except OSError:
+				continue
+			if self.gitignore and any(entry.name == ".gitignore" for entry in entries):
+				ignore_path = os.path.join(directory, ".gitignore")
+				mtimes[ignore_path] = os.stat(os.path.join(self.root, ignore_path)).st_mtime_ns
+				rules = rules + gitignore_rules(os.path.join(self.root, ignore_path), directory)
+			subdirectories = []
+			for entry in entries:
+				relative = f"{directory}/{entry.name}" if directory else entry.name
+				is_dir = entry.is_dir(follow_symlinks=False)
+				if self.exclude.matches(relative) or (self.gitignore and is_ignored(rules, relative, is_dir)):
+					continue
+				if is_dir:
+					if self.max_depth is None or depth < self.max_depth:
+						subdirectories.append(relative)
+				elif not self.include or self.include.matches(relative):
+					files.append((relative.split("/"), relative))
+			stack.extend((subdirectory, depth + 1) for subdirectory in subdirectories)
+		# Sorted by path components, so a directory's files are listed together before its siblings'.
+		files.sort()
+		return Snapshot(files=[path for _, path in files], mtimes=mtimes)
+
+
+def _path_key(path: str) -> List[str]:
+	return path.split("/")
@@ -1,9 +1,9 @@
+import hashlib
+import os
 from typing import Optional, Type, Any
 from pydantic.v1 import BaseModel, Field
 
-from embedchain import App
-from embedchain.loaders.directory_loader import DirectoryLoader
-
+from ..rag.manifest import FileManifest, file_digest, iter_files
 from ..rag.rag_tool import RagTool
 
 
@@ -35,8 +35,37 @@ class DirectorySearchTool(RagTool):
 		search_query: str,
 		**kwargs: Any,
 	) -> Any:
-		directory = kwargs.get('directory', self.directory)
-		loader = DirectoryLoader(config=dict(recursive=True))
-		self.app = App()
-		self.app.add(directory, loader=loader)
-		return super()._run(query=search_query)
\ No newline at end of file
+		directory = os.path.abspath(kwargs.get('directory', self.directory))
+		self._ensure_app()
+		self._index_directory(directory)
+		return super()._run(query=search_query)
+
+	def _index_directory(self, directory: str) -> None:
+		"""Embeds only the files added or changed since the last run and drops removed ones."""
+		self._scope = f"{self.__class__.__name__}:{directory}"
+		self._where = {"directory": directory}
+		manifest = FileManifest(self._manifest_path(directory))
+		diff = manifest.diff(iter_files(directory))
+		try:
+			for path in diff.removed + diff.changed:
+				entry = manifest.forget(path)
+				if entry is not None:
+					self.app.delete(entry["source_hash"])
+			versions = {}
+			for path in diff.changed + diff.added:
+				try:
+					versions[path] = (os.stat(path), file_digest(path))
+				except OSError as e:
+					print(f"Failed to index {path}: {e}")
+			indexed = self._add_files(list(versions), metadata={"directory": directory})
+			for path, source_hash in indexed.items():
+				manifest.record(path, *versions[path], source_hash)
+		finally:
+			manifest.save()
+
+		if diff:
+			self._invalidate()
+
+	def _manifest_path(self, directory: str) -> str:
+		key = hashlib.sha256(directory.encode("utf-8")).hexdigest()
+		return self._state_path("directory_search", f"{key}.json")
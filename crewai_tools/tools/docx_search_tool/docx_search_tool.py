@@ -1,9 +1,10 @@
-from typing import Optional, Type, Any
+import os
+from typing import Iterator, Optional, Type, Any
 from pydantic.v1 import BaseModel, Field
 
-from embedchain import App
 from embedchain.models.data_type import DataType
 
+from ..rag.ingestion import Chunk, text_chunks
 from ..rag.rag_tool import RagTool
 
 
@@ -35,7 +36,26 @@ class DOCXSearchTool(RagTool):
 		search_query: str,
 		**kwargs: Any,
 	) -> Any:
-		docx = kwargs.get('docx', self.docx)
-		self.app = App()
-		self.app.add(docx, data_type=DataType.DOCX)
-		return super()._run(query=search_query)
\ No newline at end of file
+		docx = os.path.abspath(kwargs.get('docx', self.docx))
+		self._ensure_app()
+		self._index_file(docx, self._state_path("docx_search", f"manifest-{self.chunk_size}-{self.chunk_overlap}.json"), self._docx_chunks, self._source(docx))
+		return super()._run(query=search_query)
+
+	def _docx_chunks(self, path: str, digest: str) -> Iterator[Chunk]:
+		"""Yields the chunks of a DOCX, its text being loaded by embedchain and split with the tool's chunk size and overlap."""
+		from embedchain.loaders.docx_file import DocxFileLoader
+
+		app_id = self.app.config.id if self.app.config is not None else None
+		for document in DocxFileLoader().load_data(path)["data"]:
+			yield from text_chunks(
+				document["content"],
+				path,
+				{"path": path, "data_type": DataType.DOCX.value},
+				app_id,
+				self.chunk_size,
+				self.chunk_overlap,
+				self._source(path),
+			)
+
+	def _source(self, path: str) -> str:
+		return self._options_source(path, [self.chunk_size, self.chunk_overlap])
\ No newline at end of file
@@ -0,0 +1,109 @@
+import os
+import re
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Deque, Iterable, List, NamedTuple, Optional, Pattern, Tuple
+
+from ..file_read_tool.file_ranges import mapped
+
+_BLOCK_SIZE = 4 << 20
+_BINARY_SAMPLE = 8192
+
+
+class LineMatch(NamedTuple):
+	path: str
+	line: int
+	text: str
+
+
+def compile_query(query: str, regex: bool = False, ignore_case: bool = False) -> Pattern:
+	"""Compiles a literal string, or a regular expression, to a bytes pattern matched line by line."""
+	pattern = query if regex else re.escape(query)
+	return re.compile(pattern.encode("utf-8"), re.MULTILINE | (re.IGNORECASE if ignore_case else 0))
+
+
+def is_binary(data: bytes) -> bool:
+	"""Files with a NUL byte in their first kilobytes are binary, as for grep and git."""
+	return b"\0" in data[:_BINARY_SAMPLE]
+
+
+def search_file(
+	path: str,
+	pattern: Pattern,
+	max_matches: Optional[int] = None,
+	stop: Optional[threading.Event] = None,
+	max_line_length: int = 200,
+) -> List[LineMatch]:
+	"""
+	Returns the lines of a file matching a pattern, at most one match per line.
+
+	The file is mapped and scanned in blocks ending on line breaks, so memory stays bounded
+	however large it is, and the scan stops between blocks once `stop` is set. Binary files
+	and files that can't be read have no matches.
+	"""
+	matches: List[LineMatch] = []
+	try:
+		with mapped(path) as data:
+			if is_binary(data):
+				return matches
+			size, start, line = len(data), 0, 1
+			while start < size and not (stop is not None and stop.is_set()):
+				end = data.find(b"\n", min(start + _BLOCK_SIZE, size) - 1)
+				end = size if end == -1 else end + 1
+				block = data[start:end]
+				counted, last_line_start = 0, -1
+				for match in pattern.finditer(block):
+					line_start = block.rfind(b"\n", 0, match.start()) + 1
+					if line_start == last_line_start:
+						continue
+					line += block.count(b"\n", counted, line_start)
+					counted, last_line_start = line_start, line_start
+					line_end = block.find(b"\n", match.start())
+					text = block[line_start : line_end if line_end != -1 else len(block)].decode("utf-8", errors="replace")
+					matches.append(LineMatch(path=path, line=line, text=text.strip()[:max_line_length]))
+					if max_matches is not None and len(matches) >= max_matches:
+						return matches
+				line += block.count(b"\n", counted)
+				start = end
+	except (OSError, ValueError):
+		pass
+	return matches
+
+
+def search_files(
+	paths: Iterable[str],
+	pattern: Pattern,
+	max_matches: int = 100,
+	max_workers: Optional[int] = None,
+) -> Tuple[List[LineMatch], bool]:
+	"""
+	Searches files on worker threads, returning the first `max_matches` matches in path order.
+
+	Files are submitted a few at a time ahead of the one being collected, so once enough
+	matches are found no further file is opened, and the files in flight stop at their next
+	block. Also returns whether the search stopped at the limit.
+	"""
+	max_workers = max_workers or min(32, (os.cpu_count() or 1) * 4)
+	stop = threading.Event()
+	matches: List[LineMatch] = []
+	paths = iter(paths)
+	with ThreadPoolExecutor(max_workers=max_workers) as executor:
+		pending: Deque[Future] = deque()
+
+		def submit_next() -> None:
+			path = next(paths, None)
+			if path is not None:
+				pending.append(executor.submit(search_file, path, pattern, max_matches, stop))
+
+		for _ in range(max_workers * 2):
+			submit_next()
+		while pending:
+			matches.extend(pending.popleft().result())
+			if len(matches) >= max_matches:
+				stop.set()
+				for future in pending:
+					future.cancel()
+				return matches[:max_matches], True
+			submit_next()
+	return matches, False
@@ -0,0 +1,58 @@
+import os
+from typing import List, Optional, Type, Any
+from pydantic.v1 import BaseModel, Field
+from ..base_tool import BaseTool
+from ..directory_read_tool.directory_walker import DirectoryWalker
+from .content_search import compile_query, search_files
+
+class FixedFileContentSearchToolSchema(BaseModel):
+	"""Input for FileContentSearchTool."""
+	search_query: str = Field(..., description="Mandatory exact text, or regular expression, to search the files for")
+	regex: Optional[bool] = Field(False, description="Optional, whether the search query is a regular expression")
+
+class FileContentSearchToolSchema(FixedFileContentSearchToolSchema):
+	"""Input for FileContentSearchTool."""
+	directory: str = Field(..., description="Mandatory directory you want to search")
+
+class FileContentSearchTool(BaseTool):
+	name: str = "Search files for text"
+	description: str = "A tool that can be used to find the lines of a directory's files containing an exact text or matching a regular expression."
+	args_schema: Type[BaseModel] = FileContentSearchToolSchema
+	directory: Optional[str] = None
+	include: Optional[List[str]] = None
+	exclude: List[str] = [".git"]
+	max_depth: Optional[int] = None
+	gitignore: bool = True
+	ignore_case: bool = False
+	max_matches: int = 100
+	max_workers: Optional[int] = None
+
+	def __init__(self, directory: Optional[str] = None, **kwargs):
+		super().__init__(**kwargs)
+		if directory is not None:
+			self.directory = directory
+			self.description = f"A tool that can be used to find the lines of {directory}'s files containing an exact text or matching a regular expression."
+			self.args_schema = FixedFileContentSearchToolSchema
+			self._generate_description()
+
+	def _run(
+		self,
+		search_query: str,
+		**kwargs: Any,
+	) -> Any:
+		directory = kwargs.get('directory', self.directory).rstrip("/")
+		try:
+			pattern = compile_query(search_query, bool(kwargs.get('regex')), self.ignore_case)
+		except Exception as e:
+			return f"Invalid regular expression: {e}"
+		walker = DirectoryWalker(directory, self.include, self.exclude, self.max_depth, self.gitignore)
+		paths = (os.path.join(walker.root, path) for path in walker.files())
+		matches, limited = search_files(paths, pattern, self.max_matches, self.max_workers)
+		if not matches:
+			return f"No lines match {search_query}"
+		lines = "\n".join(
+			f"{directory}/{os.path.relpath(match.path, walker.root)}:{match.line}: {match.text}" for match in matches
+		)
+		if limited:
+			lines += f"\n\nStopped at the first {self.max_matches} matches, narrow the search to see others."
+		return lines
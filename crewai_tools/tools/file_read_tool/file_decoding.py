@@ -0,0 +1,106 @@
+import bz2
+import codecs
+import gzip
+import lzma
+from typing import BinaryIO, Optional
+
+_MAGIC_NUMBERS = (
+	(b"\x1f\x8b", "gzip"),
+	(b"BZh", "bzip2"),
+	(b"\xfd7zXZ\x00", "xz"),
+	(b"\x28\xb5\x2f\xfd", "zstd"),
+)
+_BOMS = (
+	(codecs.BOM_UTF32_LE, "utf-32"),
+	(codecs.BOM_UTF32_BE, "utf-32"),
+	(codecs.BOM_UTF8, "utf-8-sig"),
+	(codecs.BOM_UTF16_LE, "utf-16"),
+	(codecs.BOM_UTF16_BE, "utf-16"),
+)
+# The byte order a BOM marks, so excerpts past it decode the same way.
+_BYTE_ORDERS = (
+	(codecs.BOM_UTF32_LE, "utf-32-le"),
+	(codecs.BOM_UTF32_BE, "utf-32-be"),
+	(codecs.BOM_UTF16_LE, "utf-16-le"),
+	(codecs.BOM_UTF16_BE, "utf-16-be"),
+)
+SAMPLE_SIZE = 64 << 10
+
+
+def compression(path: str) -> Optional[str]:
+	"""Returns the compression format of a file from its magic number, whatever its extension, None if it isn't compressed."""
+	with open(path, "rb") as file:
+		head = file.read(6)
+	return next((kind for magic, kind in _MAGIC_NUMBERS if head.startswith(magic)), None)
+
+
+def open_decompressed(path: str, kind: str) -> BinaryIO:
+	"""Opens a compressed file as a stream of its decompressed bytes, decompressed as they are read."""
+	if kind == "gzip":
+		return gzip.open(path, "rb")
+	if kind == "bzip2":
+		return bz2.open(path, "rb")
+	if kind == "xz":
+		return lzma.open(path, "rb")
+	if kind == "zstd":
+		try:
+			import zstandard
+		except ImportError as e:
+			raise ImportError("Reading zstd compressed files requires zstandard, run `pip install zstandard`") from e
+		return zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True)
+	raise ValueError(f"Unsupported compression {kind}")
+
+
+def detect_encoding(sample: bytes) -> str:
+	"""
+	Guesses the encoding of text from a sample of its first bytes.
+
+	A byte order mark decides, then text decoding as UTF-8 is UTF-8, a multi-byte character
+	cut at the end of the sample being allowed. Other text is left to charset_normalizer
+	when it is installed, and read as Latin-1 otherwise, which decodes any byte.
+	"""
+	for bom, encoding in _BOMS:
+		if sample.startswith(bom):
+			return encoding
+	try:
+		codecs.getincrementaldecoder("utf-8")().decode(sample, final=False)
+		return "utf-8"
+	except UnicodeDecodeError:
+		pass
+	try:
+		from charset_normalizer import from_bytes
+
+		match = from_bytes(sample).best()
+		if match is not None:
+			return match.encoding
+	except ImportError:
+		pass
+	return "latin-1"
+
+
+def file_encoding(path: str, kind: Optional[str] = None) -> str:
+	"""
+	Detects the encoding of a file once, from its first SAMPLE_SIZE bytes, decompressed when `kind` is given.
+
+	UTF-16 and UTF-32 are returned with the byte order of their BOM, e.g. "utf-16-le", so any
+	excerpt of the file decodes with it, not only those starting with the BOM.
+	"""
+	with (open_decompressed(path, kind) if kind is not None else open(path, "rb")) as file:
+		sample = file.read(SAMPLE_SIZE)
+	encoding = detect_encoding(sample)
+	if encoding in ("utf-16", "utf-32"):
+		return next(order for bom, order in _BYTE_ORDERS if sample.startswith(bom))
+	return encoding
+
+
+def code_unit_width(encoding: str) -> int:
+	"""Returns the bytes of a code unit of an encoding, 2 for UTF-16 and 4 for UTF-32, 1 otherwise."""
+	name = codecs.lookup(encoding).name
+	return 4 if name.startswith("utf-32") else 2 if name.startswith("utf-16") else 1
+
+
+def decode(data: bytes, encoding: Optional[str] = None) -> str:
+	"""Decodes bytes in an encoding, by default the one detected on their first kilobytes, replacing what can't be decoded."""
+	text = data.decode(encoding or detect_encoding(data[:SAMPLE_SIZE]), errors="replace")
+	# Encodings with an explicit byte order keep the BOM of the file's first excerpt.
+	return text[1:] if text.startswith("\ufeff") else text
@@ -0,0 +1,221 @@
+import hashlib
+import mmap
+import os
+from array import array
+from collections import deque
+from contextlib import contextmanager
+from itertools import accumulate, islice
+from typing import BinaryIO, Iterator, NamedTuple, Optional
+
+from ..storage import storage_path
+
+_BLOCK_SIZE = 4 << 20
+
+
+class Excerpt(NamedTuple):
+	"""Bytes read from a file, `truncated` when the size budget stopped the read before the requested end."""
+
+	data: bytes
+	truncated: bool
+
+
+@contextmanager
+def mapped(path: str) -> Iterator[mmap.mmap]:
+	"""Maps a file read-only, an empty file being mapped to an empty bytes object as mmap refuses it."""
+	with open(path, "rb") as file:
+		if os.fstat(file.fileno()).st_size == 0:
+			yield b""
+			return
+		with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+			yield data
+
+
+class LineIndex:
+	"""
+	Byte offsets of every `every`-th line of one version of a file.
+
+	Finding a line then costs a seek to the nearest indexed line and a scan of fewer than
+	`every` lines, wherever it is in the file. The index is built in a single pass, splitting
+	the file in large blocks, and persisted as a binary array keyed by the file's path, size
+	and mtime, so a file is only indexed again once it changes.
+
+	Attributes:
+		lines (int): The number of lines of the file.
+		every (int): How many lines apart the indexed lines are.
+		offsets (array): The byte offset of lines 0, `every`, 2 * `every`, ...
+	"""
+
+	def __init__(self, lines: int, every: int, offsets: array):
+		self.lines = lines
+		self.every = every
+		self.offsets = offsets
+
+	@classmethod
+	def for_file(cls, path: str, every: int = 1024, directory: Optional[str] = None) -> "LineIndex":
+		"""Loads the persisted index of the file's current version, building and persisting it when missing."""
+		stat = os.stat(path)
+		key = hashlib.sha256(f"{os.path.abspath(path)}:{stat.st_size}:{stat.st_mtime_ns}:{every}".encode("utf-8")).hexdigest()
+		index_path = os.path.join(directory, f"{key}.idx") if directory else storage_path("file_read", "lines", f"{key}.idx")
+		values = array("Q")
+		try:
+			with open(index_path, "rb") as file:
+				values.frombytes(file.read())
+			return cls(values[0], every, values[1:])
+		except (FileNotFoundError, IndexError, ValueError):
+			pass
+		index = cls.build(path, every)
+		os.makedirs(os.path.dirname(index_path), exist_ok=True)
+		tmp_path = f"{index_path}.tmp"
+		with open(tmp_path, "wb") as file:
+			array("Q", [index.lines]).tofile(file)
+			index.offsets.tofile(file)
+		os.replace(tmp_path, index_path)
+		return index
+
+	@classmethod
+	def build(cls, path: str, every: int = 1024) -> "LineIndex":
+		offsets = array("Q", [0])
+		line = 0
+		with mapped(path) as data:
+			size, start = len(data), 0
+			while start < size:
+				# Blocks end on a line break, so every line of a block starts in it.
+				end = data.find(b"\n", min(start + _BLOCK_SIZE, size) - 1)
+				end = size if end == -1 else end + 1
+				block = data[start:end]
+				breaks = block.count(b"\n")
+				# Line `line + n` starts after the n-th break of the block, the indexed ones are those multiple of `every`.
+				first = (-(line + 1)) % every
+				starts = accumulate(len(piece) + 1 for piece in islice(block.split(b"\n"), breaks))
+				offsets.extend(start + offset for offset in islice(starts, first, None, every))
+				line += breaks
+				start = end
+			if size and data[size - 1 : size] != b"\n":
+				line += 1
+		if offsets and offsets[-1] >= size:
+			# A break ending the file starts no line.
+			offsets.pop()
+		return cls(line, every, offsets)
+
+	def line_offset(self, data: bytes, line: int) -> int:
+		"""Returns the byte offset of a 0-based line in the mapped file, or its size past the last line."""
+		if line >= self.lines:
+			return len(data)
+		offset = self.offsets[line // self.every]
+		for _ in range(line % self.every):
+			offset = data.find(b"\n", offset) + 1
+		return offset
+
+
+def read_bytes(path: str, start: int = 0, end: Optional[int] = None, max_bytes: Optional[int] = None) -> Excerpt:
+	"""Reads the bytes from `start` to `end`, excluded, negative positions counting from the end of the file."""
+	with mapped(path) as data:
+		start, end, _ = slice(start, end).indices(len(data))
+		stop = min(end, start + max_bytes) if max_bytes is not None else end
+		return Excerpt(data=bytes(data[start:stop]), truncated=stop < end)
+
+
+def read_lines(
+	path: str,
+	start: int,
+	end: Optional[int] = None,
+	max_bytes: Optional[int] = None,
+	index: Optional[LineIndex] = None,
+) -> Excerpt:
+	"""
+	Reads the 0-based lines from `start` to `end`, excluded, seeking to them through the file's line index.
+
+	Reading from the first line to the end of the file doesn't need the index, so it isn't built for it.
+	"""
+	if index is None and (start > 0 or end is not None):
+		index = LineIndex.for_file(path)
+	with mapped(path) as data:
+		first = index.line_offset(data, start) if start > 0 else 0
+		last = index.line_offset(data, end) if end is not None else len(data)
+		return _budget(data, first, max(first, last), max_bytes)
+
+
+def tail_lines(path: str, count: int, max_bytes: Optional[int] = None) -> Excerpt:
+	"""Reads the last `count` lines, scanning backwards from the end of the file."""
+	with mapped(path) as data:
+		size = len(data)
+		# A break ending the file closes the last line rather than starting another one.
+		offset = size - 1 if size and data[size - 1 : size] == b"\n" else size
+		for _ in range(count):
+			if offset < 0:
+				break
+			offset = data.rfind(b"\n", 0, offset)
+		first = max(offset, -1) + 1 if count else size
+		if max_bytes is not None and size - first > max_bytes:
+			# The end of a log matters more than its beginning, the oldest lines are the ones dropped.
+			cut = data.find(b"\n", size - max_bytes - 1) + 1
+			if cut == 0 or cut >= size:
+				# Not even the last line fits, its end is kept.
+				cut = size - max_bytes
+			return Excerpt(data=bytes(data[cut:size]), truncated=True)
+		return Excerpt(data=bytes(data[first:size]), truncated=False)
+
+
+def stream_lines(stream: BinaryIO, start: int, end: Optional[int] = None, max_bytes: Optional[int] = None) -> Excerpt:
+	"""Reads the 0-based lines from `start` to `end`, excluded, of a stream in a single pass, such as a decompressed file."""
+	lines, size = [], 0
+	for number, line in enumerate(stream):
+		if end is not None and number >= end:
+			break
+		if number < start:
+			continue
+		if max_bytes is not None and size + len(line) > max_bytes:
+			if not lines:
+				lines.append(line[:max_bytes])
+			return Excerpt(data=b"".join(lines), truncated=True)
+		lines.append(line)
+		size += len(line)
+	return Excerpt(data=b"".join(lines), truncated=False)
+
+
+def stream_tail(stream: BinaryIO, count: int, max_bytes: Optional[int] = None) -> Excerpt:
+	"""Reads the last `count` lines of a stream in a single pass, holding no more than them."""
+	lines = deque(stream, maxlen=count) if count else deque()
+	size = sum(len(line) for line in lines)
+	truncated = False
+	while max_bytes is not None and size > max_bytes and len(lines) > 1:
+		size -= len(lines.popleft())
+		truncated = True
+	if max_bytes is not None and size > max_bytes:
+		return Excerpt(data=lines[0][-max_bytes:], truncated=True)
+	return Excerpt(data=b"".join(lines), truncated=truncated)
+
+
+def stream_bytes(stream: BinaryIO, start: int = 0, end: Optional[int] = None, max_bytes: Optional[int] = None) -> Excerpt:
+	"""Reads the bytes from `start` to `end`, excluded, of a stream, skipping what comes before without keeping it."""
+	if start < 0 or (end is not None and end < 0):
+		raise ValueError("Byte positions from the end of a stream are not supported, use tail_lines instead")
+	skipped = 0
+	while skipped < start:
+		block = stream.read(min(start - skipped, 1 << 20))
+		if not block:
+			return Excerpt(data=b"", truncated=False)
+		skipped += len(block)
+	length = None if end is None else max(end - start, 0)
+	limit = length if max_bytes is None else max_bytes if length is None else min(length, max_bytes)
+	if limit is None:
+		return Excerpt(data=stream.read(), truncated=False)
+	# Decompressors may return fewer bytes than asked before the end of the stream.
+	blocks, size = [], 0
+	while size < limit:
+		block = stream.read(limit - size)
+		if not block:
+			break
+		blocks.append(block)
+		size += len(block)
+	truncated = size == limit and limit != length and bool(stream.read(1))
+	return Excerpt(data=b"".join(blocks), truncated=truncated)
+
+
+def _budget(data: bytes, start: int, end: int, max_bytes: Optional[int]) -> Excerpt:
+	"""Slices the bytes from `start` to `end`, cut on the last whole line fitting in `max_bytes` when they don't fit."""
+	if max_bytes is None or end - start <= max_bytes:
+		return Excerpt(data=bytes(data[start:end]), truncated=False)
+	cut = data.rfind(b"\n", start, start + max_bytes)
+	stop = cut + 1 if cut != -1 else start + max_bytes
+	return Excerpt(data=bytes(data[start:stop]), truncated=True)
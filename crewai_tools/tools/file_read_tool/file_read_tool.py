@@ -1,20 +1,33 @@
-from typing import Optional, Type, Any
+import os
+from typing import Optional, Tuple, Type, Any
+from pydantic import ConfigDict
 from pydantic.v1 import BaseModel, Field
 from ..base_tool import BaseTool
+from .file_decoding import code_unit_width, compression, decode, file_encoding, open_decompressed
+from .file_ranges import Excerpt, read_bytes, read_lines, stream_bytes, stream_lines, stream_tail, tail_lines
+from .read_cache import READ_CACHE, ReadCache
 
 class FixedFileReadToolSchema(BaseModel):
 	"""Input for FileReadTool."""
-	pass
+	start_line: Optional[int] = Field(None, description="Optional first line to read, starting at 1")
+	end_line: Optional[int] = Field(None, description="Optional last line to read, included")
+	tail_lines: Optional[int] = Field(None, description="Optional number of lines to read from the end of the file")
+	start_byte: Optional[int] = Field(None, description="Optional first byte to read, starting at 0")
+	end_byte: Optional[int] = Field(None, description="Optional byte to stop reading at, excluded")
 
 class FileReadToolSchema(FixedFileReadToolSchema):
 	"""Input for FileReadTool."""
 	file_path: str = Field(..., description="Mandatory file full path to read the file")
 
 class FileReadTool(BaseTool):
+	model_config = ConfigDict(arbitrary_types_allowed=True)
 	name: str = "Read a file's content"
 	description: str = "A tool that can be used to read a file's content."
 	args_schema: Type[BaseModel] = FileReadToolSchema
 	file_path: Optional[str] = None
+	max_bytes: Optional[int] = 100_000
+	cache_reads: bool = True
+	read_cache: Optional[ReadCache] = None
 
 	def __init__(self, file_path: Optional[str] = None, **kwargs):
 		super().__init__(**kwargs)
@@ -29,5 +42,69 @@ class FileReadTool(BaseTool):
 		**kwargs: Any,
 	) -> Any:
 		file_path = kwargs.get('file_path', self.file_path)
-		with open(file_path, 'r') as file:
-			return file.read()
\ No newline at end of file
+		start_line, end_line, tail, start_byte, end_byte = (
+			int(kwargs[name]) if kwargs.get(name) is not None else None
+			for name in ("start_line", "end_line", "tail_lines", "start_byte", "end_byte")
+		)
+		ranged = any(value is not None for value in (start_line, end_line, tail, start_byte, end_byte))
+		if not ranged and self.cache_reads and (self.max_bytes is None or os.path.getsize(file_path) <= self.max_bytes):
+			# Whole files within the budget are what agents read over and over, they are served from the shared
+			# cache. Compressed files are cached without their text, only sparing the detection of their format.
+			kind, encoding, text = (self.read_cache or READ_CACHE).read(file_path, self._read_file)
+			if text is not None:
+				return text
+		else:
+			kind = compression(file_path)
+			# Excerpts are decoded in the encoding of the whole file, which they may be too short or too far in to tell.
+			encoding = file_encoding(file_path, kind)
+		width = code_unit_width(encoding)
+		if width > 1:
+			if tail is not None or start_line is not None or end_line is not None:
+				return f"Line ranges of {encoding} files are not supported, read parts of {file_path} with start_byte and end_byte instead."
+			# Line breaks are several bytes wide, the file is read in whole code units.
+			start_byte = start_byte - start_byte % width if start_byte is not None else None
+			end_byte = end_byte - end_byte % width if end_byte is not None else None
+		if kind is not None:
+			# Compressed files are decompressed as they are read, in a single pass.
+			with open_decompressed(file_path, kind) as stream:
+				if tail is not None:
+					excerpt = stream_tail(stream, tail, self.max_bytes)
+				elif start_line is not None or end_line is not None:
+					excerpt = stream_lines(stream, max((start_line or 1) - 1, 0), end_line, self.max_bytes)
+				elif start_byte is not None or end_byte is not None:
+					excerpt = stream_bytes(stream, start_byte or 0, end_byte, self.max_bytes)
+				elif width > 1:
+					excerpt = stream_bytes(stream, 0, None, self.max_bytes)
+				else:
+					excerpt = stream_lines(stream, 0, None, self.max_bytes)
+		elif tail is not None:
+			excerpt = tail_lines(file_path, tail, self.max_bytes)
+		elif start_line is not None or end_line is not None:
+			excerpt = read_lines(file_path, max((start_line or 1) - 1, 0), end_line, self.max_bytes)
+		elif start_byte is not None or end_byte is not None:
+			excerpt = read_bytes(file_path, start_byte or 0, end_byte, self.max_bytes)
+		elif width > 1:
+			excerpt = read_bytes(file_path, 0, None, self.max_bytes)
+		else:
+			excerpt = read_lines(file_path, 0, None, self.max_bytes)
+		return self._format(excerpt, encoding)
+
+	@staticmethod
+	def _read_file(file_path: str) -> Tuple[Optional[str], str, Optional[str]]:
+		"""Returns the compression and encoding of a file, and its text unless it is compressed."""
+		kind = compression(file_path)
+		encoding = file_encoding(file_path, kind)
+		return kind, encoding, decode(read_bytes(file_path).data, encoding) if kind is None else None
+
+	def _format(self, excerpt: Excerpt, encoding: str) -> str:
+		width = code_unit_width(encoding)
+		# The size budget may cut a code unit.
+		text = decode(excerpt.data[: len(excerpt.data) - len(excerpt.data) % width], encoding)
+		if not excerpt.truncated:
+			return text
+		if width > 1:
+			return f"{text}\n[Truncated to {len(excerpt.data)} bytes. Read other parts with start_byte and end_byte.]"
+		return (
+			f"{text}\n[Truncated to {len(excerpt.data)} bytes. "
+			"Read other parts with start_line and end_line, tail_lines, or start_byte and end_byte.]"
+		)
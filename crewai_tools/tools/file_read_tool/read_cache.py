@@ -0,0 +1,90 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Optional, Tuple
+
+
+class ReadCache:
+	"""
+	Caches what was read from files, keyed by their path, size and mtime.
+
+	Every lookup stats the file and only returns the cached content when its size and mtime
+	still match, so a file that changed is read again. The cache is bounded by the total
+	size of the files it holds, evicting the least recently used, and files larger than
+	`max_file_bytes` are never cached. It is meant to be shared, one instance serving every
+	tool of the process by default.
+
+	Attributes:
+		max_bytes (int): Maximum total size of the cached files.
+		max_file_bytes (int): Maximum size of a cached file.
+		hits (int): Number of reads served from the cache.
+		misses (int): Number of reads that had to go to the file.
+		evictions (int): Number of files evicted to make room for others.
+	"""
+
+	def __init__(self, max_bytes: int = 64 << 20, max_file_bytes: int = 1 << 20):
+		self.max_bytes = max_bytes
+		self.max_file_bytes = max_file_bytes
+		self.hits = 0
+		self.misses = 0
+		self.evictions = 0
+		self._entries: "OrderedDict[str, Tuple[int, int, Any]]" = OrderedDict()
+		self._size = 0
+		self._lock = threading.Lock()
+
+	def read(self, path: str, load: Callable[[str], Any]) -> Any:
+		"""Returns the cached content of the file's current version, otherwise loads it with `load(path)` and caches it."""
+		path = os.path.abspath(path)
+		stat = os.stat(path)
+		with self._lock:
+			entry = self._entries.get(path)
+			if entry is not None and entry[:2] == (stat.st_size, stat.st_mtime_ns):
+				self._entries.move_to_end(path)
+				self.hits += 1
+				return entry[2]
+			self.misses += 1
+		content = load(path)
+		after = os.stat(path)
+		if (after.st_size, after.st_mtime_ns) == (stat.st_size, stat.st_mtime_ns):
+			# Content read while the file was being written is returned but not kept.
+			self._store(path, stat.st_size, stat.st_mtime_ns, content)
+		return content
+
+	def invalidate(self, path: Optional[str] = None) -> None:
+		"""Drops the cached content of a file, or of every file when none is given."""
+		with self._lock:
+			if path is None:
+				self._entries.clear()
+				self._size = 0
+				return
+			entry = self._entries.pop(os.path.abspath(path), None)
+			if entry is not None:
+				self._size -= entry[0]
+
+	@property
+	def size(self) -> int:
+		"""Total size of the cached files."""
+		return self._size
+
+	@property
+	def hit_rate(self) -> float:
+		total = self.hits + self.misses
+		return self.hits / total if total else 0.0
+
+	def _store(self, path: str, size: int, mtime_ns: int, content: Any) -> None:
+		if size > self.max_file_bytes or size > self.max_bytes:
+			return
+		with self._lock:
+			previous = self._entries.pop(path, None)
+			if previous is not None:
+				self._size -= previous[0]
+			self._entries[path] = (size, mtime_ns, content)
+			self._size += size
+			while self._size > self.max_bytes:
+				_, (evicted, _, _) = self._entries.popitem(last=False)
+				self._size -= evicted
+				self.evictions += 1
+
+
+READ_CACHE = ReadCache()
+"""The read cache shared by the tools of the process unless they are given their own."""
@@ -1,10 +1,10 @@
+import hashlib
 from typing import Optional, Type, List, Any
 from pydantic.v1 import BaseModel, Field
 
-from embedchain import App
-from embedchain.loaders.github import GithubLoader
-
+from ..rag.ingestion import delete_record, delete_records, source_hash, text_chunks, write_chunks
 from ..rag.rag_tool import RagTool
+from .github_sync import GITHUB_API_URL, GithubSync
 
 
 class FixedGithubSearchToolSchema(BaseModel):
@@ -24,6 +24,8 @@ class GithubSearchTool(RagTool):
 	args_schema: Type[BaseModel] = GithubSearchToolSchema
 	github_repo: Optional[str] = None
 	content_types: List[str]
+	api_url: str = GITHUB_API_URL
+	session: Optional[Any] = None
 
 	def __init__(self, github_repo: Optional[str] = None, **kwargs):
 		super().__init__(**kwargs)
@@ -39,8 +41,67 @@ class GithubSearchTool(RagTool):
 		**kwargs: Any,
 	) -> Any:
 		github_repo = kwargs.get('github_repo', self.github_repo)
-		loader = GithubLoader(config={"token": self.gh_token})
-		app = App()
-		app.add(f"repo:{github_repo} type:{','.join(self.content_types)}", data_type="github", loader=loader)
-		self.app = app
-		return super()._run(query=search_query)
\ No newline at end of file
+		self._ensure_app()
+		self._sync_repo(self._repo_name(github_repo))
+		return super()._run(query=search_query)
+
+	def _sync_repo(self, repo: str) -> None:
+		"""
+		Embeds the files, threads and metadata of the repository that changed since the last sync.
+
+		Tools syncing other content types or chunk settings store the repository under a source,
+		and a sync state, of their own.
+		"""
+		content_types = sorted(set(self.content_types))
+		source = self._options_source(f"github:{repo}", [content_types, self.chunk_size, self.chunk_overlap])
+		self._scope = f"{self.__class__.__name__}:{source}"
+		self._where = {"hash": source_hash(source)}
+		key = hashlib.sha256(source.encode("utf-8")).hexdigest()
+		sync = GithubSync(repo, self._state_path("github_search", f"{key}.json"), self.gh_token, self.session, self.api_url)
+		changed = False
+
+		if "code" in content_types:
+			delta = sync.code_delta()
+			if delta is not None:
+				# Nothing is stored yet on the first sync.
+				if not delta.initial:
+					delete_records(self.app, source, (f"code:{path}" for path in delta.removed + delta.changed))
+				for path, text in sync.read_files(delta):
+					if text:
+						self._write_record(source, f"code:{path}", f"https://github.com/{repo}/blob/{delta.head}/{path}", text)
+				sync.mark_code_synced(delta)
+				changed = True
+
+		kinds = {kind for kind in content_types if kind in ("issue", "pr")}
+		if kinds:
+			for kind, thread, text in sync.updated_threads(kinds):
+				record_id = f"{kind}:{thread['number']}"
+				delete_record(self.app, source, record_id)
+				self._write_record(source, record_id, thread["html_url"], text)
+				changed = True
+
+		if "repo" in content_types:
+			text = sync.repo_text()
+			if text is not None:
+				delete_record(self.app, source, "repo")
+				self._write_record(source, "repo", f"https://github.com/{repo}", text)
+				changed = True
+
+		sync.save()
+		if changed:
+			self._invalidate()
+
+	def _write_record(self, source: str, record_id: str, url: str, text: str) -> None:
+		app_id = self.app.config.id if self.app.config is not None else None
+		metadata = {"record_id": record_id, "data_type": "github"}
+		chunks = text_chunks(text, url, metadata, app_id, self.chunk_size, self.chunk_overlap, source)
+		write_chunks(self.app, chunks, source)
+
+	@staticmethod
+	def _repo_name(github_repo: str) -> str:
+		"""Accepts both `owner/name` and repository URLs."""
+		repo = github_repo.strip().rstrip("/")
+		for prefix in ("https://github.com/", "http://github.com/", "github.com/"):
+			if repo.startswith(prefix):
+				repo = repo[len(prefix):]
+		return repo[:-len(".git")] if repo.endswith(".git") else repo
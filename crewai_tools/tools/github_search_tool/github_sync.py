@@ -0,0 +1,209 @@
+import base64
+import json
+import tarfile
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Set, Tuple
+from urllib.parse import urlencode
+
+GITHUB_API_URL = "https://api.github.com"
+
+
+class CodeDelta(NamedTuple):
+	head: str
+	files: Dict[str, str]
+	changed: List[str]
+	removed: List[str]
+	initial: bool = False
+
+
+class GithubSync:
+	"""
+	Incremental view of a GitHub repository backed by a persisted sync state.
+
+	The state records the last indexed commit with the blob sha of every indexed file,
+	the `updated_at` of every indexed issue and pull request along with the cursor to
+	list newer ones from, and the ETag of each conditional request. A repository that
+	did not change since the last sync costs a few `304 Not Modified` responses, which
+	GitHub does not count against the rate limit.
+
+	Attributes:
+		repo (str): The `owner/name` of the repository.
+		state_path (str): Where the sync state is persisted as JSON.
+		session (Any): A `requests.Session` compatible HTTP client.
+	"""
+
+	def __init__(
+		self,
+		repo: str,
+		state_path: str,
+		token: Optional[str] = None,
+		session: Optional[Any] = None,
+		api_url: str = GITHUB_API_URL,
+	):
+		if session is None:
+			import requests
+
+			session = requests.Session()
+		self.repo = repo
+		self.state_path = state_path
+		self.session = session
+		self.api_url = api_url.rstrip("/")
+		self.headers = {"Accept": "application/vnd.github+json"}
+		if token:
+			self.headers["Authorization"] = f"Bearer {token}"
+		self.state = self._load_state()
+
+	def code_delta(self) -> Optional[CodeDelta]:
+		"""Returns the files changed or removed since the last synced commit, None if HEAD did not move."""
+		response = self._get(f"{self._repo_url}/commits/HEAD")
+		if response is None:
+			return None
+		head = response.json()["sha"]
+		if head == self.state["commit"]:
+			return None
+
+		files = self._tree_files(head)
+		previous = self.state["files"]
+		changed = [path for path, sha in files.items() if previous.get(path) != sha]
+		removed = [path for path in previous if path not in files]
+		return CodeDelta(head=head, files=files, changed=changed, removed=removed, initial=self.state["commit"] is None)
+
+	def _tree_files(self, sha: str, prefix: str = "") -> Dict[str, str]:
+		"""
+		Returns the blob sha of every file under a tree, keyed by path.
+
+		GitHub truncates recursive listings of large trees, so a truncated listing is walked
+		one level at a time instead, each subtree being listed recursively in turn. Taking a
+		truncated listing as complete would report the missing files as removed.
+		"""
+		tree = self._get(f"{self._repo_url}/git/trees/{sha}", params={"recursive": "1"}, conditional=False).json()
+		if not tree.get("truncated"):
+			return {f"{prefix}{entry['path']}": entry["sha"] for entry in tree["tree"] if entry["type"] == "blob"}
+		files = {}
+		for entry in self._get(f"{self._repo_url}/git/trees/{sha}", conditional=False).json()["tree"]:
+			if entry["type"] == "blob":
+				files[f"{prefix}{entry['path']}"] = entry["sha"]
+			elif entry["type"] == "tree":
+				files.update(self._tree_files(entry["sha"], f"{prefix}{entry['path']}/"))
+		return files
+
+	def read_files(self, delta: CodeDelta) -> Iterator[Tuple[str, Optional[str]]]:
+		"""
+		Yields the path and text of every changed file, None for binary content.
+
+		A first sync downloads the repository as a single tarball rather than each file as a
+		blob, which would cost one request of the rate limit per file. Files the archive
+		doesn't hold, or all of them if it can't be read, are then fetched as blobs.
+		"""
+		remaining = set(delta.changed)
+		if delta.initial and remaining:
+			try:
+				for path, text in self._read_archive(delta.head, remaining):
+					remaining.discard(path)
+					yield path, text
+			except (OSError, tarfile.TarError) as e:
+				print(f"Failed to read the archive of {self.repo}, fetching files one by one: {e}")
+		for path in delta.changed:
+			if path in remaining:
+				yield path, self.read_blob(delta.files[path])
+
+	def _read_archive(self, ref: str, paths: Set[str]) -> Iterator[Tuple[str, Optional[str]]]:
+		"""Streams the tarball of a commit, yielding the wanted files as they are extracted."""
+		response = self.session.get(f"{self._repo_url}/tarball/{ref}", headers=self.headers, stream=True)
+		response.raise_for_status()
+		with tarfile.open(fileobj=response.raw, mode="r|gz") as archive:
+			for member in archive:
+				# Entries are stored under a top-level `owner-name-sha/` directory.
+				path = member.name.split("/", 1)[-1]
+				if not member.isfile() or path not in paths:
+					continue
+				content = archive.extractfile(member).read()
+				try:
+					yield path, content.decode("utf-8")
+				except UnicodeDecodeError:
+					yield path, None
+
+	def read_blob(self, sha: str) -> Optional[str]:
+		"""Returns the text of a blob, or None for binary content."""
+		blob = self._get(f"{self._repo_url}/git/blobs/{sha}", conditional=False).json()
+		content = base64.b64decode(blob["content"]) if blob.get("encoding") == "base64" else blob["content"].encode()
+		try:
+			return content.decode("utf-8")
+		except UnicodeDecodeError:
+			return None
+
+	def mark_code_synced(self, delta: CodeDelta) -> None:
+		self.state["commit"] = delta.head
+		self.state["files"] = delta.files
+
+	def updated_threads(self, kinds: Set[str]) -> Iterator[Tuple[str, Dict[str, Any], str]]:
+		"""
+		Yields `(kind, thread, text)` for the issues and pull requests updated since the last sync.
+
+		`kind` is either "issue" or "pr". Threads listed again with an unchanged `updated_at`,
+		as GitHub's `since` filter is inclusive, are skipped.
+		"""
+		params = {"state": "all", "sort": "updated", "direction": "asc", "per_page": "100"}
+		if self.state["threads_since"]:
+			params["since"] = self.state["threads_since"]
+		response = self._get(f"{self._repo_url}/issues", params=params)
+		while response is not None:
+			for thread in response.json():
+				kind = "pr" if "pull_request" in thread else "issue"
+				number = str(thread["number"])
+				self.state["threads_since"] = max(self.state["threads_since"] or "", thread["updated_at"])
+				if kind not in kinds or self.state["threads"].get(number) == thread["updated_at"]:
+					continue
+				yield kind, thread, self._thread_text(thread)
+				self.state["threads"][number] = thread["updated_at"]
+			next_url = response.links.get("next", {}).get("url")
+			response = self._get(next_url, conditional=False) if next_url else None
+
+	def repo_text(self) -> Optional[str]:
+		"""Returns a description of the repository, None if it did not change since the last sync."""
+		response = self._get(self._repo_url)
+		if response is None:
+			return None
+		repo = response.json()
+		topics = ", ".join(repo.get("topics") or [])
+		return f"{repo['full_name']}: {repo.get('description') or ''}\nTopics: {topics}\nHomepage: {repo.get('homepage') or ''}"
+
+	def save(self) -> None:
+		with open(self.state_path, "w") as file:
+			json.dump(self.state, file)
+
+	@property
+	def _repo_url(self) -> str:
+		return f"{self.api_url}/repos/{self.repo}"
+
+	def _thread_text(self, thread: Dict[str, Any]) -> str:
+		parts = [f"#{thread['number']} {thread['title']} ({thread['state']})", thread.get("body") or ""]
+		if thread.get("comments"):
+			response = self._get(thread["comments_url"], params={"per_page": "100"}, conditional=False)
+			while response is not None:
+				parts.extend(f"{comment['user']['login']}: {comment['body']}" for comment in response.json())
+				next_url = response.links.get("next", {}).get("url")
+				response = self._get(next_url, conditional=False) if next_url else None
+		return "\n\n".join(parts)
+
+	def _get(self, url: str, params: Optional[Dict[str, str]] = None, conditional: bool = True) -> Optional[Any]:
+		"""GETs a url, returning None on `304 Not Modified` when a stored ETag still matches."""
+		headers = dict(self.headers)
+		key = f"{url}?{urlencode(sorted(params.items()))}" if params else url
+		if conditional and key in self.state["etags"]:
+			headers["If-None-Match"] = self.state["etags"][key]
+		response = self.session.get(url, headers=headers, params=params)
+		if response.status_code == 304:
+			return None
+		response.raise_for_status()
+		if conditional and response.headers.get("ETag"):
+			self.state["etags"][key] = response.headers["ETag"]
+		return response
+
+	def _load_state(self) -> Dict[str, Any]:
+		state = {"commit": None, "files": {}, "threads_since": None, "threads": {}, "etags": {}}
+		try:
+			with open(self.state_path, "r") as file:
+				state.update(json.load(file))
+		except (FileNotFoundError, json.JSONDecodeError):
+			pass
+		return state
@@ -0,0 +1,170 @@
+import json
+import re
+from typing import Any, Iterator, List, Optional, Tuple, Union
+
+from ..rag.ingestion import Chunk, structured_chunks
+
+_TOKEN = re.compile(
+	r'\s*(?:("(?:[^"\\]|\\.)*")|([{}\[\]:,])|(-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][+-]?\d+)?|true|false|null))',
+	re.DOTALL,
+)
+# What may follow a number or literal, which is otherwise only complete once one is read.
+_DELIMITER = re.compile(r"[\s,:\]}]")
+_TOKEN_START = re.compile(r'["{}\[\]:,\-0-9tfn]')
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+_INDEX = re.compile(r"\[\d+\]")
+
+Path = Tuple[Union[str, int], ...]
+
+
+def json_tokens(file: Any, block_size: int = 1 << 16, max_token_size: int = 1 << 26) -> Iterator[Tuple[str, str]]:
+	"""
+	Tokenizes a JSON text stream, yielding `(kind, token)` where kind is "string", "punct" or "literal".
+
+	The file is read `block_size` characters at a time and consumed input is dropped, so
+	memory is bounded by the block size and the longest token.
+
+	Raises:
+		ValueError: On invalid JSON, or a token longer than `max_token_size` characters.
+	"""
+	buffer, position, eof = "", 0, False
+	while True:
+		match = _TOKEN.match(buffer, position)
+		# A token touching the end of the buffer may continue in the next block, as may a
+		# number with no delimiter after it, e.g. the `1` of a `1.5` split across blocks.
+		incomplete = match is None or match.end() == len(buffer) or (
+			match.group(3) is not None and not _DELIMITER.search(buffer, match.end())
+		)
+		if incomplete and not eof:
+			rest = buffer[position:].lstrip()
+			if rest and not _TOKEN_START.match(rest):
+				raise ValueError(f"Invalid JSON near: {rest[:40]!r}")
+			if len(rest) > max_token_size:
+				raise ValueError(f"JSON token longer than {max_token_size} characters near: {rest[:40]!r}")
+			block = file.read(block_size)
+			eof = not block
+			buffer, position = rest + block, 0
+			continue
+		if match is None:
+			if buffer[position:].strip():
+				raise ValueError(f"Invalid JSON near: {buffer[position:position + 40]!r}")
+			return
+		position = match.end()
+		if match.group(1) is not None:
+			yield "string", match.group(1)
+		elif match.group(2) is not None:
+			yield "punct", match.group(2)
+		else:
+			yield "literal", match.group(3)
+
+
+def json_leaves(file: Any, json_lines: bool = False, block_size: int = 1 << 16) -> Iterator[Tuple[Path, Any]]:
+	"""
+	Streams the scalar values of a JSON document with their path, without loading the document.
+
+	Empty objects and arrays are yielded as values. With `json_lines`, the file is read as a
+	sequence of documents, each under its position in the file.
+	"""
+	stack: List[List[Any]] = []  # [kind, key or index, empty] for every open container.
+	documents, expect_key = 0, False
+
+	def path() -> Path:
+		keys = tuple(frame[1] for frame in stack)
+		return (documents,) + keys if json_lines else keys
+
+	for kind, token in json_tokens(file, block_size):
+		if kind == "string" and expect_key:
+			stack[-1][1], stack[-1][2], expect_key = json.loads(token), False, False
+		elif token == ":":
+			continue
+		elif token == ",":
+			if stack[-1][0] == "[":
+				stack[-1][1] += 1
+			else:
+				expect_key = True
+		elif token in ("}", "]"):
+			frame = stack.pop()
+			expect_key = False
+			if frame[2]:
+				yield path(), {} if token == "}" else []
+			if not stack:
+				documents += 1
+		else:
+			if stack:
+				stack[-1][2] = False
+			if token in ("{", "["):
+				stack.append([token, None if token == "{" else 0, True])
+				expect_key = token == "{"
+			else:
+				yield path(), json.loads(token)
+				if not stack:
+					documents += 1
+
+
+def format_path(path: Path) -> str:
+	"""Formats a path as a JSONPath, e.g. `$.items[3].name`."""
+	parts = ["$"]
+	for key in path:
+		if isinstance(key, int):
+			parts.append(f"[{key}]")
+		elif _IDENTIFIER.match(key):
+			parts.append(f".{key}")
+		else:
+			parts.append(f"[{json.dumps(key)}]")
+	return "".join(parts)
+
+
+def path_pattern(path: str) -> str:
+	"""Generalizes the array positions of a JSONPath, `$.items[3].name` becomes `$.items[*].name`."""
+	return _INDEX.sub("[*]", path)
+
+
+def record_length(path: Path, record_depth: Optional[int] = None) -> int:
+	"""
+	Returns how many keys of a leaf's path name the record it belongs to.
+
+	By default a record is an element of the outermost array, e.g. `$.items[3]`, or a
+	top-level member when the document has no arrays.
+	"""
+	if record_depth is not None:
+		return min(record_depth, len(path))
+	for position, key in enumerate(path):
+		if isinstance(key, int):
+			return position + 1
+	return min(1, len(path))
+
+
+def json_chunks(
+	path: str,
+	json_lines: Optional[bool] = None,
+	record_depth: Optional[int] = None,
+	chunk_size: int = 2000,
+	app_id: Optional[str] = None,
+	source: Optional[str] = None,
+) -> Iterator[Chunk]:
+	"""
+	Streams a JSON or JSON-lines file as chunks of records annotated with their JSONPath.
+
+	Each line of a chunk is a value with its path relative to the record, e.g.
+	`author.name: Ada` in the chunk of `$.items[3]`.
+
+	Parameters:
+		path (str): The JSON file.
+		json_lines (Optional[bool]): Read the file as JSON lines, defaults to True for `.jsonl` and `.ndjson` files.
+		record_depth (Optional[int]): Number of path keys naming a record, see `record_length`.
+		chunk_size (int): Maximum number of characters in a chunk.
+		app_id (Optional[str]): Embedchain app id used to prefix chunk ids.
+		source (Optional[str]): The source the chunks are stored under, added to their ids when given.
+	"""
+	if json_lines is None:
+		json_lines = path.lower().endswith((".jsonl", ".ndjson"))
+
+	def entries(file: Any) -> Iterator[Tuple[str, str]]:
+		for leaf_path, value in json_leaves(file, json_lines=json_lines):
+			length = record_length(leaf_path, record_depth)
+			relative = format_path(leaf_path[length:])[1:].lstrip(".")
+			text = value if isinstance(value, str) else json.dumps(value)
+			yield format_path(leaf_path[:length]), f"{relative}: {text}" if relative else text
+
+	with open(path, "r", encoding="utf-8") as file:
+		yield from structured_chunks(entries(file), path, path_pattern, {"data_type": "json"}, app_id, chunk_size, source)
@@ -1,15 +1,18 @@
-from typing import Optional, Type, Any
+import hashlib
+import json
+import os
+from typing import Iterator, List, Optional, Type, Any
 from pydantic.v1 import BaseModel, Field
 
-from embedchain import App
-from embedchain.models.data_type import DataType
-
+from ..rag.ingestion import Chunk
 from ..rag.rag_tool import RagTool
+from .json_chunks import json_chunks, path_pattern
 
 
 class FixedJSONSearchToolSchema(BaseModel):
 	"""Input for JSONSearchTool."""
 	search_query: str = Field(..., description="Mandatory search query you want to use to search the JSON's content")
+	path_filter: Optional[str] = Field(None, description="Optional JSONPath, e.g. `$.items[*]` or `$.items[3]`, to only search the matching records")
 
 class JSONSearchToolSchema(FixedJSONSearchToolSchema):
 	"""Input for JSONSearchTool."""
@@ -21,12 +24,15 @@ class JSONSearchTool(RagTool):
 	summarize: bool = False
 	args_schema: Type[BaseModel] = JSONSearchToolSchema
 	json_path: Optional[str] = None
+	json_lines: Optional[bool] = None
+	record_depth: Optional[int] = None
+	path_filter: Optional[str] = None
 
 	def __init__(self, json_path: Optional[str] = None, **kwargs):
 		super().__init__(**kwargs)
 		if json_path is not None:
 			self.json_path = json_path
-			self.description = f"A tool that can be used to semantic search a query the {json} JSON's content."
+			self.description = f"A tool that can be used to semantic search a query the {json_path} JSON's content."
 			self.args_schema = FixedJSONSearchToolSchema
 			self._generate_description()
 
@@ -35,7 +41,22 @@ class JSONSearchTool(RagTool):
 		search_query: str,
 		**kwargs: Any,
 	) -> Any:
-		json_path = kwargs.get('json_path', self.json_path)
-		self.app = App()
-		self.app.add(json_path, data_type=DataType.JSON)
-		return super()._run(query=search_query)
\ No newline at end of file
+		json_path = os.path.abspath(kwargs.get('json_path', self.json_path))
+		path_filter = kwargs.get('path_filter') or self.path_filter
+		self._ensure_app()
+		self._index_file(json_path, self._manifest_path(), self._json_chunks, self._options_source(json_path, self._options()))
+		if path_filter:
+			self._filter_path(path_filter, path_pattern)
+		return super()._run(query=search_query)
+
+	def _json_chunks(self, path: str, digest: str) -> Iterator[Chunk]:
+		app_id = self.app.config.id if self.app.config is not None else None
+		return json_chunks(path, json_lines=self.json_lines, record_depth=self.record_depth, app_id=app_id, source=self._options_source(path, self._options()))
+
+	def _options(self) -> List[Any]:
+		return [self.json_lines, self.record_depth]
+
+	def _manifest_path(self) -> str:
+		# Files are chunked differently for each record depth, so each one gets its own manifest.
+		options = json.dumps(self._options())
+		return self._state_path("json_search", f"{hashlib.sha256(options.encode('utf-8')).hexdigest()}.json")
@@ -1,9 +1,11 @@
-from typing import Optional, Type, Any
+import os
+from typing import Iterator, List, Optional, Type, Any
+from pydantic import PrivateAttr
 from pydantic.v1 import BaseModel, Field
 
-from embedchain import App
 from embedchain.models.data_type import DataType
 
+from ..rag.ingestion import Chunk, file_chunks
 from ..rag.rag_tool import RagTool
 
 
@@ -22,6 +24,8 @@ class MDXSearchTool(RagTool):
 	args_schema: Type[BaseModel] = MDXSearchToolSchema
 	mdx: Optional[str] = None
 
+	_citation_keys: List[str] = PrivateAttr(default_factory=lambda: ["heading"])
+
 	def __init__(self, mdx: Optional[str] = None, **kwargs):
 		super().__init__(**kwargs)
 		if mdx is not None:
@@ -35,7 +39,14 @@ class MDXSearchTool(RagTool):
 		search_query: str,
 		**kwargs: Any,
 	) -> Any:
-		mdx = kwargs.get('mdx', self.mdx)
-		self.app = App()
-		self.app.add(mdx, data_type=DataType.MDX)
-		return super()._run(query=search_query)
\ No newline at end of file
+		mdx = os.path.abspath(kwargs.get('mdx', self.mdx))
+		self._ensure_app()
+		self._index_file(mdx, self._state_path("mdx_search", f"manifest-{self.chunk_size}-{self.chunk_overlap}.json"), self._mdx_chunks, self._source(mdx))
+		return super()._run(query=search_query)
+
+	def _mdx_chunks(self, path: str, digest: str) -> Iterator[Chunk]:
+		app_id = self.app.config.id if self.app.config is not None else None
+		return file_chunks(path, DataType.MDX.value, app_id, self.chunk_size, self.chunk_overlap, markdown=True, source=self._source(path))
+
+	def _source(self, path: str) -> str:
+		return self._options_source(path, [self.chunk_size, self.chunk_overlap])
\ No newline at end of file
@@ -0,0 +1,104 @@
+import json
+import math
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from ..rag.ingestion import split_text
+from ..storage import storage_path
+
+
+def _read_pages(path: str, start: int, stop: int) -> List[str]:
+	from pypdf import PdfReader
+
+	reader = PdfReader(path)
+	return [reader.pages[number].extract_text() or "" for number in range(start, stop)]
+
+
+def extract_pages(path: str, max_workers: Optional[int] = None, pages_per_task: Optional[int] = None) -> List[str]:
+	"""
+	Extracts the text of every page of a PDF, splitting page ranges across worker processes.
+
+	Each worker opens the file once per range it is given, so ranges are kept a few times
+	larger than one page while still leaving several per worker to balance uneven pages.
+
+	Parameters:
+		path (str): The PDF file.
+		max_workers (Optional[int]): Worker processes, defaults to the CPU count.
+		pages_per_task (Optional[int]): Pages extracted by one task, defaults to a quarter of each worker's share.
+	"""
+	try:
+		from pypdf import PdfReader
+	except ImportError as e:
+		raise ImportError("PDFSearchTool requires pypdf, run `pip install pypdf`") from e
+
+	count = len(PdfReader(path).pages)
+	max_workers = max_workers or os.cpu_count() or 1
+	pages_per_task = pages_per_task or max(math.ceil(count / (max_workers * 4)), 8)
+	starts = list(range(0, count, pages_per_task))
+	stops = [min(start + pages_per_task, count) for start in starts]
+	if max_workers == 1 or len(starts) <= 1:
+		return [text for start, stop in zip(starts, stops) for text in _read_pages(path, start, stop)]
+
+	# Parsers are not fork-safe once vector store clients hold threads and sockets.
+	context = multiprocessing.get_context("spawn")
+	with ProcessPoolExecutor(max_workers=min(max_workers, len(starts)), mp_context=context) as executor:
+		ranges = executor.map(_read_pages, [path] * len(starts), starts, stops)
+		return [text for texts in ranges for text in texts]
+
+
+class PDFPageCache:
+	"""
+	Extracted pages and chunks of PDFs, stored by content hash.
+
+	A file version is extracted once however many times, or under however many paths, it
+	is indexed, and chunked once per chunk size and overlap it is indexed with. Chunks are
+	stored as `(page, text)` with 1-based page numbers, ids and urls are derived from the
+	path they are indexed under.
+
+	Attributes:
+		directory (str): Where entries are stored, one JSON file per content hash.
+	"""
+
+	def __init__(self, directory: Optional[str] = None):
+		self.directory = directory or storage_path("pdf_search", "pages", "")
+		os.makedirs(self.directory, exist_ok=True)
+
+	def get(self, digest: str) -> Optional[Dict[str, Any]]:
+		try:
+			with open(self._path(digest), "r") as file:
+				return json.load(file)
+		except (FileNotFoundError, json.JSONDecodeError):
+			return None
+
+	def extract(
+		self,
+		path: str,
+		digest: str,
+		chunk_size: int = 500,
+		chunk_overlap: int = 50,
+		max_workers: Optional[int] = None,
+	) -> List[List[Any]]:
+		"""Returns the chunks of a file version, extracting its pages and chunking them on a miss."""
+		key = f"{chunk_size}-{chunk_overlap}"
+		entry = self.get(digest)
+		if entry is not None and key in entry["chunks"]:
+			return entry["chunks"][key]
+
+		if entry is None:
+			entry = {"pages": extract_pages(path, max_workers=max_workers), "chunks": {}}
+		chunks = [
+			[number, text]
+			for number, page in enumerate(entry["pages"], start=1)
+			for text in split_text(page, chunk_size, chunk_overlap)
+		]
+		entry["chunks"][key] = chunks
+		tmp_path = f"{self._path(digest)}.tmp"
+		with open(tmp_path, "w") as file:
+			json.dump(entry, file)
+		os.replace(tmp_path, self._path(digest))
+		return chunks
+
+	def _path(self, digest: str) -> str:
+		return os.path.join(self.directory, f"{digest}.json")
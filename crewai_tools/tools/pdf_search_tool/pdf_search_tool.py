@@ -1,10 +1,12 @@
-from typing import Optional, Type, Any
+import hashlib
+import os
+from typing import Iterator, List, Optional, Type, Any
+from pydantic import PrivateAttr
 from pydantic.v1 import BaseModel, Field
 
-from embedchain import App
-from embedchain.models.data_type import DataType
-
+from ..rag.ingestion import Chunk
 from ..rag.rag_tool import RagTool
+from .pdf_pages import PDFPageCache
 
 
 class FixedPDFSearchToolSchema(BaseModel):
@@ -22,6 +24,8 @@ class PDFSearchTool(RagTool):
 	args_schema: Type[BaseModel] = PDFSearchToolSchema
 	pdf: Optional[str] = None
 
+	_citation_keys: List[str] = PrivateAttr(default_factory=lambda: ["page"])
+
 	def __init__(self, pdf: Optional[str] = None, **kwargs):
 		super().__init__(**kwargs)
 		if pdf is not None:
@@ -35,7 +39,21 @@ class PDFSearchTool(RagTool):
 		query: str,
 		**kwargs: Any,
 	) -> Any:
-		pdf = kwargs.get('pdf', self.pdf)
-		self.app = App()
-		self.app.add(pdf, data_type=DataType.PDF_FILE)
-		return super()._run(query=query)
\ No newline at end of file
+		pdf = os.path.abspath(kwargs.get('pdf', self.pdf))
+		self._ensure_app()
+		self._index_file(pdf, self._state_path("pdf_search", f"manifest-{self.chunk_size}-{self.chunk_overlap}.json"), self._page_chunks, self._source(pdf))
+		return super()._run(query=query)
+
+	def _page_chunks(self, pdf: str, digest: str) -> Iterator[Chunk]:
+		"""Yields the chunks of a PDF version from the page cache, extracting its pages on a miss."""
+		app_id = self.app.config.id if self.app.config is not None else None
+		source = self._source(pdf)
+		chunks = PDFPageCache().extract(pdf, digest, self.chunk_size, self.chunk_overlap, max_workers=self.ingestion_workers)
+		for page, text in chunks:
+			url = f"{pdf}#page={page}"
+			chunk_id = hashlib.sha256((text + url + source).encode()).hexdigest()
+			chunk_id = f"{app_id}--{chunk_id}" if app_id is not None else chunk_id
+			yield Chunk(id=chunk_id, text=text, metadata={"url": url, "path": pdf, "page": page, "data_type": "pdf_file"})
+
+	def _source(self, path: str) -> str:
+		return self._options_source(path, [self.chunk_size, self.chunk_overlap])
@@ -1,9 +1,12 @@
-from typing import Optional, Type, Any
+import hashlib
+import json
+import os
+import sys
+from typing import Any, Callable, Dict, Iterator, List, Optional, Type
+from urllib.parse import urlsplit, urlunsplit
 from pydantic.v1 import BaseModel, Field
 
-from embedchain import App
-from embedchain.loaders.postgres import PostgresLoader
-
+from ..rag.ingestion import Chunk, delete_records, source_hash, write_chunks
 from ..rag.rag_tool import RagTool
 
 class PGSearchToolSchema(BaseModel):
@@ -18,6 +21,11 @@ class PGSearchTool(RagTool):
 	db_uri: str = Field(..., description="Mandatory database URI")
 	table_name: str = Field(..., description="Mandatory table name")
 	search_query: str = Field(..., description="Mandatory semantic search query you want to use to search the database's content")
+	id_column: str = "id"
+	text_columns: Optional[List[str]] = None
+	watermark_column: Optional[str] = None
+	batch_size: int = 1000
+	connection_factory: Optional[Callable[[], Any]] = None
 
 	def __init__(self, table_name: Optional[str] = None, **kwargs):
 		super().__init__(**kwargs)
@@ -26,20 +34,145 @@ class PGSearchTool(RagTool):
 			self.description = f"A tool that can be used to semantic search a query the {table_name} database table's content."
 			self._generate_description()
 		else:
-			raise('To use PGSearchTool, you must provide a `table_name` argument')
+			raise ValueError('To use PGSearchTool, you must provide a `table_name` argument')
 
 	def _run(
 		self,
 		search_query: str,
 		**kwargs: Any,
 	) -> Any:
+		self._ensure_app()
+		self._sync_table()
+		return super()._run(query=search_query)
+
+	def _sync_table(self) -> None:
+		"""
+		Embeds the rows changed since the last stored watermark, one batch at a time.
+
+		Rows deleted from the table are not detected, their chunks stay in the index until it is rebuilt.
+		"""
+		source = self._source_name()
+		self._scope = f"{self.__class__.__name__}:{source}"
+		self._where = {"hash": source_hash(source)}
+		state_path = self._state_path("pg_search", f"{hashlib.sha256(source.encode('utf-8')).hexdigest()}.json")
+		state = self._load_state(state_path)
+		incremental = state is not None
+		changed = False
+
+		connection = self._connect()
+		try:
+			for rows in self._fetch_changed_rows(connection, state):
+				if incremental:
+					delete_records(self.app, source, (str(row[self.id_column]) for row in rows))
+				write_chunks(self.app, (self._row_to_chunk(source, row) for row in rows), source)
+				state = self._watermark(rows) or state or {"watermark": None, "id": None}
+				self._save_state(state_path, state)
+				changed = True
+		finally:
+			connection.close()
+
+		if changed:
+			self._invalidate()
+
+	def _fetch_changed_rows(self, connection: Any, state: Optional[Dict[str, Any]]) -> Iterator[List[Dict[str, Any]]]:
+		"""
+		Streams rows ordered by (watermark, id) in `batch_size` batches through a server-side cursor.
+
+		Ordering on both columns lets the next sync resume strictly after the last row it saw,
+		even when several rows share the same watermark value. Rows with a NULL watermark are
+		only read by the first sync, since NULL never compares greater than the stored watermark.
+		"""
+		watermark_column = self.watermark_column or self.id_column
+		order_by = [watermark_column] if watermark_column == self.id_column else [watermark_column, self.id_column]
+		columns = self._selected_columns()
+		query = f"SELECT {', '.join(columns) if columns else '*'} FROM {self.table_name}"
+		params: List[Any] = []
+		if state is not None and state["id"] is None:
+			# Every row seen so far had a NULL watermark, those are never compared against again.
+			query += f" WHERE {watermark_column} IS NOT NULL"
+		elif state is not None:
+			mark = self._placeholder(connection)
+			if watermark_column == self.id_column:
+				query += f" WHERE {self.id_column} > {mark}"
+				params = [state["id"]]
+			else:
+				query += f" WHERE {watermark_column} > {mark} OR ({watermark_column} = {mark} AND {self.id_column} > {mark})"
+				params = [state["watermark"], state["watermark"], state["id"]]
+		query += f" ORDER BY {', '.join(order_by)}"
+
+		try:
+			# Named cursors are server-side in psycopg, so only `batch_size` rows are held at once.
+			cursor = connection.cursor(name=f"crewai_pg_search_{os.getpid()}")
+		except TypeError:
+			cursor = connection.cursor()
+		try:
+			cursor.execute(query, params)
+			names = None
+			while True:
+				rows = cursor.fetchmany(self.batch_size)
+				if not rows:
+					break
+				names = names or [column[0] for column in cursor.description]
+				yield [dict(zip(names, row)) for row in rows]
+		finally:
+			cursor.close()
+
+	def _row_to_chunk(self, source: str, row: Dict[str, Any]) -> Chunk:
+		row_id = str(row[self.id_column])
+		text_columns = self.text_columns or [column for column in row if column != self.watermark_column]
+		text = ", ".join(f"{column}: {row[column]}" for column in text_columns if row.get(column) is not None)
+		chunk_id = hashlib.sha256(f"{source}:{row_id}:{text}".encode("utf-8")).hexdigest()
+		return Chunk(id=chunk_id, text=text, metadata={"url": source, "record_id": row_id, "data_type": "postgres"})
+
+	def _selected_columns(self) -> List[str]:
+		if not self.text_columns:
+			return []
+		columns = [self.id_column, *self.text_columns]
+		if self.watermark_column:
+			columns.append(self.watermark_column)
+		return list(dict.fromkeys(columns))
+
+	def _watermark(self, rows: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+		"""Returns the watermark of the last row in the batch that has one, PostgreSQL sorts NULLs last."""
+		def serialize(value: Any) -> Any:
+			return value.isoformat() if hasattr(value, "isoformat") else value
+
+		for row in reversed(rows):
+			watermark = row[self.watermark_column] if self.watermark_column else None
+			if self.watermark_column and watermark is None:
+				continue
+			return {"watermark": serialize(watermark), "id": serialize(row[self.id_column])}
+		return None
+
+	def _connect(self) -> Any:
+		if self.connection_factory is not None:
+			return self.connection_factory()
+		try:
+			import psycopg
+		except ImportError as e:
+			raise ImportError("PGSearchTool requires psycopg, run `pip install 'embedchain[postgres]'`") from e
+		return psycopg.connect(conninfo=self.db_uri)
+
+	def _source_name(self) -> str:
+		"""Identifies the table without the credentials of the database URI."""
+		parts = urlsplit(self.db_uri)
+		netloc = parts.netloc.rsplit("@", 1)[-1]
+		return f"{urlunsplit(parts._replace(netloc=netloc))}#{self.table_name}"
+
+	@staticmethod
+	def _placeholder(connection: Any) -> str:
+		module = sys.modules.get(type(connection).__module__.split(".")[0])
+		return "?" if getattr(module, "paramstyle", None) == "qmark" else "%s"
+
+	@staticmethod
+	def _load_state(path: str) -> Optional[Dict[str, Any]]:
+		try:
+			with open(path, "r") as file:
+				return json.load(file)
+		except (FileNotFoundError, json.JSONDecodeError):
+			return None
 
-		config = { "url":  self.db_uri }
-		postgres_loader = PostgresLoader(config=config)
-		app = App()
-		app.add(
-				f"SELECT * FROM {self.table_name};",
-				data_type='postgres',
-				loader=postgres_loader
-		)
-		return super()._run(query=search_query)
\ No newline at end of file
+	@staticmethod
+	def _save_state(path: str, state: Dict[str, Any]) -> None:
+		with open(path, "w") as file:
+			json.dump(state, file)
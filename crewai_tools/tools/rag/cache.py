@@ -0,0 +1,81 @@
+import math
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+
+class SemanticCache:
+    """
+    Caches retrieval results keyed by the embedding of the query that produced them.
+
+    A lookup returns the result of the most similar cached query in the same scope,
+    provided their cosine similarity reaches `threshold`. Scopes are usually one per
+    source or index and are invalidated independently when that source changes.
+
+    Attributes:
+        threshold (float): Minimum cosine similarity for a cached result to be reused.
+        max_entries (int): Maximum number of cached queries kept per scope (LRU).
+        hits (int): Number of lookups answered from the cache.
+        misses (int): Number of lookups that had to go to the knowledge base.
+    """
+
+    def __init__(self, threshold: float = 0.95, max_entries: int = 256):
+        if not 0 < threshold <= 1:
+            raise ValueError("threshold must be in the (0, 1] range")
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._scopes: Dict[str, "OrderedDict[int, Tuple[List[float], Any]]"] = {}
+        self._next_key = 0
+        self._lock = threading.Lock()
+
+    def get(self, scope: str, embedding: Sequence[float]) -> Optional[Any]:
+        """Returns the cached result for the closest query in `scope`, or None."""
+        vector = self._normalize(embedding)
+        with self._lock:
+            entries = self._scopes.get(scope)
+            best_key, best_score = None, self.threshold
+            for key, (cached, _) in (entries or {}).items():
+                score = sum(a * b for a, b in zip(vector, cached))
+                if score >= best_score:
+                    best_key, best_score = key, score
+            if best_key is None:
+                self.misses += 1
+                return None
+            entries.move_to_end(best_key)
+            self.hits += 1
+            return entries[best_key][1]
+
+    def set(self, scope: str, embedding: Sequence[float], result: Any) -> None:
+        """Stores the result of a query in `scope`, evicting the least recently used entry if full."""
+        vector = self._normalize(embedding)
+        with self._lock:
+            entries = self._scopes.setdefault(scope, OrderedDict())
+            entries[self._next_key] = (vector, result)
+            self._next_key += 1
+            while len(entries) > self.max_entries:
+                entries.popitem(last=False)
+
+    def invalidate(self, scope: Optional[str] = None) -> None:
+        """
+        Drops every cached result of `scope`, or of all scopes when none is given.
+
+        Sub-scopes, named `{scope}#...` such as filtered searches of a source, are dropped with it.
+        """
+        with self._lock:
+            if scope is None:
+                self._scopes.clear()
+                return
+            for key in [key for key in self._scopes if key == scope or key.startswith(f"{scope}#")]:
+                del self._scopes[key]
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    @staticmethod
+    def _normalize(embedding: Sequence[float]) -> List[float]:
+        norm = math.sqrt(sum(value * value for value in embedding)) or 1.0
+        return [value / norm for value in embedding]
@@ -0,0 +1,224 @@
+import re
+from functools import lru_cache
+from typing import Any, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+_WORD = re.compile(r"\w+|[^\w\s]")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+_HEADING = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+_FENCES = ("```", "~~~")
+
+
+@lru_cache(maxsize=None)
+def _encoding(name: str) -> Optional[Any]:
+    try:
+        import tiktoken
+
+        return tiktoken.get_encoding(name)
+    except Exception:
+        # tiktoken is missing, or could not fetch its vocabulary.
+        return None
+
+
+class TokenCounter:
+    """
+    Counts and splits text in tokens of a tiktoken encoding.
+
+    Texts are counted in batches with tiktoken's multi-threaded batch encoder. Without
+    tiktoken, or when its vocabulary can't be loaded, tokens are approximated by words and
+    punctuation marks.
+    """
+
+    def __init__(self, encoding: str = "cl100k_base"):
+        self.encoding = _encoding(encoding)
+
+    def counts(self, texts: List[str]) -> List[int]:
+        if self.encoding is not None:
+            return [len(tokens) for tokens in self.encoding.encode_ordinary_batch(texts)]
+        return [len(_WORD.findall(text)) for text in texts]
+
+    def split(self, text: str, size: int) -> List[str]:
+        """Splits text into consecutive pieces of at most `size` tokens, which concatenate back to the text."""
+        if self.encoding is not None:
+            tokens = self.encoding.encode_ordinary(text)
+            return [self.encoding.decode(tokens[start : start + size]) for start in range(0, len(tokens), size)]
+        starts = [match.start() for match in _WORD.finditer(text)][size::size]
+        bounds = [0, *starts, len(text)]
+        return [text[start:end] for start, end in zip(bounds, bounds[1:]) if start < end]
+
+    def tail(self, text: str, size: int) -> str:
+        """Returns the end of text made of its last `size` tokens."""
+        if size <= 0:
+            return ""
+        if self.encoding is not None:
+            return self.encoding.decode(self.encoding.encode_ordinary(text)[-size:])
+        starts = [match.start() for match in _WORD.finditer(text)]
+        return text[starts[-size]:] if len(starts) > size else text
+
+
+class TextChunk(NamedTuple):
+    text: str
+    heading: str
+
+
+class _Unit(NamedTuple):
+    text: str
+    tokens: int
+    separator: str
+
+
+class TextChunker:
+    """
+    Splits a stream of lines into chunks of at most `chunk_size` tokens.
+
+    Chunks are made of whole paragraphs where possible, and in markdown of whole code blocks,
+    and never span two sections: every heading starts a new chunk. A paragraph or code block
+    longer than a chunk is split on lines, then lines longer than a chunk on token counts.
+    Consecutive chunks of a section share up to `chunk_overlap` tokens: the last paragraphs
+    or lines that fit whole, then the last sentences, or else tokens, of the one before them.
+    Only the chunk being built is held in memory, and paragraphs are counted `batch_size` at
+    a time.
+
+    Attributes:
+        chunk_size (int): Maximum number of tokens in a chunk, not counting the separators between paragraphs.
+        chunk_overlap (int): Maximum number of tokens repeated from the previous chunk.
+        markdown (bool): Whether to recognize markdown headings and fenced code blocks.
+    """
+
+    def __init__(
+        self,
+        chunk_size: int = 500,
+        chunk_overlap: int = 50,
+        markdown: bool = False,
+        counter: Optional[TokenCounter] = None,
+        batch_size: int = 256,
+    ):
+        if chunk_overlap >= chunk_size:
+            raise ValueError("chunk_overlap must be smaller than chunk_size")
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.markdown = markdown
+        self.counter = counter or TokenCounter()
+        self.batch_size = batch_size
+
+    def split(self, text: str) -> List[TextChunk]:
+        return list(self.chunks(text.splitlines()))
+
+    def chunks(self, lines: Iterable[str]) -> Iterator[TextChunk]:
+        units: List[_Unit] = []
+        size, fresh, headings = 0, False, []
+
+        def flush(overlap: int) -> Iterator[TextChunk]:
+            nonlocal units, size, fresh
+            if fresh:
+                text = units[0].text + "".join(unit.separator + unit.text for unit in units[1:])
+                yield TextChunk(text=text, heading=" > ".join(title for _, title in headings))
+            kept, kept_size = [], 0
+            for unit in reversed(units if fresh else []):
+                if kept_size + unit.tokens > overlap:
+                    # Paragraphs are usually longer than the overlap, their end is carried instead.
+                    tail = self._tail(unit, overlap - kept_size)
+                    if tail is not None:
+                        kept.insert(0, tail)
+                        kept_size += tail.tokens
+                    break
+                kept.insert(0, unit)
+                kept_size += unit.tokens
+            units, size, fresh = kept, kept_size, False
+
+        for kind, text, tokens in self._counted(self._blocks(lines)):
+            if kind == "heading":
+                yield from flush(0)
+                level, title = _heading(text)
+                headings = [(depth, name) for depth, name in headings if depth < level] + [(level, title)]
+            for unit in self._units(text, tokens):
+                if fresh and size + unit.tokens > self.chunk_size:
+                    yield from flush(self.chunk_overlap)
+                while units and size + unit.tokens > self.chunk_size:
+                    size -= units.pop(0).tokens
+                units.append(unit)
+                size += unit.tokens
+                # A section's heading alone is not worth a chunk, it is kept for the section's text.
+                fresh = fresh or kind != "heading"
+        yield from flush(0)
+
+    def _tail(self, unit: _Unit, size: int) -> Optional[_Unit]:
+        """Returns the last sentences of a unit fitting in `size` tokens, or its last `size` tokens when none does."""
+        if size <= 0:
+            return None
+        starts = [0, *(match.end() for match in _SENTENCE_END.finditer(unit.text))]
+        sentences = [unit.text[start:end].strip() for start, end in zip(starts, [*starts[1:], len(unit.text)])]
+        start, tokens = None, 0
+        for position, sentence_tokens in reversed(list(enumerate(self.counter.counts(sentences)))):
+            if tokens + sentence_tokens > size:
+                break
+            start, tokens = starts[position], tokens + sentence_tokens
+        text = unit.text[start:] if start is not None else self.counter.tail(unit.text, size).lstrip()
+        if not text:
+            return None
+        return _Unit(text, tokens if start is not None else self.counter.counts([text])[0], unit.separator)
+
+    def _units(self, text: str, tokens: int) -> Iterator[_Unit]:
+        """Yields a block whole if it fits in a chunk, otherwise its lines, and the token windows of its longest lines."""
+        if tokens <= self.chunk_size:
+            yield _Unit(text, tokens, "\n\n")
+            return
+        separator = "\n\n"
+        lines = text.split("\n")
+        for line, line_tokens in zip(lines, self.counter.counts(lines)):
+            if line_tokens <= self.chunk_size:
+                yield _Unit(line, line_tokens, separator)
+            else:
+                pieces = self.counter.split(line, self.chunk_size)
+                for index, (piece, piece_tokens) in enumerate(zip(pieces, self.counter.counts(pieces))):
+                    yield _Unit(piece, piece_tokens, separator if index == 0 else "")
+            separator = "\n"
+
+    def _counted(self, blocks: Iterator[Tuple[str, str]]) -> Iterator[Tuple[str, str, int]]:
+        batch = []
+        for block in blocks:
+            batch.append(block)
+            if len(batch) >= self.batch_size:
+                yield from self._count(batch)
+                batch = []
+        yield from self._count(batch)
+
+    def _count(self, batch: List[Tuple[str, str]]) -> Iterator[Tuple[str, str, int]]:
+        counts = self.counter.counts([text for _, text in batch]) if batch else []
+        for (kind, text), tokens in zip(batch, counts):
+            yield kind, text, tokens
+
+    def _blocks(self, lines: Iterable[str]) -> Iterator[Tuple[str, str]]:
+        """Yields the `(kind, text)` blocks of the lines: "text" paragraphs, and in markdown "code" blocks and "heading" lines."""
+        block: List[str] = []
+        fence = None
+        for line in lines:
+            line = line.rstrip("\r\n")
+            stripped = line.strip()
+            if fence is not None:
+                block.append(line)
+                if stripped.startswith(fence) and not stripped.strip(fence[0]):
+                    yield "code", "\n".join(block)
+                    block, fence = [], None
+                continue
+            if self.markdown and stripped.startswith(_FENCES):
+                if block:
+                    yield "text", "\n".join(block)
+                block, fence = [line], stripped[:3]
+            elif self.markdown and _HEADING.match(stripped):
+                if block:
+                    yield "text", "\n".join(block)
+                block = []
+                yield "heading", stripped
+            elif not stripped:
+                if block:
+                    yield "text", "\n".join(block)
+                block = []
+            else:
+                block.append(line)
+        if block:
+            yield "code" if fence is not None else "text", "\n".join(block)
+
+
+def _heading(line: str) -> Tuple[int, str]:
+    match = _HEADING.match(line)
+    return len(match.group(1)), match.group(2)
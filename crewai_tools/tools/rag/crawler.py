@@ -0,0 +1,269 @@
+import asyncio
+import hashlib
+import json
+import os
+import posixpath
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, NamedTuple, Optional, Set, Tuple
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+from xml.etree import ElementTree
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+_SKIPPED_EXTENSIONS = (
+    ".png", ".jpg", ".jpeg", ".gif", ".svg", ".ico", ".webp", ".css", ".js", ".json", ".xml",
+    ".zip", ".gz", ".tar", ".pdf", ".mp3", ".mp4", ".woff", ".woff2", ".ttf",
+)
+_BOILERPLATE_TAGS = ["script", "style", "noscript", "nav", "header", "footer", "aside", "form"]
+
+
+def normalize_url(url: str, base: Optional[str] = None) -> Optional[str]:
+    """
+    Returns the canonical form of a URL, used to deduplicate pages, or None if it is not HTTP(S).
+
+    The URL is resolved against `base`, its scheme and host are lowercased, and default ports,
+    fragments, `utm_*` tracking parameters and duplicate slashes are dropped. Query parameters
+    are sorted.
+    """
+    if base is not None:
+        url = urljoin(base, url)
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    if scheme not in _DEFAULT_PORTS or not parts.hostname:
+        return None
+    host = parts.hostname.lower()
+    if parts.port and parts.port != _DEFAULT_PORTS[scheme]:
+        host = f"{host}:{parts.port}"
+    path = posixpath.normpath(parts.path) if parts.path not in ("", "/") else "/"
+    if parts.path.endswith("/") and path != "/":
+        path += "/"
+    query = urlencode(sorted(pair for pair in parse_qsl(parts.query, keep_blank_values=True) if not pair[0].startswith("utm_")))
+    return urlunsplit((scheme, host, path, query, ""))
+
+
+def parse_html(html: str, url: str) -> Tuple[str, str, List[str]]:
+    """Returns the title, main text and normalized links of an HTML page."""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
+    links = [normalize_url(anchor["href"], url) for anchor in soup.find_all("a", href=True)]
+    title = soup.title.get_text(strip=True) if soup.title else ""
+    for tag in soup(_BOILERPLATE_TAGS):
+        tag.decompose()
+    content = soup.find("main") or soup.find("article") or soup.body or soup
+    lines = (line.strip() for line in content.get_text("\n").splitlines())
+    return title, "\n".join(line for line in lines if line), [link for link in links if link]
+
+
+class Page(NamedTuple):
+    url: str
+    title: str
+    text: str
+
+
+class CrawlDelta(NamedTuple):
+    changed: List[Page]
+    removed: List[str]
+
+    def __bool__(self) -> bool:
+        return bool(self.changed or self.removed)
+
+
+class SiteCrawler:
+    """
+    Concurrent crawler of the pages under a URL, revalidating what it fetched before.
+
+    Pages are fetched by a pool of workers, with at most `per_host_concurrency` requests in
+    flight to one host, starting from the URL and from the site's sitemaps. The crawl state
+    records the ETag, Last-Modified date, content digest and links of every page, so a later
+    crawl sends conditional requests, follows the stored links of pages answered with
+    `304 Not Modified`, and only reports the pages whose content changed or disappeared.
+
+    Attributes:
+        start_url (str): The normalized URL the crawl starts from.
+        prefix (str): Only URLs starting with it are crawled, the directory of the start URL.
+        state_path (str): Where the crawl state is persisted as JSON.
+        session (Any): A `requests.Session` compatible HTTP client, shared by the workers.
+        max_pages (int): Maximum number of pages crawled.
+        max_depth (Optional[int]): Maximum number of links followed from the start URL, None for no limit.
+    """
+
+    VERSION = 1
+
+    def __init__(
+        self,
+        start_url: str,
+        state_path: str,
+        session: Optional[Any] = None,
+        max_pages: int = 5000,
+        max_depth: Optional[int] = None,
+        max_concurrency: int = 16,
+        per_host_concurrency: int = 4,
+        use_sitemap: bool = True,
+        timeout: float = 30,
+    ):
+        normalized = normalize_url(start_url)
+        if normalized is None:
+            raise ValueError(f"{start_url} is not an HTTP(S) URL")
+        if session is None:
+            import requests
+
+            session = requests.Session()
+        self.start_url = normalized
+        parts = urlsplit(normalized)
+        self.prefix = urlunsplit((parts.scheme, parts.netloc, parts.path.rsplit("/", 1)[0] + "/", "", ""))
+        self.state_path = state_path
+        self.session = session
+        self.max_pages = max_pages
+        self.max_depth = max_depth
+        self.max_concurrency = max_concurrency
+        self.per_host_concurrency = per_host_concurrency
+        self.use_sitemap = use_sitemap
+        self.timeout = timeout
+        self.pages: Dict[str, Dict[str, Any]] = self._load()
+
+    def in_scope(self, url: str) -> bool:
+        return url.startswith(self.prefix) and not urlsplit(url).path.lower().endswith(_SKIPPED_EXTENSIONS)
+
+    def crawl(self) -> CrawlDelta:
+        """Crawls the site, returning the pages that changed and the URLs that disappeared since the last saved crawl."""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self._crawl())
+        # Called from a coroutine, the crawl gets its own event loop on another thread.
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, self._crawl()).result()
+
+    def save(self) -> None:
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, "w") as file:
+            json.dump({"version": self.VERSION, "pages": self.pages}, file)
+        os.replace(tmp_path, self.state_path)
+
+    async def _crawl(self) -> CrawlDelta:
+        loop = asyncio.get_running_loop()
+        previous, pages = self.pages, {}
+        changed: List[Page] = []
+        queue: "asyncio.Queue[Tuple[str, int]]" = asyncio.Queue()
+        seen: Set[str] = set()
+        hosts: Dict[str, asyncio.Semaphore] = {}
+
+        def enqueue(url: str, depth: int) -> None:
+            if url in seen or len(seen) >= self.max_pages or not self.in_scope(url):
+                return
+            if self.max_depth is not None and depth > self.max_depth:
+                return
+            seen.add(url)
+            queue.put_nowait((url, depth))
+
+        async def worker() -> None:
+            while True:
+                url, depth = await queue.get()
+                try:
+                    host = hosts.setdefault(urlsplit(url).netloc, asyncio.Semaphore(self.per_host_concurrency))
+                    try:
+                        async with host:
+                            status, entry, page = await loop.run_in_executor(executor, self._fetch, url, previous.get(url))
+                    except Exception as e:
+                        # A page failing to parse is handled like an unreachable one, a worker that
+                        # died on it would leave `queue.join()` waiting forever.
+                        print(f"Failed to crawl {url}: {e}")
+                        status, entry, page = None, None, None
+                    if status == 304 or (status is None and url in previous):
+                        # Unchanged, or unreachable for now, either way its last version is kept.
+                        entry = previous[url]
+                    elif page is not None and previous.get(url, {}).get("digest") != entry["digest"]:
+                        changed.append(page)
+                    if entry is not None:
+                        pages[url] = entry
+                        for link in entry["links"]:
+                            enqueue(link, depth + 1)
+                finally:
+                    queue.task_done()
+
+        # Fetching and parsing run on threads, the event loop only schedules them.
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            enqueue(self.start_url, 0)
+            if self.use_sitemap and self.max_depth != 0:
+                for url in await loop.run_in_executor(executor, self._sitemap_urls):
+                    enqueue(url, 1)
+            workers = [asyncio.create_task(worker()) for _ in range(self.max_concurrency)]
+            try:
+                await queue.join()
+            finally:
+                for task in workers:
+                    task.cancel()
+                await asyncio.gather(*workers, return_exceptions=True)
+
+        self.pages = pages
+        return CrawlDelta(changed=changed, removed=[url for url in previous if url not in pages])
+
+    def _fetch(self, url: str, entry: Optional[Dict[str, Any]]) -> Tuple[Optional[int], Optional[Dict[str, Any]], Optional[Page]]:
+        """Fetches a page, returning its status code, new state entry and content. The status is None on network errors."""
+        headers = {}
+        if entry is not None and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry is not None and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        try:
+            response = self.session.get(url, headers=headers, timeout=self.timeout)
+        except Exception:
+            return None, None, None
+        if response.status_code >= 500 or response.status_code == 429:
+            return None, None, None
+        if response.status_code != 200 or "html" not in response.headers.get("Content-Type", "text/html"):
+            return response.status_code, None, None
+
+        title, text, links = parse_html(response.text, normalize_url(response.url) or url)
+        entry = {
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "digest": hashlib.sha256(f"{title}\n{text}".encode("utf-8")).hexdigest(),
+            "links": sorted({link for link in links if self.in_scope(link)}),
+        }
+        return 200, entry, Page(url=url, title=title, text=text)
+
+    def _sitemap_urls(self, limit: int = 50) -> List[str]:
+        """Returns the in scope URLs listed by the sitemaps of robots.txt, or by `/sitemap.xml`."""
+        parts = urlsplit(self.start_url)
+        root = f"{parts.scheme}://{parts.netloc}/"
+        sitemaps = [f"{root}sitemap.xml", f"{self.prefix}sitemap.xml"]
+        try:
+            response = self.session.get(f"{root}robots.txt", timeout=self.timeout)
+            if response.status_code == 200:
+                listed = [line.split(":", 1)[1].strip() for line in response.text.splitlines() if line.lower().startswith("sitemap:")]
+                sitemaps = listed or sitemaps
+        except Exception:
+            pass
+
+        urls, visited = [], set()
+        while sitemaps and len(visited) < limit:
+            sitemap = sitemaps.pop(0)
+            if sitemap in visited:
+                continue
+            visited.add(sitemap)
+            try:
+                response = self.session.get(sitemap, timeout=self.timeout)
+                if response.status_code != 200:
+                    continue
+                document = ElementTree.fromstring(response.content)
+            except Exception:
+                continue
+            # Sitemap indexes list further sitemaps, other sitemaps list pages.
+            is_index = document.tag.rsplit("}", 1)[-1] == "sitemapindex"
+            for element in document.iter():
+                if element.tag.rsplit("}", 1)[-1] == "loc" and element.text:
+                    url = normalize_url(element.text, sitemap)
+                    if url is not None and is_index:
+                        sitemaps.append(url)
+                    elif url is not None and self.in_scope(url):
+                        urls.append(url)
+        return urls
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.state_path, "r") as file:
+                data = json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        return data.get("pages", {}) if data.get("version") == self.VERSION else {}
@@ -0,0 +1,63 @@
+import threading
+from typing import Any, Dict, Optional
+
+
+class SharedIndex:
+    """
+    One resident vector store shared by the RAG tools of an agent or a crew.
+
+    Tools created with the same index embed their sources into its single embedchain app
+    instead of a store of their own, and every chunk is tagged with its `source`,
+    `data_type` and `path`. Each tool keeps searching its own source, while `search`, or
+    the tool returned by `as_tool`, answers a question from all of them with one query,
+    optionally filtered on that metadata.
+
+    Attributes:
+        name (str): Names the index's collection and the directory of its indexing state.
+    """
+
+    def __init__(self, app: Optional[Any] = None, name: str = "default"):
+        self.name = name
+        self._app = app
+        self._lock = threading.Lock()
+
+    @property
+    def app(self) -> Any:
+        """The embedchain app of the index, created on first use with a collection of its own."""
+        with self._lock:
+            if self._app is None:
+                from embedchain import App
+
+                config = {"vectordb": {"provider": "chromadb", "config": {"collection_name": f"crewai-tools-{self.name}"}}}
+                self._app = App.from_config(config=config)
+            return self._app
+
+    @property
+    def scope(self) -> str:
+        """The semantic cache scope of index-wide searches, invalidated whenever a source of the index changes."""
+        return f"{self.__class__.__name__}:{self.name}"
+
+    def search(
+        self,
+        query: str,
+        where: Optional[Dict[str, str]] = None,
+        summarize: bool = False,
+        max_context_tokens: Optional[int] = None,
+    ) -> str:
+        """Searches every source of the index at once, or the chunks whose metadata matches `where`."""
+        from crewai_tools.adapters.embedchain_adapter import EmbedchainAdapter
+
+        adapter = EmbedchainAdapter(
+            embedchain_app=self.app,
+            summarize=summarize,
+            where=where,
+            citation_keys=["path", "page"],
+            max_context_tokens=max_context_tokens,
+        )
+        return adapter.query(query)
+
+    def as_tool(self, **kwargs: Any) -> Any:
+        """Returns a tool searching every source of the index, see `IndexSearchTool`."""
+        from crewai_tools.tools.rag.index_search_tool import IndexSearchTool
+
+        return IndexSearchTool(index=self, **kwargs)
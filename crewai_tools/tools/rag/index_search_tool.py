@@ -0,0 +1,30 @@
+from typing import Any, Optional, Type
+
+from pydantic.v1 import BaseModel, Field
+
+from crewai_tools.tools.rag.rag_tool import RagTool
+
+
+class IndexSearchToolSchema(BaseModel):
+    """Input for IndexSearchTool."""
+    search_query: str = Field(..., description="Mandatory search query you want to use to search the indexed documents")
+    data_type: Optional[str] = Field(None, description="Optional type of the documents to search, e.g. pdf_file, text_file, docx, mdx")
+    path: Optional[str] = Field(None, description="Optional path of the only document to search")
+
+
+class IndexSearchTool(RagTool):
+    name: str = "Search all indexed documents"
+    description: str = "A tool that can be used to semantic search a query across every document indexed by the other search tools."
+    summarize: bool = False
+    args_schema: Type[BaseModel] = IndexSearchToolSchema
+
+    def _run(
+        self,
+        search_query: str,
+        **kwargs: Any,
+    ) -> Any:
+        where = {key: kwargs[key] for key in ("data_type", "path") if kwargs.get(key)}
+        self._where = where or None
+        self._scope = "#".join([self.index.scope, *(f"{key}={value}" for key, value in sorted(where.items()))])
+        self._citation_keys = ["path", "page"]
+        return super()._run(query=search_query)
@@ -0,0 +1,247 @@
+import hashlib
+import multiprocessing
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from crewai_tools.tools.rag.chunker import TextChunker
+
+
+class Chunk(NamedTuple):
+    id: str
+    text: str
+    metadata: Dict[str, Any]
+
+
+def source_hash(source: Any) -> str:
+    """Returns the hash embedchain stores a source's chunks under, as used by `App.delete`."""
+    return hashlib.md5(str(source).encode("utf-8")).hexdigest()
+
+
+def parse_file(path: str, app_id: Optional[str] = None, data_type: Optional[str] = None) -> List[Chunk]:
+    """Loads and chunks a local file with the embedchain loader and chunker of its data type, detected by default."""
+    from embedchain.config import AddConfig
+    from embedchain.data_formatter.data_formatter import DataFormatter
+    from embedchain.models.data_type import DataType
+    from embedchain.utils.misc import detect_datatype
+
+    config = AddConfig()
+    formatter = DataFormatter(DataType(data_type) if data_type else detect_datatype(path), config)
+    result = formatter.chunker.create_chunks(formatter.loader, path, app_id=app_id, config=config.chunker)
+    return [
+        Chunk(id=chunk_id, text=text, metadata=dict(metadata))
+        for chunk_id, text, metadata in zip(result["ids"], result["documents"], result["metadatas"])
+    ]
+
+
+def split_text(text: str, chunk_size: int = 500, chunk_overlap: int = 50, markdown: bool = False) -> List[str]:
+    """Splits text into chunks of at most `chunk_size` tokens with `TextChunker`, dropping repeated chunks."""
+    chunker = TextChunker(chunk_size=chunk_size, chunk_overlap=chunk_overlap, markdown=markdown)
+    return list(dict.fromkeys(chunk.text for chunk in chunker.split(text)))
+
+
+def text_chunks(
+    text: str,
+    url: str,
+    metadata: Optional[Dict[str, Any]] = None,
+    app_id: Optional[str] = None,
+    chunk_size: int = 500,
+    chunk_overlap: int = 50,
+    source: Optional[Any] = None,
+) -> List[Chunk]:
+    """
+    Splits text into chunks of at most `chunk_size` tokens and ids each chunk the way `App.add` would.
+
+    Passing the `source` the chunks are stored under adds it to their ids, so a url indexed
+    under several sources is stored once for each of them.
+    """
+    chunks = []
+    for text_chunk in split_text(text, chunk_size, chunk_overlap):
+        salt = f"{url}{source}" if source is not None else url
+        chunk_id = hashlib.sha256((text_chunk + salt).encode()).hexdigest()
+        chunk_id = f"{app_id}--{chunk_id}" if app_id is not None else chunk_id
+        chunks.append(Chunk(id=chunk_id, text=text_chunk, metadata={"url": url, **(metadata or {})}))
+    return chunks
+
+
+def file_chunks(
+    path: str,
+    data_type: str,
+    app_id: Optional[str] = None,
+    chunk_size: int = 500,
+    chunk_overlap: int = 50,
+    markdown: bool = False,
+    source: Optional[Any] = None,
+) -> Iterator[Chunk]:
+    """
+    Streams a text file through `TextChunker`, so memory is bounded by one chunk however large the file is.
+
+    In markdown, chunks are tagged with the `heading` of their section, e.g. "Install > Linux".
+    Passing the `source` the chunks are stored under adds it to their ids, as in `text_chunks`.
+    """
+    chunker = TextChunker(chunk_size=chunk_size, chunk_overlap=chunk_overlap, markdown=markdown)
+    seen = set()
+    salt = f"{path}{source}" if source is not None else path
+    with open(path, "r", encoding="utf-8", errors="replace") as file:
+        for text_chunk in chunker.chunks(file):
+            chunk_id = hashlib.sha256((text_chunk.text + salt).encode()).hexdigest()
+            if chunk_id in seen:
+                continue
+            seen.add(chunk_id)
+            metadata = {"url": path, "data_type": data_type}
+            if text_chunk.heading:
+                metadata["heading"] = text_chunk.heading
+            yield Chunk(id=f"{app_id}--{chunk_id}" if app_id is not None else chunk_id, text=text_chunk.text, metadata=metadata)
+
+
+def structured_chunks(
+    entries: Iterable[Tuple[str, str]],
+    url: str,
+    pattern: Callable[[str], str],
+    metadata: Optional[Dict[str, Any]] = None,
+    app_id: Optional[str] = None,
+    chunk_size: int = 2000,
+    source: Optional[Any] = None,
+) -> Iterator[Chunk]:
+    """
+    Groups the `(record_path, line)` entries streamed from a structured document into chunks.
+
+    Consecutive lines of a record are joined under a first line naming the record's path, and
+    a record longer than `chunk_size` is split across several chunks, so memory is bounded by
+    one chunk. Chunks are tagged with the record's path as `record` and with its `record_pattern`,
+    the path with positions generalized by `pattern`, so searches can be filtered on either.
+    Passing the `source` the chunks are stored under adds it to their ids, as in `text_chunks`.
+    """
+    record, lines, size, part = None, [], 0, 0
+
+    def make_chunk() -> Chunk:
+        text = "\n".join([record, *lines])
+        salt = f"{url}{source}" if source is not None else url
+        chunk_id = hashlib.sha256(f"{salt}:{record}:{part}:{text}".encode("utf-8")).hexdigest()
+        chunk_id = f"{app_id}--{chunk_id}" if app_id is not None else chunk_id
+        chunk_metadata = {"url": url, "record": record, "record_pattern": pattern(record), **(metadata or {})}
+        return Chunk(id=chunk_id, text=text, metadata=chunk_metadata)
+
+    for record_path, line in entries:
+        if lines and (record_path != record or size + len(line) + 1 > chunk_size):
+            yield make_chunk()
+            part = part + 1 if record_path == record else 0
+            lines = []
+        if not lines:
+            record, size = record_path, len(record_path)
+        lines.append(line)
+        size += len(line) + 1
+    if lines:
+        yield make_chunk()
+
+
+def parse_files(
+    paths: Iterable[str],
+    app_id: Optional[str] = None,
+    max_workers: Optional[int] = None,
+    max_in_flight: Optional[int] = None,
+    parser: Callable[[str, Optional[str]], List[Chunk]] = parse_file,
+) -> Iterator[Tuple[str, Optional[List[Chunk]], Optional[Exception]]]:
+    """
+    Parses files in worker processes and yields `(path, chunks, error)` as each one completes.
+
+    At most `max_in_flight` files are submitted at once, so memory stays bounded however
+    many paths are given and the caller can embed the chunks of finished files while the
+    workers keep parsing.
+
+    Parameters:
+        paths (Iterable[str]): Files to parse.
+        app_id (Optional[str]): Embedchain app id used to prefix chunk ids.
+        max_workers (Optional[int]): Worker processes, defaults to the CPU count.
+        max_in_flight (Optional[int]): Files submitted but not yet consumed, defaults to twice the workers.
+        parser (Callable): Parses a file given its path and app id, `parse_file` by default. It must be
+            picklable, a module-level function, to run in the worker processes.
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    max_in_flight = max(max_in_flight or max_workers * 2, 1)
+    if max_workers == 1:
+        for path in paths:
+            try:
+                yield path, parser(path, app_id), None
+            except Exception as e:
+                yield path, None, e
+        return
+
+    paths = iter(paths)
+    # Parsers are not fork-safe once vector store clients hold threads and sockets.
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=context) as executor:
+        pending: Dict[Future, str] = {}
+
+        def submit_next() -> None:
+            path = next(paths, None)
+            if path is not None:
+                pending[executor.submit(parser, path, app_id)] = path
+
+        for _ in range(max_in_flight):
+            submit_next()
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                path = pending.pop(future)
+                submit_next()
+                try:
+                    yield path, future.result(), None
+                except Exception as e:
+                    yield path, None, e
+
+
+def write_chunks(
+    app: Any,
+    chunks: Iterable[Chunk],
+    source: Any,
+    metadata: Optional[Dict[str, Any]] = None,
+    batch_size: int = 256,
+) -> str:
+    """
+    Embeds and stores chunks in an embedchain app's vector store, in batches as they are produced.
+
+    Chunks are tagged the way `App.add` tags them, so they can be queried, cited and
+    deleted with `App.delete` like any other embedchain source. They are also tagged with
+    their `source` and with the `path` of the document they come from, which defaults to
+    their url, so searches can be filtered on them along with their `data_type`.
+
+    Returns:
+        str: The source hash the chunks were stored under.
+    """
+    hashed = source_hash(source)
+    app_id = app.config.id if app.config is not None else None
+    ids, documents, metadatas = [], [], []
+    for chunk in chunks:
+        if not chunk.text:
+            continue
+        chunk_metadata = dict(chunk.metadata)
+        chunk_metadata.setdefault("url", str(source))
+        chunk_metadata.setdefault("path", chunk_metadata["url"])
+        chunk_metadata["source"] = str(source)
+        chunk_metadata["hash"] = hashed
+        if app_id:
+            chunk_metadata["app_id"] = app_id
+        if metadata:
+            chunk_metadata.update(metadata)
+        ids.append(chunk.id)
+        documents.append(chunk.text)
+        metadatas.append(chunk_metadata)
+        if len(ids) >= batch_size:
+            app.db.add(documents=documents, metadatas=metadatas, ids=ids)
+            ids, documents, metadatas = [], [], []
+    if ids:
+        app.db.add(documents=documents, metadatas=metadatas, ids=ids)
+    return hashed
+
+
+def delete_record(app: Any, source: Any, record_id: str) -> None:
+    """Deletes the chunks of one record (a file, row, thread, ...) stored under `source`."""
+    app.db.delete(where={"hash": source_hash(source), "record_id": record_id})
+
+
+def delete_records(app: Any, source: Any, record_ids: Iterable[str]) -> None:
+    """Deletes the chunks of several records stored under `source` in a single vector store round trip."""
+    record_ids = list(dict.fromkeys(record_ids))
+    if record_ids:
+        app.db.delete(where={"hash": source_hash(source), "record_id": {"$in": record_ids}})
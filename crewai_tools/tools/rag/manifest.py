@@ -0,0 +1,123 @@
+import hashlib
+import json
+import os
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+
+def iter_files(directory: str, recursive: bool = True) -> Iterator[str]:
+    """Yields the files of a directory, skipping dotfiles and dot directories."""
+    stack = [directory]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.name.startswith("."):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    if recursive:
+                        stack.append(entry.path)
+                elif entry.is_file():
+                    yield entry.path
+
+
+def file_digest(path: str, block_size: int = 1 << 20) -> str:
+    """Returns the sha256 of a file's content."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ManifestDiff(NamedTuple):
+    added: List[str]
+    changed: List[str]
+    removed: List[str]
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.changed or self.removed)
+
+
+class FileManifest:
+    """
+    Persisted record of the files indexed into a knowledge base.
+
+    Maps each file path to its size, mtime and content hash at indexing time, along with
+    the embedchain source hash its chunks were stored under. Diffing the manifest against
+    the filesystem only hashes files whose size or mtime moved, so an unchanged tree costs
+    a single stat pass.
+
+    Attributes:
+        path (str): Where the manifest is stored as JSON.
+        files (Dict[str, Dict[str, Any]]): Manifest entries keyed by file path.
+    """
+
+    VERSION = 1
+
+    def __init__(self, path: str):
+        self.path = path
+        self.files: Dict[str, Dict[str, Any]] = self._load()
+        self._dirty = False
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.path, "r") as file:
+                data = json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        if data.get("version") != self.VERSION:
+            return {}
+        return data.get("files", {})
+
+    def diff(self, paths: Iterable[str]) -> ManifestDiff:
+        """Compares the given files with the manifest, files deleted since they were listed counting as removed."""
+        added, changed, seen = [], [], set()
+        for path in paths:
+            entry = self.files.get(path)
+            if entry is None:
+                seen.add(path)
+                added.append(path)
+                continue
+            try:
+                stat = os.stat(path)
+                identical = entry["size"] == stat.st_size and (
+                    entry["mtime_ns"] == stat.st_mtime_ns or file_digest(path) == entry["sha256"]
+                )
+            except FileNotFoundError:
+                continue
+            seen.add(path)
+            if identical and entry["mtime_ns"] == stat.st_mtime_ns:
+                continue
+            if identical:
+                # Touched but identical, remember the new mtime to skip hashing next time.
+                entry["mtime_ns"] = stat.st_mtime_ns
+                self._dirty = True
+                continue
+            changed.append(path)
+        removed = [path for path in self.files if path not in seen]
+        return ManifestDiff(added=added, changed=changed, removed=removed)
+
+    def get(self, path: str) -> Optional[Dict[str, Any]]:
+        return self.files.get(path)
+
+    def record(self, path: str, stat: os.stat_result, sha256: str, source_hash: str) -> None:
+        """Records a file as indexed with the stat and digest taken before it was read."""
+        self.files[path] = {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": sha256,
+            "source_hash": source_hash,
+        }
+        self._dirty = True
+
+    def forget(self, path: str) -> Optional[Dict[str, Any]]:
+        self._dirty = True
+        return self.files.pop(path, None)
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as file:
+            json.dump({"version": self.VERSION, "files": self.files}, file)
+        os.replace(tmp_path, self.path)
+        self._dirty = False
@@ -0,0 +1,95 @@
+import hashlib
+import re
+from typing import List, NamedTuple, Optional, Set
+
+from crewai_tools.tools.rag.chunker import TokenCounter
+
+_WORD = re.compile(r"\w+")
+
+
+class PackedContext(NamedTuple):
+    """The results kept for a query, along with what was dropped to keep them small."""
+
+    texts: List[str]
+    tokens: int
+    duplicates: int
+    over_budget: int
+    dropped_tokens: int
+
+    def summary(self) -> str:
+        return (
+            f"{len(self.texts)} results ({self.tokens} tokens) kept, {self.duplicates} near-duplicates "
+            f"and {self.over_budget} over budget dropped ({self.dropped_tokens} tokens)"
+        )
+
+
+def shingles(text: str, size: int = 5) -> Set[int]:
+    """Returns the hashes of the overlapping `size` word sequences of a text, ignoring case and punctuation."""
+    words = _WORD.findall(text.lower())
+    if len(words) < size:
+        words = words + [""] * (size - len(words))
+    return {
+        int.from_bytes(hashlib.blake2b(" ".join(words[start : start + size]).encode("utf-8"), digest_size=8).digest(), "little")
+        for start in range(len(words) - size + 1)
+    }
+
+
+def containment(a: Set[int], b: Set[int]) -> float:
+    """The share of the smaller set's shingles found in the other, 1 when a text repeats a passage of the other."""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / min(len(a), len(b))
+
+
+def near_duplicates(texts: List[str], threshold: float = 0.9) -> List[int]:
+    """Returns the positions of texts mostly repeating an earlier text, so the best ranked copy is the one kept."""
+    kept: List[Set[int]] = []
+    duplicates = []
+    for position, text in enumerate(texts):
+        hashed = shingles(text)
+        if any(containment(hashed, other) >= threshold for other in kept):
+            duplicates.append(position)
+        else:
+            kept.append(hashed)
+    return duplicates
+
+
+def pack_context(
+    texts: List[str],
+    max_tokens: Optional[int] = None,
+    dedup_threshold: Optional[float] = 0.9,
+    counter: Optional[TokenCounter] = None,
+) -> PackedContext:
+    """
+    Drops the near-duplicates among ranked results, then keeps the best ones fitting in `max_tokens`.
+
+    Results are taken in rank order, skipping those that would overflow the budget so smaller
+    ones ranked lower can still fit. A first result larger than the whole budget is cut to it
+    rather than leaving the context empty.
+
+    Parameters:
+        texts (List[str]): Results, best first.
+        max_tokens (Optional[int]): Token budget of the kept results, None for no limit.
+        dedup_threshold (Optional[float]): Share of a result's word shingles found in a better
+            result above which it is dropped, None to keep near-duplicates.
+    """
+    duplicates = set(near_duplicates(texts, dedup_threshold) if dedup_threshold is not None else [])
+    counter = counter or TokenCounter()
+    counts = counter.counts(texts) if texts else []
+    kept, tokens, over_budget, dropped_tokens = [], 0, 0, 0
+    for position, (text, count) in enumerate(zip(texts, counts)):
+        if position in duplicates:
+            dropped_tokens += count
+        elif max_tokens is None or tokens + count <= max_tokens:
+            kept.append(text)
+            tokens += count
+        elif not kept and max_tokens > 0:
+            kept.append(counter.split(text, max_tokens)[0])
+            tokens += max_tokens
+            dropped_tokens += count - max_tokens
+        else:
+            over_budget += 1
+            dropped_tokens += count
+    return PackedContext(
+        texts=kept, tokens=tokens, duplicates=len(duplicates), over_budget=over_budget, dropped_tokens=dropped_tokens
+    )
@@ -1,18 +1,47 @@
+import hashlib
+import json
+import os
+import threading
 from abc import ABC, abstractmethod
-from typing import Any, List, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional
 
+from pydantic import PrivateAttr
 from pydantic.v1 import BaseModel, ConfigDict
 
 from crewai_tools.tools.base_tool import BaseTool
+from crewai_tools.tools.rag.cache import SemanticCache
+from crewai_tools.tools.rag.crawler import SiteCrawler
+from crewai_tools.tools.rag.index import SharedIndex
+from crewai_tools.tools.rag.ingestion import Chunk, delete_record, parse_files, source_hash, text_chunks, write_chunks
+from crewai_tools.tools.rag.manifest import FileManifest, file_digest
+from crewai_tools.tools.rag.packing import PackedContext, pack_context
+from crewai_tools.tools.storage import storage_path
 
 
 class Adapter(BaseModel, ABC):
     model_config = ConfigDict(arbitrary_types_allowed=True)
+    max_context_tokens: Optional[int] = None
+    dedup_threshold: Optional[float] = 0.9
+    last_context: Optional[PackedContext] = None
 
     @abstractmethod
     def query(self, question: str) -> str:
         """Query the knowledge base with a question and return the answer."""
 
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts with the model the knowledge base was indexed with."""
+        raise NotImplementedError(f"{self.__class__.__name__} does not support embeddings")
+
+    @property
+    def can_embed(self) -> bool:
+        """Whether the adapter implements `embed`, which the semantic cache needs to key its results."""
+        return type(self).embed is not Adapter.embed
+
+    def _pack(self, texts: List[str]) -> List[str]:
+        """Drops near-duplicate results and keeps the best ones within `max_context_tokens`, recording what was dropped in `last_context`."""
+        self.last_context = pack_context(texts, self.max_context_tokens, self.dedup_threshold)
+        return self.last_context.texts
+
 class RagTool(BaseTool):
     model_config = ConfigDict(arbitrary_types_allowed=True)
     name: str = "Knowledge base"
@@ -20,14 +49,202 @@ class RagTool(BaseTool):
     summarize: bool = False
     adapter: Optional[Adapter] = None
     app: Optional[Any] = None
+    cache: Optional[SemanticCache] = None
+    index: Optional[SharedIndex] = None
+    ingestion_workers: Optional[int] = None
+    chunk_size: int = 500
+    chunk_overlap: int = 50
+    max_context_tokens: Optional[int] = None
+    dedup_threshold: Optional[float] = 0.9
+
+    _citation_keys: List[str] = PrivateAttr(default_factory=list)
+    # The source a call searches is kept per thread, so a tool shared by agents, e.g. a pooled
+    # one, serves their concurrent calls each with its own filters.
+    _call: threading.local = PrivateAttr(default_factory=threading.local)
+
+    @property
+    def _scope(self) -> Optional[str]:
+        """The semantic cache scope of the source searched by the current call."""
+        return getattr(self._call, "scope", None)
+
+    @_scope.setter
+    def _scope(self, scope: Optional[str]) -> None:
+        self._call.scope = scope
+
+    @property
+    def _where(self) -> Optional[Dict[str, Any]]:
+        """The vector store filter of the source searched by the current call."""
+        return getattr(self._call, "where", None)
+
+    @_where.setter
+    def _where(self, where: Optional[Dict[str, Any]]) -> None:
+        self._call.where = where
+
+    def _ensure_app(self) -> Any:
+        """
+        Returns the embedchain app of the tool, creating it on first use.
+
+        Tools of a shared index use its app, others get one of their own. Neither is created
+        with the tool, so building tools, e.g. for every agent of a crew, stays cheap.
+        """
+        if self.app is None:
+            if self.index is not None:
+                self.app = self.index.app
+            else:
+                from embedchain import App
+
+                self.app = App()
+        return self.app
 
     def _run(
         self,
         query: str,
     ) -> Any:
         from crewai_tools.adapters.embedchain_adapter import EmbedchainAdapter
-        self.adapter = EmbedchainAdapter(embedchain_app=self.app, summarize=self.summarize)
-        return f"Relevant Content:\n{self.adapter.query(query)}"
+        if self.index is not None:
+            self._ensure_app()
+        adapter = self.adapter
+        if self.app is not None:
+            # Built for this call's filters, rather than stored on the tool where concurrent calls would swap it.
+            adapter = EmbedchainAdapter(
+                embedchain_app=self.app,
+                summarize=self.summarize,
+                where=self._where,
+                citation_keys=self._citation_keys,
+                max_context_tokens=self.max_context_tokens,
+                dedup_threshold=self.dedup_threshold,
+            )
+        return f"Relevant Content:\n{self._query(query, adapter)}"
+
+    def _query(self, query: str, adapter: Optional[Adapter] = None) -> str:
+        adapter = adapter or self.adapter
+        # A query that packs nothing, e.g. when summarizing, must not report the context of the previous one.
+        adapter.last_context = None
+        # Adapters that can't embed queries are queried directly, the cache being keyed by embeddings.
+        if self.cache is None or not adapter.can_embed:
+            return adapter.query(query)
+
+        scope = self._scope or self.name
+        embedding = adapter.embed([query])[0]
+        cached = self.cache.get(scope, embedding)
+        if cached is None:
+            result = adapter.query(query)
+            self.cache.set(scope, embedding, (result, adapter.last_context))
+            return result
+        # Hits report the context the result was packed from.
+        result, adapter.last_context = cached
+        return result
+
+    def _add_files(self, paths: List[str], metadata: Optional[Dict[str, Any]] = None) -> Dict[str, str]:
+        """
+        Parses files in worker processes and embeds their chunks as each file completes.
+
+        Returns the source hash of every file that was indexed, files that fail to parse are skipped.
+        """
+        app_id = self.app.config.id if self.app.config is not None else None
+        indexed = {}
+        for path, chunks, error in parse_files(paths, app_id=app_id, max_workers=self.ingestion_workers):
+            if error is not None:
+                print(f"Failed to index {path}: {error}")
+                continue
+            indexed[path] = write_chunks(self.app, chunks, path, metadata)
+        return indexed
+
+    def _index_file(
+        self,
+        path: str,
+        manifest_path: str,
+        chunks: Callable[[str, str], Iterable[Chunk]],
+        source: Optional[str] = None,
+    ) -> None:
+        """
+        Embeds a file unless its current version is already embedded, replacing any previous version.
+
+        `chunks` is called with the path and content digest of the file and may be a generator,
+        its chunks are embedded in batches as they are produced. They are stored, replaced and
+        searched under `source`, the path by default.
+        """
+        source = source or path
+        self._scope = f"{self.__class__.__name__}:{source}"
+        self._where = {"hash": source_hash(source)}
+        manifest = FileManifest(manifest_path)
+        try:
+            diff = manifest.diff([path])
+            if not (diff.added or diff.changed):
+                return
+            manifest.forget(path)
+            self.app.delete(source_hash(source))
+            stat, digest = os.stat(path), file_digest(path)
+            manifest.record(path, stat, digest, write_chunks(self.app, chunks(path, digest), source))
+        finally:
+            manifest.save()
+
+        self._invalidate()
+
+    @staticmethod
+    def _options_source(path: str, options: Any) -> str:
+        """
+        Returns the source of a file chunked with tool options, e.g. the columns a CSV is embedded with.
+
+        Tools with other options chunk the same file differently, so each option set is stored
+        under a source of its own rather than replacing the chunks of the others.
+        """
+        return f"{path}#{hashlib.sha256(json.dumps(options).encode('utf-8')).hexdigest()[:16]}"
+
+    def _index_site(self, url: str, state_dir: str, session: Optional[Any] = None, **crawler_options: Any) -> None:
+        """
+        Crawls a site and embeds the pages that changed since the last crawl, dropping the pages that are gone.
+
+        The crawl state is kept in `state_dir` of the tools' storage, one file per URL, crawler and chunking options.
+        The pages are stored under a source hashed from the same options, so crawls with other options, or by
+        other tools, never replace or return each other's pages.
+        """
+        options = json.dumps([url, state_dir, sorted(crawler_options.items()), self.chunk_size, self.chunk_overlap])
+        key = hashlib.sha256(options.encode("utf-8")).hexdigest()
+        crawler = SiteCrawler(url, self._state_path(state_dir, f"{key}.json"), session=session, **crawler_options)
+        source = f"{crawler.start_url}#{key[:16]}"
+        self._scope = f"{self.__class__.__name__}:{source}"
+        self._where = {"hash": source_hash(source)}
+        self._citation_keys = ["url"]
+
+        delta = crawler.crawl()
+        app_id = self.app.config.id if self.app.config is not None else None
+        for removed in delta.removed:
+            delete_record(self.app, source, removed)
+        for page in delta.changed:
+            delete_record(self.app, source, page.url)
+            metadata = {"record_id": page.url, "title": page.title, "data_type": "web_page"}
+            chunks = text_chunks(page.text, page.url, metadata, app_id, self.chunk_size, self.chunk_overlap, source)
+            write_chunks(self.app, chunks, source)
+        crawler.save()
+
+        if delta:
+            self._invalidate()
+
+    def _filter_path(self, path: str, pattern: Callable[[str], str]) -> None:
+        """Restricts searches to the chunks of the record at `path`, or of the records matching a path pattern."""
+        key = "record_pattern" if pattern(path) == path else "record"
+        self._where = {**(self._where or {}), key: path}
+        self._scope = f"{self._scope}#{key}={path}"
+
+    def _state_path(self, *parts: str) -> str:
+        """
+        Returns where to persist indexing state, such as manifests and sync cursors.
+
+        The state describes what a vector store holds, so tools sharing an index keep theirs
+        apart from the state of tools using the default store.
+        """
+        if self.index is not None:
+            return storage_path("index", self.index.name, *parts)
+        return storage_path(*parts)
+
+    def _invalidate(self) -> None:
+        """Drops the cached results of the current source, and of the index-wide searches that include it."""
+        if self.cache is None:
+            return
+        self.cache.invalidate(self._scope)
+        if self.index is not None:
+            self.cache.invalidate(self.index.scope)
 
     def from_embedchain(self, config_path: str):
         from embedchain import App
@@ -35,4 +252,4 @@ class RagTool(BaseTool):
 
         app = App.from_config(config_path=config_path)
         adapter = EmbedchainAdapter(embedchain_app=app)
-        return RagTool(name=self.name, description=self.description, adapter=adapter)
\ No newline at end of file
+        return RagTool(name=self.name, description=self.description, adapter=adapter, cache=self.cache)
@@ -0,0 +1,17 @@
+import os
+
+STORAGE_DIR_ENV = "CREWAI_TOOLS_STORAGE_DIR"
+"""Environment variable overriding where tools persist their indexes and caches."""
+
+
+def storage_path(*parts: str) -> str:
+    """
+    Returns a path inside the tools' storage directory, creating its parent directories.
+
+    Tools persist state next to embedchain's default vector store (`./db`), so both are
+    kept or discarded together. Set `CREWAI_TOOLS_STORAGE_DIR` to use another location.
+    """
+    root = os.environ.get(STORAGE_DIR_ENV, os.path.join("db", "crewai_tools"))
+    path = os.path.join(root, *parts)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
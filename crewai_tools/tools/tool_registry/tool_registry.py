@@ -1,57 +1,127 @@
+import hashlib
 import json
 import importlib
-from typing import Type, Dict, List, Optional
+import os
+import sys
+import threading
+from importlib.metadata import entry_points
+from typing import Any, Dict, Hashable, List, NamedTuple, Optional, Tuple, Type
 # from crewai_tools import Tool
 from ..base_tool import BaseTool
+from ..storage import storage_path
+
+ENTRY_POINT_GROUP = "crewai_tools.tools"
+"""Entry point group under which installed packages declare their tools."""
+
+
+class ToolSpec(NamedTuple):
+    """Where a tool class is defined, imported the first time the tool is asked for."""
+
+    name: str
+    module: str
+    class_name: str
+
 
 class ToolRegistry:
     """
-    A registry for managing tool classes in the CrewAI framework. 
+    A registry for managing tool classes in the CrewAI framework.
     Allows for the dynamic registration and retrieval of tool classes by name.
 
+    Tools declared in a JSON file or through package entry points are only recorded as
+    (module, class) specs, and their module is imported the first time they are retrieved,
+    so only the tools actually used are paid for. Entry points are listed from the installed
+    packages' metadata, and that listing is cached on disk keyed by the import path and the
+    mtimes of its directories, which change whenever a package is installed or removed.
+
+    The registry also pools tool instances: `acquire` returns the instance already built for
+    the same tool and configuration, counting its references, and `release` drops it once no
+    one holds it, so agents configured alike share one warmed-up tool and its caches.
+
     Attributes:
         _registry (Dict[str, Type[Tool]]): A private dictionary that stores tool classes keyed by their names.
+        _specs (Dict[str, ToolSpec]): Tools declared but not imported yet, keyed by their names.
+        _pool (Dict[Tuple, PooledTool]): Shared tool instances keyed by tool name and canonical configuration.
 
     Methods:
         register(name, tool_class): Registers a tool class with a specific name.
+        register_spec(name, module, class_name): Registers a tool to import on first retrieval.
         get(name): Retrieves a tool class by its name, returning None if not found.
         list_tools(): Returns a list of all registered tool names.
+        acquire(name, config): Returns a shared instance of a tool for a configuration.
+        release(tool): Releases a shared instance returned by acquire.
     """
 
-    def __init__(self, json_file: Optional[str] = "./tools.json"):
+    def __init__(
+        self,
+        json_file: Optional[str] = "./tools.json",
+        entry_point_group: Optional[str] = ENTRY_POINT_GROUP,
+        cache_discovery: bool = True,
+    ):
         """
         Initializes the ToolRegistry. Optionally loads initial tool definitions from a JSON file.
 
         Parameters:
             json_file (Optional[str]): The path to a JSON file containing tool definitions.
-                The JSON file should be an array of objects, each with a "name" and "tool_class" field.
+                The JSON file should be an array of objects, each with a "name", "module" and "class" field.
+            entry_point_group (Optional[str]): The entry point group tools are discovered in, None to skip discovery.
+            cache_discovery (bool): Whether the discovered entry points are cached on disk.
         """
         self._registry: Dict[str, Type[BaseTool]] = {}
+        self._specs: Dict[str, ToolSpec] = {}
+        self._lock = threading.Lock()
+        self._pool: Dict[Tuple, PooledTool] = {}
+        self._pooled: Dict[int, Tuple] = {}
+        self._building: Dict[Tuple, threading.Lock] = {}
+        if entry_point_group:
+            self._discover_entry_points(entry_point_group, cache_discovery)
         if json_file:
             self._load_tools_from_json(json_file)
+        if json_file or entry_point_group:
             print(f'Registered {len(self.list_tools())} Tool(s)')
 
     def _load_tools_from_json(self, file_path: str) -> None:
         """
-        Loads tool definitions from a JSON file and registers them.
+        Loads tool definitions from a JSON file and registers them, without importing their modules.
 
         Parameters:
             file_path (str): The path to the JSON file containing tool definitions.
         """
-        
+
         try:
             with open(file_path, 'r') as file:
                 tools = json.load(file)
                 for tool in tools:
-                    module = importlib.import_module(tool['module'])
-                    tool_class = getattr(module, tool['class'])
-                    if issubclass(tool_class, BaseTool):
-                        self.register(tool['name'], tool_class)
-                    else:
-                        print(f'Tool Not Registered: {type(tool_class)}')
+                    self.register_spec(tool['name'], tool['module'], tool['class'])
         except Exception as e:
             print(f"Failed to load tool definitions from {file_path}: {e}")
 
+    def _discover_entry_points(self, group: str, cache: bool) -> None:
+        """Registers the tools declared by installed packages in an entry point group."""
+        index_path = None
+        if cache:
+            # The working directory is left out, files come and go in it without installing anything.
+            paths = [[path, _mtime(path)] for path in sys.path if path not in ("", ".")]
+            key = hashlib.sha256(json.dumps([group, paths]).encode("utf-8")).hexdigest()
+            try:
+                index_path = storage_path("tool_registry", f"entry_points-{key}.json")
+                with open(index_path, "r") as file:
+                    for name, module, class_name in json.load(file):
+                        self.register_spec(name, module, class_name)
+                return
+            except (OSError, ValueError):
+                pass
+        specs = [ToolSpec(point.name, point.module, point.attr) for point in entry_points(group=group)]
+        for spec in specs:
+            self.register_spec(*spec)
+        if index_path:
+            tmp_path = f"{index_path}.tmp"
+            try:
+                with open(tmp_path, "w") as file:
+                    json.dump(specs, file)
+                os.replace(tmp_path, index_path)
+            except OSError:
+                # A read-only storage directory only costs the cache, the tools are registered all the same.
+                pass
 
     def register(self, name: str, tool_class: Type[BaseTool]) -> None:
         """
@@ -61,11 +131,26 @@ class ToolRegistry:
             name (str): The name to register the tool class under.
             tool_class (Type[Tool]): The tool class to be registered.
         """
-        self._registry[name] = tool_class
+        with self._lock:
+            self._specs.pop(name, None)
+            self._registry[name] = tool_class
+
+    def register_spec(self, name: str, module: str, class_name: str) -> None:
+        """
+        Registers a tool whose module is imported the first time it is retrieved.
+
+        Parameters:
+            name (str): The name to register the tool class under.
+            module (str): The module defining the tool class.
+            class_name (str): The name of the tool class in its module.
+        """
+        with self._lock:
+            self._registry.pop(name, None)
+            self._specs[name] = ToolSpec(name, module, class_name)
 
     def get(self, name: str) -> Optional[Type[BaseTool]]:
         """
-        Retrieves a tool class by its name.
+        Retrieves a tool class by its name, importing its module the first time.
 
         Parameters:
             name (str): The name of the tool class to retrieve.
@@ -74,13 +159,131 @@ class ToolRegistry:
             Optional[Type[Tool]]: The tool class if found, otherwise None.
         """
         # print(f'retrieving tool by name: {name}')
-        return self._registry.get(name)
+        tool_class = self._registry.get(name)
+        if tool_class is not None:
+            return tool_class
+        spec = self._specs.get(name)
+        if spec is None:
+            return None
+        try:
+            tool_class = getattr(importlib.import_module(spec.module), spec.class_name)
+        except Exception as e:
+            print(f"Failed to import tool {name} from {spec.module}: {e}")
+            return None
+        if not (isinstance(tool_class, type) and issubclass(tool_class, BaseTool)):
+            print(f'Tool Not Registered: {type(tool_class)}')
+            return None
+        with self._lock:
+            if self._specs.get(name) == spec:
+                del self._specs[name]
+                self._registry[name] = tool_class
+        return tool_class
 
     def list_tools(self) -> List[str]:
         """
-        Lists all registered tool names.
+        Lists all registered tool names, whether their modules were imported or not.
 
         Returns:
             List[str]: A list of the names of all registered tools.
         """
-        return list(self._registry.keys())
+        return list(self._registry.keys()) + [name for name in self._specs if name not in self._registry]
+
+    def acquire(self, name: str, config: Optional[Dict[str, Any]] = None) -> Optional[BaseTool]:
+        """
+        Returns the shared instance of a tool for a configuration, building it the first time.
+
+        Configurations are compared by value, whatever the order of their keys, and each call
+        takes a reference on the instance, to give back with `release`.
+
+        Parameters:
+            name (str): The name of the tool class to instantiate.
+            config (Optional[Dict[str, Any]]): The keyword arguments the tool is built with.
+
+        Returns:
+            Optional[Tool]: The shared tool instance, or None if the tool is not registered.
+        """
+        config = config or {}
+        key = (name, canonical_config(config))
+        with self._lock:
+            if key in self._pool:
+                return self._pool[key].take()
+            building = self._building.setdefault(key, threading.Lock())
+        # Tools are built outside the registry lock, but only once per configuration.
+        with building:
+            with self._lock:
+                if key in self._pool:
+                    return self._pool[key].take()
+            try:
+                tool_class = self.get(name)
+                if tool_class is None:
+                    return None
+                tool = tool_class(**config)
+                with self._lock:
+                    self._pool[key] = PooledTool(tool)
+                    self._pooled[id(tool)] = key
+                    return self._pool[key].take()
+            finally:
+                with self._lock:
+                    self._building.pop(key, None)
+
+    def release(self, tool: BaseTool) -> bool:
+        """
+        Gives back a reference on a tool returned by `acquire`, dropping it from the pool once no one holds it.
+
+        Returns:
+            bool: Whether the tool was pooled.
+        """
+        with self._lock:
+            key = self._pooled.get(id(tool))
+            if key is None or self._pool[key].tool is not tool:
+                return False
+            pooled = self._pool[key]
+            pooled.references -= 1
+            if pooled.references == 0:
+                del self._pool[key]
+                del self._pooled[id(tool)]
+            return True
+
+    def pooled_tools(self) -> Dict[str, int]:
+        """Returns the number of shared instances of each tool currently pooled."""
+        counts: Dict[str, int] = {}
+        with self._lock:
+            for name, _ in self._pool:
+                counts[name] = counts.get(name, 0) + 1
+        return counts
+
+
+class PooledTool:
+    """A shared tool instance and the number of references held on it."""
+
+    def __init__(self, tool: BaseTool):
+        self.tool = tool
+        self.references = 0
+
+    def take(self) -> BaseTool:
+        self.references += 1
+        return self.tool
+
+
+def canonical_config(value: Any) -> Hashable:
+    """Turns a tool configuration into a hashable value equal for equal configurations, whatever the order of their keys."""
+    if isinstance(value, dict):
+        return ("dict", tuple(sorted((str(key), canonical_config(item)) for key, item in value.items())))
+    if isinstance(value, (list, tuple)):
+        return (type(value).__name__, tuple(canonical_config(item) for item in value))
+    if isinstance(value, (set, frozenset)):
+        return ("set", frozenset(canonical_config(item) for item in value))
+    try:
+        hash(value)
+    except TypeError:
+        # Unhashable objects are only the same configuration as themselves.
+        return ("object", id(value))
+    # 1, 1.0 and True are equal but don't build the same tool.
+    return (type(value).__name__, value)
+
+
+def _mtime(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
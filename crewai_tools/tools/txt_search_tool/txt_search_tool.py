@@ -1,9 +1,10 @@
-from typing import Optional, Type, Any
+import os
+from typing import Iterator, Optional, Type, Any
 from pydantic.v1 import BaseModel, Field
 
-from embedchain import App
 from embedchain.models.data_type import DataType
 
+from ..rag.ingestion import Chunk, file_chunks
 from ..rag.rag_tool import RagTool
 
 class FixedTXTSearchToolSchema(BaseModel):
@@ -34,7 +35,14 @@ class TXTSearchTool(RagTool):
 		search_query: str,
 		**kwargs: Any,
 	) -> Any:
-		txt = kwargs.get('txt', self.txt)
-		self.app = App()
-		self.app.add(txt, data_type=DataType.TEXT_FILE)
-		return super()._run(query=search_query)
\ No newline at end of file
+		txt = os.path.abspath(kwargs.get('txt', self.txt))
+		self._ensure_app()
+		self._index_file(txt, self._state_path("txt_search", f"manifest-{self.chunk_size}-{self.chunk_overlap}.json"), self._txt_chunks, self._source(txt))
+		return super()._run(query=search_query)
+
+	def _txt_chunks(self, path: str, digest: str) -> Iterator[Chunk]:
+		app_id = self.app.config.id if self.app.config is not None else None
+		return file_chunks(path, DataType.TEXT_FILE.value, app_id, self.chunk_size, self.chunk_overlap, source=self._source(path))
+
+	def _source(self, path: str) -> str:
+		return self._options_source(path, [self.chunk_size, self.chunk_overlap])
\ No newline at end of file
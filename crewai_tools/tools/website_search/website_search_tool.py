@@ -1,9 +1,6 @@
 from typing import Optional, Type, Any
 from pydantic.v1 import BaseModel, Field
 
-from embedchain import App
-from embedchain.models.data_type import DataType
-
 from ..rag.rag_tool import RagTool
 
 
@@ -21,6 +18,9 @@ class WebsiteSearchTool(RagTool):
 	summarize: bool = False
 	args_schema: Type[BaseModel] = WebsiteSearchToolSchema
 	website: Optional[str] = None
+	crawl_depth: int = 0
+	max_pages: int = 100
+	session: Optional[Any] = None
 
 	def __init__(self, website: Optional[str] = None, **kwargs):
 		super().__init__(**kwargs)
@@ -36,6 +36,6 @@ class WebsiteSearchTool(RagTool):
 		**kwargs: Any,
 	) -> Any:
 		website = kwargs.get('website', self.website)
-		self.app = App()
-		self.app.add(website, data_type=DataType.WEB_PAGE)
+		self._ensure_app()
+		self._index_site(website, "website_search", session=self.session, max_depth=self.crawl_depth, max_pages=self.max_pages)
 		return super()._run(query=search_query)
\ No newline at end of file
@@ -0,0 +1,81 @@
+import re
+from typing import Dict, Iterator, List, Optional, Tuple
+from xml.etree.ElementTree import iterparse
+
+from ..rag.ingestion import Chunk, structured_chunks
+
+_INDEX = re.compile(r"\[\d+\]")
+
+
+def local_name(tag: str) -> str:
+	"""Drops the namespace of a tag, `{http://www.w3.org/2005/Atom}entry` becomes `entry`."""
+	return tag.rsplit("}", 1)[-1]
+
+
+def path_pattern(path: str) -> str:
+	"""Generalizes the positions of an XPath, `/feed/entry[3]/title` becomes `/feed/entry/title`."""
+	return _INDEX.sub("", path)
+
+
+def xml_entries(path: str, record_depth: int = 2) -> Iterator[Tuple[str, str]]:
+	"""
+	Streams the text and attributes of an XML file as `(record_path, line)` entries.
+
+	Elements are cleared and detached from their parent as soon as they end, so memory is
+	bounded by the depth of the document rather than its size. A record is the element at
+	`record_depth` on the way to each value, e.g. `/feed/entry[3]` with the default of 2,
+	and lines are the XPath of a value relative to it, e.g. `author[1]/name[1]: Ada`.
+	"""
+	elements = []
+	steps: List[str] = []
+	# Children seen so far of every open element, by tag, to number siblings as XPath does.
+	counts: List[Dict[str, int]] = [{}]
+	tails: List[List[str]] = []
+
+	for event, element in iterparse(path, events=("start", "end")):
+		if event == "start":
+			name = local_name(element.tag)
+			counts[-1][name] = counts[-1].get(name, 0) + 1
+			steps.append(name if not elements else f"{name}[{counts[-1][name]}]")
+			elements.append(element)
+			counts.append({})
+			tails.append([])
+			record, relative = "/" + "/".join(steps[:record_depth]), "/".join(steps[record_depth:])
+			for attribute, value in element.attrib.items():
+				yield record, f"{relative}/@{local_name(attribute)}: {value}".lstrip("/")
+			continue
+
+		record, relative = "/" + "/".join(steps[:record_depth]), "/".join(steps[record_depth:])
+		text = " ".join(part.strip() for part in [element.text or "", *tails.pop()] if part.strip())
+		if text:
+			yield record, f"{relative}: {text}" if relative else text
+
+		elements.pop()
+		steps.pop()
+		counts.pop()
+		if elements:
+			if element.tail and element.tail.strip():
+				tails[-1].append(element.tail)
+			elements[-1].remove(element)
+		element.clear()
+
+
+def xml_chunks(
+	path: str,
+	record_depth: int = 2,
+	chunk_size: int = 2000,
+	app_id: Optional[str] = None,
+	source: Optional[str] = None,
+) -> Iterator[Chunk]:
+	"""
+	Streams an XML file as chunks of records annotated with their XPath.
+
+	Parameters:
+		path (str): The XML file.
+		record_depth (int): Depth of the elements chunked as records, 2 for the children of the root element.
+		chunk_size (int): Maximum number of characters in a chunk.
+		app_id (Optional[str]): Embedchain app id used to prefix chunk ids.
+		source (Optional[str]): The source the chunks are stored under, added to their ids when given.
+	"""
+	entries = xml_entries(path, record_depth=record_depth)
+	yield from structured_chunks(entries, path, path_pattern, {"data_type": "xml"}, app_id, chunk_size, source)
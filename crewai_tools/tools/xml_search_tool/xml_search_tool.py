@@ -1,15 +1,18 @@
-from typing import Optional, Type, Any
+import hashlib
+import json
+import os
+from typing import Iterator, List, Optional, Type, Any
 from pydantic.v1 import BaseModel, Field
 
-from embedchain import App
-from embedchain.models.data_type import DataType
-
+from ..rag.ingestion import Chunk
 from ..rag.rag_tool import RagTool
+from .xml_chunks import xml_chunks, path_pattern
 
 
 class FixedXMLSearchToolSchema(BaseModel):
 	"""Input for XMLSearchTool."""
 	search_query: str = Field(..., description="Mandatory search query you want to use to search the XML's content")
+	path_filter: Optional[str] = Field(None, description="Optional XPath, e.g. `/feed/entry` or `/feed/entry[3]`, to only search the matching records")
 
 class XMLSearchToolSchema(FixedXMLSearchToolSchema):
 	"""Input for XMLSearchTool."""
@@ -21,6 +24,8 @@ class XMLSearchTool(RagTool):
 	summarize: bool = False
 	args_schema: Type[BaseModel] = XMLSearchToolSchema
 	xml: Optional[str] = None
+	record_depth: int = 2
+	path_filter: Optional[str] = None
 
 	def __init__(self, xml: Optional[str] = None, **kwargs):
 		super().__init__(**kwargs)
@@ -35,7 +40,22 @@ class XMLSearchTool(RagTool):
 		search_query: str,
 		**kwargs: Any,
 	) -> Any:
-		xml = kwargs.get('xml', self.xml)
-		self.app = App()
-		self.app.add(xml, data_type=DataType.XML)
-		return super()._run(query=search_query)
\ No newline at end of file
+		xml = os.path.abspath(kwargs.get('xml', self.xml))
+		path_filter = kwargs.get('path_filter') or self.path_filter
+		self._ensure_app()
+		self._index_file(xml, self._manifest_path(), self._xml_chunks, self._options_source(xml, self._options()))
+		if path_filter:
+			self._filter_path(path_filter, path_pattern)
+		return super()._run(query=search_query)
+
+	def _xml_chunks(self, path: str, digest: str) -> Iterator[Chunk]:
+		app_id = self.app.config.id if self.app.config is not None else None
+		return xml_chunks(path, record_depth=self.record_depth, app_id=app_id, source=self._options_source(path, self._options()))
+
+	def _options(self) -> List[Any]:
+		return [self.record_depth]
+
+	def _manifest_path(self) -> str:
+		# Files are chunked differently for each record depth, so each one gets its own manifest.
+		options = json.dumps(self._options())
+		return self._state_path("xml_search", f"{hashlib.sha256(options.encode('utf-8')).hexdigest()}.json")
@@ -1,10 +1,12 @@
+import hashlib
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Type, Any
 from pydantic.v1 import BaseModel, Field
 
-from embedchain import App
-from embedchain.models.data_type import DataType
-
+from ..rag.ingestion import source_hash, write_chunks
 from ..rag.rag_tool import RagTool
+from ..youtube_video_search_tool.youtube_transcripts import IndexedVideos, TranscriptSource, TranscriptStore, transcript_chunks
 
 
 class FixedYoutubeChannelSearchToolSchema(BaseModel):
@@ -21,6 +23,9 @@ class YoutubeChannelSearchTool(RagTool):
 	summarize: bool = False
 	args_schema: Type[BaseModel] = YoutubeChannelSearchToolSchema
 	youtube_channel_handle: Optional[str] = None
+	max_videos: Optional[int] = None
+	refresh_interval: float = 3600
+	transcript_source: Optional[TranscriptSource] = None
 
 	def __init__(self, youtube_channel_handle: Optional[str] = None, **kwargs):
 		super().__init__(**kwargs)
@@ -38,6 +43,52 @@ class YoutubeChannelSearchTool(RagTool):
 		youtube_channel_handle = kwargs.get('youtube_channel_handle', self.youtube_channel_handle)
 		if not youtube_channel_handle.startswith("@"):
 			youtube_channel_handle = f"@{youtube_channel_handle}"
-		self.app = App()
-		self.app.add(youtube_channel_handle, data_type=DataType.YOUTUBE_CHANNEL)
-		return super()._run(query=search_query)
\ No newline at end of file
+		self._ensure_app()
+		self._sync_channel(youtube_channel_handle)
+		return super()._run(query=search_query)
+
+	def _sync_channel(self, handle: str) -> None:
+		"""
+		Embeds the channel's videos that are not indexed yet, limited to the newest `max_videos`.
+
+		The channel listing itself is only refreshed every `refresh_interval` seconds, so repeated
+		questions about an already indexed channel do not touch YouTube at all. Tools with other
+		chunk settings index the channel under a source and state of their own.
+		"""
+		source = self._options_source(f"youtube-channel:{handle}", [self.chunk_size, self.chunk_overlap])
+		self._scope = f"{self.__class__.__name__}:{source}"
+		self._where = {"hash": source_hash(source)}
+		key = hashlib.sha256(source.encode("utf-8")).hexdigest()
+		indexed = IndexedVideos(self._state_path("youtube_channel", f"{key}.json"))
+		if indexed.listed_at is not None and time.time() - indexed.listed_at < self.refresh_interval:
+			return
+
+		transcript_source = self.transcript_source or TranscriptSource()
+		videos = transcript_source.channel_videos(handle, limit=self.max_videos)[:self.max_videos]
+		new_videos = [video for video in videos if video["id"] not in indexed]
+		store = TranscriptStore(transcript_source)
+		app_id = self.app.config.id if self.app.config is not None else None
+
+		# Transcripts are fetched concurrently, embedding stays on this thread.
+		with ThreadPoolExecutor(max_workers=8) as executor:
+			transcripts = executor.map(lambda video: self._fetch(store, video["id"]), new_videos)
+			for video, transcript in zip(new_videos, transcripts):
+				if transcript is None:
+					continue
+				transcript = {**transcript, "title": transcript["title"] or video["title"]}
+				write_chunks(self.app, transcript_chunks(transcript, video["id"], source, app_id, self.chunk_size, self.chunk_overlap), source)
+				indexed.add(video["id"])
+				indexed.save()
+
+		indexed.listed_at = time.time()
+		indexed.save()
+		if new_videos:
+			self._invalidate()
+
+	@staticmethod
+	def _fetch(store: TranscriptStore, video_id: str) -> Optional[dict]:
+		try:
+			return store.get(video_id)
+		except Exception as e:
+			print(f"Failed to fetch the transcript of {video_id}: {e}")
+			return None
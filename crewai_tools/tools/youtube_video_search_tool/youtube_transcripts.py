@@ -0,0 +1,125 @@
+import hashlib
+import json
+import os
+import re
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+from ..rag.ingestion import Chunk, text_chunks
+from ..storage import storage_path
+
+
+def youtube_video_id(url: str) -> str:
+	"""Extracts the video id from the usual YouTube URL shapes, or returns a bare id as is."""
+	parsed = urlparse(url)
+	if parsed.hostname in ("youtu.be", "www.youtu.be"):
+		return parsed.path.lstrip("/")
+	if parsed.hostname and "youtube" in parsed.hostname:
+		if "v" in parse_qs(parsed.query):
+			return parse_qs(parsed.query)["v"][0]
+		match = re.match(r"^/(?:shorts|embed|live)/([^/?]+)", parsed.path)
+		if match:
+			return match.group(1)
+	return url
+
+
+def transcript_chunks(
+	transcript: Dict[str, Any],
+	video_id: str,
+	source: str,
+	app_id: Optional[str] = None,
+	chunk_size: int = 500,
+	chunk_overlap: int = 50,
+) -> List[Chunk]:
+	"""
+	Chunks a transcript for `source`, tagging each chunk with its video.
+
+	Chunk ids include the source, as the same video can be embedded both on its own
+	and as part of a channel without one overwriting the other.
+	"""
+	url = f"https://www.youtube.com/watch?v={video_id}"
+	metadata = {"record_id": video_id, "video_id": video_id, "title": transcript["title"], "data_type": "youtube_video"}
+	chunks = []
+	for chunk in text_chunks(transcript["text"], url, metadata, chunk_size=chunk_size, chunk_overlap=chunk_overlap):
+		chunk_id = hashlib.sha256(f"{source}:{chunk.id}".encode("utf-8")).hexdigest()
+		chunk_id = f"{app_id}--{chunk_id}" if app_id is not None else chunk_id
+		chunks.append(chunk._replace(id=chunk_id))
+	return chunks
+
+
+class TranscriptSource:
+	"""Lists channel videos and fetches transcripts from YouTube."""
+
+	def channel_videos(self, handle: str, limit: Optional[int] = None) -> List[Dict[str, str]]:
+		"""Returns the `id` and `title` of a channel's videos, newest first."""
+		try:
+			import yt_dlp
+		except ImportError as e:
+			raise ImportError("Listing channel videos requires yt-dlp, run `pip install 'embedchain[youtube]'`") from e
+
+		options = {"quiet": True, "extract_flat": True}
+		if limit:
+			options["playlistend"] = limit
+		with yt_dlp.YoutubeDL(options) as ydl:
+			info = ydl.extract_info(f"https://www.youtube.com/{handle}/videos", download=False)
+		return [{"id": entry["id"], "title": entry.get("title") or ""} for entry in info.get("entries") or []]
+
+	def transcript(self, video_id: str) -> Dict[str, Any]:
+		"""Returns the transcript `text` of a video along with its `title`."""
+		from embedchain.loaders.youtube_video import YoutubeVideoLoader
+
+		record = YoutubeVideoLoader().load_data(f"https://www.youtube.com/watch?v={video_id}")["data"][0]
+		return {"text": record["content"], "title": record["meta_data"].get("title") or ""}
+
+
+class TranscriptStore:
+	"""
+	Transcripts persisted on disk by video id, so each video is only ever fetched once.
+
+	Attributes:
+		source (TranscriptSource): Where missing transcripts are fetched from.
+		directory (str): Where transcripts are stored, one JSON file per video.
+	"""
+
+	def __init__(self, source: Optional[TranscriptSource] = None, directory: Optional[str] = None):
+		self.source = source or TranscriptSource()
+		self.directory = directory or storage_path("youtube", "transcripts", "")
+		os.makedirs(self.directory, exist_ok=True)
+
+	def get(self, video_id: str) -> Dict[str, Any]:
+		path = os.path.join(self.directory, f"{video_id}.json")
+		try:
+			with open(path, "r") as file:
+				return json.load(file)
+		except (FileNotFoundError, json.JSONDecodeError):
+			pass
+		transcript = self.source.transcript(video_id)
+		tmp_path = f"{path}.tmp"
+		with open(tmp_path, "w") as file:
+			json.dump(transcript, file)
+		os.replace(tmp_path, path)
+		return transcript
+
+
+class IndexedVideos:
+	"""The set of videos already embedded for one source, persisted as JSON."""
+
+	def __init__(self, path: str):
+		self.path = path
+		try:
+			with open(path, "r") as file:
+				data = json.load(file)
+		except (FileNotFoundError, json.JSONDecodeError):
+			data = {}
+		self.videos = set(data.get("videos", []))
+		self.listed_at: Optional[float] = data.get("listed_at")
+
+	def __contains__(self, video_id: str) -> bool:
+		return video_id in self.videos
+
+	def add(self, video_id: str) -> None:
+		self.videos.add(video_id)
+
+	def save(self) -> None:
+		with open(self.path, "w") as file:
+			json.dump({"videos": sorted(self.videos), "listed_at": self.listed_at}, file)
@@ -1,10 +1,10 @@
+import hashlib
 from typing import Optional, Type, Any
 from pydantic.v1 import BaseModel, Field
 
-from embedchain import App
-from embedchain.models.data_type import DataType
-
+from ..rag.ingestion import source_hash, write_chunks
 from ..rag.rag_tool import RagTool
+from .youtube_transcripts import IndexedVideos, TranscriptSource, TranscriptStore, transcript_chunks, youtube_video_id
 
 
 class FixedYoutubeVideoSearchToolSchema(BaseModel):
@@ -21,6 +21,7 @@ class YoutubeVideoSearchTool(RagTool):
 	summarize: bool = False
 	args_schema: Type[BaseModel] = YoutubeVideoSearchToolSchema
 	youtube_video_url: Optional[str] = None
+	transcript_source: Optional[TranscriptSource] = None
 
 	def __init__(self, youtube_video_url: Optional[str] = None, **kwargs):
 		super().__init__(**kwargs)
@@ -36,6 +37,23 @@ class YoutubeVideoSearchTool(RagTool):
 		**kwargs: Any,
 	) -> Any:
 		youtube_video_url = kwargs.get('youtube_video_url', self.youtube_video_url)
-		self.app = App()
-		self.app.add(youtube_video_url, data_type=DataType.YOUTUBE_VIDEO)
-		return super()._run(query=search_query)
\ No newline at end of file
+		self._ensure_app()
+		self._sync_video(youtube_video_id(youtube_video_url))
+		return super()._run(query=search_query)
+
+	def _sync_video(self, video_id: str) -> None:
+		"""Embeds the video's transcript unless it was already embedded with the tool's chunk settings."""
+		source = self._options_source(f"youtube:{video_id}", [self.chunk_size, self.chunk_overlap])
+		self._scope = f"{self.__class__.__name__}:{source}"
+		self._where = {"hash": source_hash(source)}
+		key = hashlib.sha256(source.encode("utf-8")).hexdigest()
+		indexed = IndexedVideos(self._state_path("youtube_video", f"{key}.json"))
+		if video_id in indexed:
+			return
+
+		transcript = TranscriptStore(self.transcript_source).get(video_id)
+		app_id = self.app.config.id if self.app.config is not None else None
+		write_chunks(self.app, transcript_chunks(transcript, video_id, source, app_id, self.chunk_size, self.chunk_overlap), source)
+		indexed.add(video_id)
+		indexed.save()
+		self._invalidate()
\ No newline at end of file
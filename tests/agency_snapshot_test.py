@@ -0,0 +1,132 @@
+import json
+import os
+from typing import Any, List
+
+import pytest
+from pydantic import BaseModel, ConfigDict
+
+from crewai_tools.tools.agent_factory import agency_snapshot, agent_factory
+from crewai_tools.tools.agent_factory.agency_snapshot import AgencyConfigError, load_agency
+from crewai_tools.tools.agent_factory.agent_factory import AgentFactory
+from crewai_tools.tools.crew_factory import crew_factory
+from crewai_tools.tools.crew_factory.crew_factory import CrewFactory
+
+
+class FakeOllama:
+	def __init__(self, model):
+		self.model = model
+
+
+class FakeTask:
+	def __init__(self, description, agent, **kwargs):
+		self.description = description
+		self.agent = agent
+
+
+class FakeCrew(BaseModel):
+	model_config = ConfigDict(arbitrary_types_allowed=True, extra="allow")
+
+	agents: List[Any]
+	tasks: List[Any]
+
+
+def agency(writer_goal="Write"):
+	return {
+		"agents": [
+			{"role": "Writer", "goal": writer_goal, "backstory": "A writer", "model_name": "mistral"},
+			{"role": "Editor", "goal": "Edit", "backstory": "An editor", "model_name": "mistral"},
+		],
+		"crews": [
+			{"name": "Writing", "agents": ["Writer"], "tasks": [{"description": "Write", "agent": "Writer"}]},
+			{"name": "Editing", "agents": ["Editor"], "tasks": [{"description": "Edit", "agent": "Editor"}]},
+		],
+	}
+
+
+def write_json(path, data):
+	previous = os.stat(path).st_mtime_ns if path.exists() else 0
+	path.write_text(json.dumps(data))
+	# Some filesystems keep mtimes too coarse to tell two quick writes apart.
+	os.utime(path, ns=(previous + 10**9, previous + 10**9))
+
+
+@pytest.fixture
+def agency_json(tmp_path, monkeypatch, storage_dir):
+	monkeypatch.setenv("OPENAI_API_KEY", "fake-key")
+	monkeypatch.setattr(agent_factory, "Ollama", FakeOllama)
+	monkeypatch.setattr(crew_factory, "Task", FakeTask)
+	monkeypatch.setattr(crew_factory, "Crew", FakeCrew)
+	tools = tmp_path / "tools.json"
+	write_json(tools, [{"name": "Echo", "module": "echo_tool", "class": "EchoTool"}])
+	path = tmp_path / "agency.json"
+	write_json(path, agency())
+	return path, tools
+
+
+def test_snapshot_is_compiled_once_until_files_change(agency_json, monkeypatch):
+	path, tools = agency_json
+	compiled = []
+	compile_agency = agency_snapshot.compile_agency
+	monkeypatch.setattr(agency_snapshot, "compile_agency", lambda *args: compiled.append(args) or compile_agency(*args))
+
+	first = load_agency([str(path)], str(tools))
+	second = load_agency([str(path)], str(tools))
+	write_json(path, agency(writer_goal="Write more"))
+	third = load_agency([str(path)], str(tools))
+
+	assert len(compiled) == 2
+	assert list(second.agents) == ["Writer", "Editor"]
+	assert second.tools["Echo"].module == "echo_tool"
+	assert third.changed_agents(first) == {"Writer"}
+	assert third.changed_crews(first) == set()
+
+
+def test_snapshot_is_saved_as_json_and_recompiled_when_unreadable(agency_json, tmp_path):
+	path, tools = agency_json
+	snapshot_path = tmp_path / "snapshot.json"
+
+	first = load_agency([str(path)], str(tools), snapshot_path=str(snapshot_path))
+	saved = json.loads(snapshot_path.read_text())
+	assert list(saved["agents"]) == ["Writer", "Editor"]
+	assert saved["tools"] == [["Echo", "echo_tool", "EchoTool"]]
+	loaded = load_agency([str(path)], str(tools), snapshot_path=str(snapshot_path))
+	assert loaded.fingerprints == first.fingerprints
+	assert loaded.changed_agents(first) == set()
+
+	snapshot_path.write_bytes(b"\x80\x04not json")
+	assert load_agency([str(path)], str(tools), snapshot_path=str(snapshot_path)).fingerprints == first.fingerprints
+	assert json.loads(snapshot_path.read_text())["version"] == saved["version"]
+
+
+def test_invalid_agency_lists_every_problem(tmp_path, agency_json):
+	path, tools = agency_json
+	broken = agency()
+	broken["agents"].append({"role": "Writer", "goal": "Again", "backstory": "Twice"})
+	broken["agents"][1]["tools"] = [{"type": "Unknown"}]
+	broken["crews"][1]["tasks"].append({"description": "Write", "agent": "Writer"})
+	broken["crews"].append({"name": "Ghosts", "agents": ["Ghost"], "process": "parallel"})
+	write_json(path, broken)
+
+	with pytest.raises(AgencyConfigError) as error:
+		load_agency([str(path)], str(tools))
+
+	assert len(error.value.problems) == 5
+
+
+def test_factories_reload_only_what_changed(agency_json):
+	path, _ = agency_json
+	agents = AgentFactory(str(path), compiled=True)
+	crews = CrewFactory(str(path), agents, compiled=True)
+	writer, editor = agents.get_agent_by_role("Writer"), agents.get_agent_by_role("Editor")
+
+	assert crews.reload() == set()
+
+	updated = agency(writer_goal="Write more")
+	updated["crews"].append({"name": "Review", "agents": ["Editor"], "tasks": []})
+	write_json(path, updated)
+
+	assert crews.reload() == {"Writing", "Review"}
+	assert agents.get_agent_by_role("Editor") is editor
+	assert agents.get_agent_by_role("Writer") is not writer
+	assert agents.get_agent_by_role("Writer").goal == "Write more"
+	assert crews.get_crew_by_name("Review") is not None
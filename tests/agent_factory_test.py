@@ -0,0 +1,57 @@
+import json
+
+import pytest
+
+from crewai_tools.tools.agent_factory import agent_factory
+from crewai_tools.tools.agent_factory.agent_factory import AgentFactory
+from crewai_tools.tools.tool_registry.tool_registry import ToolRegistry
+
+
+class FakeOllama:
+	built = []
+
+	def __init__(self, model):
+		self.model = model
+		FakeOllama.built.append(model)
+
+
+@pytest.fixture
+def agents_json(tmp_path, monkeypatch):
+	monkeypatch.setenv("OPENAI_API_KEY", "fake-key")
+	monkeypatch.setattr(agent_factory, "Ollama", FakeOllama)
+	FakeOllama.built = []
+	path = tmp_path / "agency.json"
+	path.write_text(json.dumps({"agents": [
+		{"role": "Writer", "goal": "Write", "backstory": "A writer", "model_name": "mistral"},
+		{"role": "Editor", "goal": "Edit", "backstory": "An editor", "model_name": "mistral"},
+		{"role": "Analyst", "goal": "Analyse", "backstory": "An analyst", "model_name": "mixtral"},
+	]}))
+	return str(path)
+
+
+def registry():
+	return ToolRegistry(json_file=None, entry_point_group=None)
+
+
+def test_shared_agents_and_llm_clients_are_built_once(agents_json):
+	factory = AgentFactory(agents_json, registry())
+
+	writer = factory.get_agent_by_role("Writer")
+
+	assert factory.get_agent_by_role("Writer") is writer
+	assert factory.get_all_agents()[0] is writer
+	assert factory.get_agent_by_role("Unknown") is None
+	assert FakeOllama.built == ["mistral", "mixtral"]
+	assert factory.get_agent_by_role("Editor").llm is writer.llm
+
+
+def test_fresh_agents_are_built_per_call(agents_json):
+	factory = AgentFactory(agents_json, registry(), agent_policy="fresh")
+
+	writer = factory.get_agent_by_role("Writer")
+
+	assert factory.get_agent_by_role("Writer") is not writer
+	assert factory.get_agent_by_role("Writer").llm is writer.llm
+	assert AgentFactory(agents_json, registry()).get_agent_by_role("Writer", fresh=True) is not writer
+	with pytest.raises(ValueError):
+		AgentFactory(agents_json, registry(), agent_policy="pooled")
@@ -16,6 +16,55 @@ class Helpers:
         return _func
 
 
+class FakeVectorStore:
+    """In-memory stand-in for an embedchain app's vector store."""
+
+    def __init__(self):
+        self.documents = {}
+        self.deleted = []
+
+    def add(self, documents, metadatas, ids):
+        for chunk_id, document, metadata in zip(ids, documents, metadatas):
+            self.documents[chunk_id] = (document, metadata)
+
+    def delete(self, where):
+        self.deleted.append(where)
+        self.documents = {
+            chunk_id: (document, metadata)
+            for chunk_id, (document, metadata) in self.documents.items()
+            if not all(self._matches(metadata.get(key), value) for key, value in where.items())
+        }
+
+    @staticmethod
+    def _matches(actual, expected):
+        if isinstance(expected, dict) and "$in" in expected:
+            return actual in expected["$in"]
+        return actual == expected
+
+    def texts(self):
+        return sorted(document for document, _ in self.documents.values())
+
+
+class FakeApp:
+    def __init__(self):
+        self.config = None
+        self.db = FakeVectorStore()
+
+    def delete(self, source_id):
+        self.db.delete(where={"hash": source_id})
+
+
 @pytest.fixture
 def helpers():
     return Helpers
+
+
+@pytest.fixture
+def fake_app():
+    return FakeApp()
+
+
+@pytest.fixture
+def storage_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("CREWAI_TOOLS_STORAGE_DIR", str(tmp_path / "storage"))
+    return tmp_path / "storage"
@@ -0,0 +1,31 @@
+from crewai_tools.tools.rag.chunker import TokenCounter
+from crewai_tools.tools.rag.packing import near_duplicates, pack_context
+
+
+def words():
+	counter = TokenCounter()
+	counter.encoding = None
+	return counter
+
+
+PASSAGE = "The crew finished the quarterly report and shared the revenue figures with every agent on the team"
+
+
+def test_near_duplicates_keep_the_best_ranked_copy():
+	texts = [PASSAGE, "Unrelated notes about the onboarding process for new agents joining next month", f"[page: 2] {PASSAGE}."]
+	assert near_duplicates(texts) == [2]
+	assert near_duplicates(texts, threshold=1.01) == []
+
+
+def test_pack_context_fits_the_budget_and_reports_drops():
+	texts = [PASSAGE, PASSAGE.upper(), " ".join(["long"] * 40), "short answer"]
+	packed = pack_context(texts, max_tokens=25, counter=words())
+
+	assert packed.texts == [PASSAGE, "short answer"]
+	assert (packed.tokens, packed.duplicates, packed.over_budget, packed.dropped_tokens) == (19, 1, 1, 57)
+
+
+def test_pack_context_cuts_an_oversized_first_result():
+	packed = pack_context([" ".join(["long"] * 40)], max_tokens=10, counter=words())
+	assert packed.texts[0].split() == ["long"] * 10
+	assert packed.dropped_tokens == 30
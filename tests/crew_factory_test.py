@@ -0,0 +1,122 @@
+import copy
+import json
+from typing import Any, List, Optional
+
+import pytest
+from pydantic import BaseModel, ConfigDict
+
+from crewai_tools.tools.agent_factory import agent_factory
+from crewai_tools.tools.agent_factory.agent_factory import AgentFactory
+from crewai_tools.tools.crew_factory import crew_factory
+from crewai_tools.tools.crew_factory.crew_factory import CrewFactory
+from crewai_tools.tools.tool_registry.tool_registry import ToolRegistry
+
+
+class FakeOllama:
+	def __init__(self, model):
+		self.model = model
+
+
+class FakeTask:
+	def __init__(self, description, agent, **kwargs):
+		self.description = description
+		self.agent = agent
+
+
+class FakeCrew(BaseModel):
+	model_config = ConfigDict(arbitrary_types_allowed=True, extra="allow")
+
+	agents: List[Any]
+	tasks: List[Any]
+	process: str = "sequential"
+	manager_llm: Optional[Any] = None
+
+
+AGENCY = {
+	"agents": [
+		{"role": "Writer", "goal": "Write", "backstory": "A writer", "model_name": "mistral"},
+		{"role": "Editor", "goal": "Edit", "backstory": "An editor", "model_name": "mistral"},
+	],
+	"crews": [
+		{
+			"name": "Content",
+			"agents": ["Writer", "Editor"],
+			"tasks": [
+				{"description": "Write a post", "agent": "Writer"},
+				{"description": "Edit the post", "agent": "Editor"},
+				{"description": "Review the post", "agent": "Reviewer"},
+			],
+			"process": "sequential",
+		},
+		{
+			"name": "Managed",
+			"agents": ["Editor"],
+			"tasks": [{"description": "Edit everything", "agent": "Editor"}],
+			"process": "hierarchical",
+		},
+		{"name": "Empty", "agents": ["Nobody"], "tasks": [], "process": "sequential"},
+	],
+}
+
+
+@pytest.fixture
+def factories(tmp_path, monkeypatch):
+	monkeypatch.setenv("OPENAI_API_KEY", "fake-key")
+	monkeypatch.setattr(agent_factory, "Ollama", FakeOllama)
+	monkeypatch.setattr(crew_factory, "Task", FakeTask)
+	monkeypatch.setattr(crew_factory, "Crew", FakeCrew)
+	path = tmp_path / "agency.json"
+	path.write_text(json.dumps(AGENCY))
+	agents = AgentFactory(str(path), ToolRegistry(json_file=None, entry_point_group=None))
+	return agents, CrewFactory(str(path), agents, max_workers=4)
+
+
+def test_crews_are_built_without_touching_their_config(factories):
+	agents, crews = factories
+	loaded = copy.deepcopy(crews.crews_data)
+
+	content = crews.get_crew_by_name("Content")
+
+	assert crews.crews_data == loaded
+	assert [task.agent.role for task in content.tasks] == ["Writer", "Editor"]
+	assert crews.get_crew_by_name("Content").agents[0] is content.agents[0]
+	fresh = crews.create_crews([crews.get_crew_config("Content")] * 2, fresh=True)
+	assert {id(agent) for crew in fresh for agent in crew.agents}.isdisjoint(id(agent) for agent in content.agents)
+	assert fresh[0].agents[0] is not fresh[1].agents[0]
+	assert [task.agent for task in fresh[0].tasks] == fresh[0].agents
+	assert crews.get_crew_by_name("Managed").manager_llm.model == "research-coordinator"
+	assert crews.get_crew_by_name("Empty") is None
+	assert crews.get_crew_by_name("Unknown") is None
+
+
+def test_all_crews_are_built_once_each(factories, monkeypatch):
+	_, crews = factories
+	built = []
+	create_crew = crews.create_crew
+
+	def counting_create_crew(crew_info, fresh=None):
+		built.append(crew_info["name"])
+		return create_crew(crew_info, fresh=fresh)
+
+	monkeypatch.setattr(crews, "create_crew", counting_create_crew)
+
+	assert len(crews.get_all_crews()) == 2
+	assert sorted(built) == ["Content", "Empty", "Managed"]
+	assert list(crews.get_crews_by_name(["Managed", "Unknown"])) == ["Managed", "Unknown"]
+	assert crews.get_crews_by_name(["Unknown"]) == {"Unknown": None}
+
+
+def test_fresh_agents_of_crews_that_fail_to_build_are_released(factories, monkeypatch):
+	agents, crews = factories
+	released = []
+	monkeypatch.setattr(agents, "release_agent", released.append)
+
+	def invalid(config):
+		raise ValueError("invalid crew")
+
+	monkeypatch.setattr(crews._crew_adapter, "validate_python", invalid)
+
+	assert crews.create_crew(crews.get_crew_config("Content")) is None
+	assert released == []
+	assert crews.create_crew(crews.get_crew_config("Content"), fresh=True) is None
+	assert [agent.role for agent in released] == ["Writer", "Editor"]
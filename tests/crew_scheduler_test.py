@@ -0,0 +1,158 @@
+import threading
+import time
+from collections import Counter
+from typing import Any
+
+import pytest
+
+from crewai_tools.tools.crew_factory.crew_scheduler import CrewJob, CrewScheduler
+from crewai_tools.tools.rag.rag_tool import RagTool
+from crewai_tools.tools.tool_registry.tool_registry import ToolRegistry
+
+
+class FakeLLM:
+	def __init__(self, model):
+		self.model = model
+
+
+class FakeAgent:
+	def __init__(self, model):
+		self.llm = FakeLLM(model)
+
+
+class FakeCrew:
+	running = Counter()
+	peaks = Counter()
+	lock = threading.Lock()
+
+	def __init__(self, name, model, seconds=0.02, fails=False):
+		self.name = name
+		self.agents = [FakeAgent(model)]
+		self.model = model
+		self.seconds = seconds
+		self.fails = fails
+
+	def kickoff(self, inputs=None):
+		with self.lock:
+			self.running[self.model] += 1
+			self.running["all"] += 1
+			for key in (self.model, "all"):
+				self.peaks[key] = max(self.peaks[key], self.running[key])
+		time.sleep(self.seconds)
+		with self.lock:
+			self.running[self.model] -= 1
+			self.running["all"] -= 1
+		if self.fails:
+			raise RuntimeError("kickoff failed")
+		return f"{self.name} done with {inputs}"
+
+
+class FakeAgentFactory:
+	def __init__(self):
+		self.released = []
+
+	def release_agent(self, agent):
+		self.released.append(agent)
+
+
+class FakeCrewFactory:
+	def __init__(self, crews):
+		self.crews = crews
+		self.agent_factory = FakeAgentFactory()
+
+	def get_crew_config(self, name):
+		return self.crews.get(name)
+
+	def create_crews(self, crews_info, fresh=None):
+		# Crews run concurrently must not share agents.
+		assert fresh is True
+		return [FakeCrew(**crew_info) for crew_info in crews_info]
+
+
+@pytest.fixture(autouse=True)
+def reset_counters():
+	FakeCrew.running, FakeCrew.peaks = Counter(), Counter()
+
+
+def test_scheduler_caps_workers_and_models():
+	crews = {f"crew {n}": {"name": f"crew {n}", "model": "mixtral" if n % 2 else "mistral"} for n in range(8)}
+	factory = FakeCrewFactory(crews)
+	scheduler = CrewScheduler(factory, max_workers=3, model_limits={"mixtral": 1})
+
+	runs = scheduler.run([*crews, CrewJob("crew 0", inputs={"topic": "AI"})])
+
+	assert [run.name for run in runs] == [*crews, "crew 0"]
+	assert all(run.ok for run in runs)
+	assert runs[-1].result == "crew 0 done with {'topic': 'AI'}"
+	assert FakeCrew.peaks["mixtral"] == 1
+	assert FakeCrew.peaks["all"] == 3
+	# Every crew gives back the pooled tools of its agents once it returned.
+	assert len(factory.agent_factory.released) == 9
+	scheduler.shutdown()
+
+
+def test_scheduler_reports_timeouts_and_failures():
+	crews = {
+		"slow": {"name": "slow", "model": "mistral", "seconds": 0.5},
+		"broken": {"name": "broken", "model": "mistral", "fails": True},
+		"quick": {"name": "quick", "model": "mistral"},
+	}
+	scheduler = CrewScheduler(FakeCrewFactory(crews), max_workers=2, timeout=0.1)
+
+	slow, broken, quick, missing = scheduler.run(["slow", "broken", "quick", "missing"])
+
+	assert slow.timed_out and 0.1 <= slow.elapsed < 0.5
+	assert isinstance(broken.error, RuntimeError)
+	assert quick.ok
+	assert isinstance(missing.error, LookupError)
+	with pytest.raises(ValueError):
+		CrewScheduler(FakeCrewFactory(crews), model_limits={"mistral": 0})
+	scheduler.shutdown()
+
+
+class FilteredSearchTool(RagTool):
+	barrier: Any = None
+
+	def _run(self, search_query, path):
+		self._where = {"path": path}
+		self._scope = f"{self.name}#path={path}"
+		# Both calls set their filters before either one searches.
+		self.barrier.wait()
+		return super()._run(query=search_query)
+
+
+class FilteringApp:
+	config = None
+
+	def query(self, question, citations=True, dry_run=True, where=None):
+		return "", [(f"{question} in {where['path']}", {})]
+
+
+class SearchingCrew(FakeCrew):
+	def __init__(self, name, tool):
+		super().__init__(name, "mistral")
+		self.tool = tool
+
+	def kickoff(self, inputs=None):
+		return self.tool._run(search_query="budget", path=self.name)
+
+
+def test_crews_searching_one_pooled_tool_keep_their_filters():
+	registry = ToolRegistry(json_file=None, entry_point_group=None)
+	registry.register("FilteredSearch", FilteredSearchTool)
+	tool = registry.acquire("FilteredSearch")
+	assert registry.acquire("FilteredSearch") is tool
+	tool.app, tool.barrier = FilteringApp(), threading.Barrier(2, timeout=5)
+
+	class SearchingCrewFactory(FakeCrewFactory):
+		def create_crews(self, crews_info, fresh=None):
+			return [SearchingCrew(crew_info["name"], tool) for crew_info in crews_info]
+
+	crews = {name: {"name": name} for name in ("notes.txt", "plan.txt")}
+	scheduler = CrewScheduler(SearchingCrewFactory(crews), max_workers=2)
+
+	notes, plan = scheduler.run(crews)
+
+	assert notes.result == "Relevant Content:\nbudget in notes.txt"
+	assert plan.result == "Relevant Content:\nbudget in plan.txt"
+	scheduler.shutdown()
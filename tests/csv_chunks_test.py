@@ -0,0 +1,75 @@
+import pytest
+
+from crewai_tools.tools.csv_search_tool.csv_chunks import csv_chunks
+from crewai_tools.tools.csv_search_tool.csv_search_tool import CSVSearchTool
+
+
+@pytest.fixture
+def employees(tmp_path):
+	path = tmp_path / "employees.csv"
+	path.write_text(
+		"name;team;city\n"
+		"Ada;core;London\n"
+		"Grace;core;Arlington\n"
+		"\n"
+		"Alan;research;Manchester\n"
+		"Edsger;research;Austin\n"
+		"Barbara;research;Boston\n"
+	)
+	return str(path)
+
+
+def test_rows_are_grouped_under_the_header(employees):
+	chunks = list(csv_chunks(employees, rows_per_chunk=2))
+
+	assert [chunk.text for chunk in chunks] == [
+		"name, team, city\nAda, core, London\nGrace, core, Arlington",
+		"name, team, city\nAlan, research, Manchester\nEdsger, research, Austin",
+		"name, team, city\nBarbara, research, Boston",
+	]
+	# Blank lines are not numbered.
+	assert [(chunk.metadata["first_row"], chunk.metadata["last_row"]) for chunk in chunks] == [(1, 2), (3, 4), (5, 5)]
+	assert len(list(csv_chunks(employees, rows_per_chunk=20, chunk_size=40))) == 5
+
+
+def test_columns_are_embedded_or_kept_as_metadata(employees):
+	chunks = list(csv_chunks(employees, embed_columns=["name"], metadata_columns=["team"], rows_per_chunk=20))
+
+	# A chunk only groups rows sharing their metadata values.
+	assert [chunk.text for chunk in chunks] == ["name\nAda\nGrace", "name\nAlan\nEdsger\nBarbara"]
+	assert [chunk.metadata["team"] for chunk in chunks] == ["core", "research"]
+	assert "city" not in chunks[0].metadata
+	assert next(csv_chunks(employees, metadata_columns=["team", "city"])).text == "name\nAda"
+	with pytest.raises(ValueError):
+		list(csv_chunks(employees, embed_columns=["salary"]))
+
+
+def test_empty_files_have_no_chunks(tmp_path):
+	path = tmp_path / "empty.csv"
+	path.write_text("")
+	header_only = tmp_path / "header.csv"
+	header_only.write_text("name,team\n")
+
+	assert list(csv_chunks(str(path))) == []
+	assert list(csv_chunks(str(header_only))) == []
+
+
+def test_tools_with_other_options_keep_their_own_chunks(employees, storage_dir, fake_app):
+	by_row = CSVSearchTool(rows_per_chunk=1)
+	by_team = CSVSearchTool(embed_columns=["name"], metadata_columns=["team"])
+
+	def index(tool):
+		tool.app = fake_app
+		tool._index_file(employees, tool._manifest_path(), tool._csv_chunks, tool._options_source(employees, tool._options()))
+
+	index(by_row)
+	index(by_team)
+	assert len(fake_app.db.texts()) == 7
+	assert by_row._where != by_team._where
+
+	with open(employees, "a") as file:
+		file.write("Frances;core;Boston\n")
+	index(by_team)
+	assert len(fake_app.db.texts()) == 8
+	assert "name\nFrances" in fake_app.db.texts()
+	assert "name, team, city\nAda, core, London" in fake_app.db.texts()
@@ -0,0 +1,59 @@
+import os
+
+from crewai_tools.tools.directory_read_tool.directory_read_tool import DirectoryReadTool
+from crewai_tools.tools.directory_read_tool.directory_walker import DirectoryWalker
+
+
+def make_tree(root, paths):
+	for path in paths:
+		os.makedirs(os.path.dirname(os.path.join(root, path)), exist_ok=True)
+		with open(os.path.join(root, path), "w") as file:
+			file.write(path)
+
+
+def test_walker_filters_and_honours_gitignore(tmp_path):
+	make_tree(tmp_path, [
+		".git/HEAD",
+		".gitignore",
+		"build/out.js",
+		"node_modules/pkg/index.js",
+		"src/app.py",
+		"src/app.pyc",
+		"src/deep/nested/util.py",
+		"src/keep.log",
+		"src/debug.log",
+		"README.md",
+	])
+	(tmp_path / ".gitignore").write_text("build/\n*.pyc\n*.log\n!keep.log\n")
+
+	assert DirectoryWalker(str(tmp_path), exclude=[".git", "node_modules"]).files() == [
+		".gitignore",
+		"README.md",
+		"src/app.py",
+		"src/deep/nested/util.py",
+		"src/keep.log",
+	]
+	assert DirectoryWalker(str(tmp_path), include=["*.py"], max_depth=1).files() == ["src/app.py"]
+	assert "build/out.js" in DirectoryWalker(str(tmp_path), gitignore=False).files()
+
+
+def test_walker_snapshots_follow_directory_changes(tmp_path):
+	make_tree(tmp_path, ["a/one.txt", "b/two.txt"])
+	walker = DirectoryWalker(str(tmp_path))
+	assert walker.files() == ["a/one.txt", "b/two.txt"]
+	assert DirectoryWalker(str(tmp_path)).files() is walker.files()
+
+	make_tree(tmp_path, ["b/three.txt"])
+	assert DirectoryWalker(str(tmp_path)).files() == ["a/one.txt", "b/three.txt", "b/two.txt"]
+
+
+def test_directory_read_tool_pages_with_a_cursor(tmp_path):
+	make_tree(tmp_path, [f"dir{n}/file{n}.txt" for n in range(5)])
+	tool = DirectoryReadTool(directory=str(tmp_path), page_size=2)
+
+	listing = tool._run()
+	assert listing.splitlines()[1:3] == [f"-{tmp_path}/dir0/file0.txt", f"- {tmp_path}/dir1/file1.txt"]
+	cursor = listing.rsplit("cursor: ", 1)[1]
+	assert cursor == "dir1/file1.txt"
+	assert f"{tmp_path}/dir2/file2.txt" in tool._run(cursor=cursor)
+	assert "cursor" not in tool._run(cursor="dir3/file3.txt")
@@ -0,0 +1,37 @@
+from crewai_tools.tools.file_content_search_tool.content_search import compile_query, search_file, search_files
+from crewai_tools.tools.file_content_search_tool.file_content_search_tool import FileContentSearchTool
+
+
+def test_search_file_reports_line_numbers(tmp_path):
+	path = tmp_path / "app.py"
+	path.write_text("import os\n\ndef main():\n    os.getenv('TOKEN')  # TOKEN\n\nTOKEN = 1\n")
+
+	matches = search_file(str(path), compile_query("TOKEN"))
+	assert [(match.line, match.text) for match in matches] == [(4, "os.getenv('TOKEN')  # TOKEN"), (6, "TOKEN = 1")]
+	assert [match.line for match in search_file(str(path), compile_query(r"^def \w+", regex=True))] == [3]
+	assert [match.line for match in search_file(str(path), compile_query("token", ignore_case=True), max_matches=1)] == [4]
+
+
+def test_search_skips_binary_files_and_stops_at_the_limit(tmp_path):
+	(tmp_path / "blob.bin").write_bytes(b"\0needle\n")
+	paths = []
+	for n in range(20):
+		path = tmp_path / f"file{n:02}.txt"
+		path.write_text("needle\nhay\nneedle\n")
+		paths.append(str(path))
+
+	assert search_file(str(tmp_path / "blob.bin"), compile_query("needle")) == []
+	matches, limited = search_files(paths, compile_query("needle"), max_matches=5, max_workers=4)
+	assert limited
+	assert [(match.path, match.line) for match in matches] == [(paths[0], 1), (paths[0], 3), (paths[1], 1), (paths[1], 3), (paths[2], 1)]
+
+
+def test_file_content_search_tool(tmp_path):
+	(tmp_path / "src").mkdir()
+	(tmp_path / "src" / "config.yaml").write_text("name: crew\nretries: 3\n")
+	(tmp_path / "src" / "notes.md").write_text("Set retries in the config.\n")
+	tool = FileContentSearchTool(directory=str(tmp_path), include=["*.yaml"])
+
+	assert tool._run(search_query="retries") == f"{tmp_path}/src/config.yaml:2: retries: 3"
+	assert tool._run(search_query="missing") == "No lines match missing"
+	assert tool._run(search_query="retries: [0-9]+", regex=True).endswith("config.yaml:2: retries: 3")
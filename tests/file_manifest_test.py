@@ -0,0 +1,69 @@
+import os
+
+from crewai_tools.tools.rag.manifest import FileManifest, file_digest, iter_files
+
+
+def write(path, content):
+	os.makedirs(os.path.dirname(path), exist_ok=True)
+	with open(path, "w") as file:
+		file.write(content)
+
+
+def record(manifest, path):
+	manifest.record(path, os.stat(path), file_digest(path), f"hash-{os.path.basename(path)}")
+
+
+def test_iter_files_skips_dotfiles(tmp_path):
+	for name in ("a.txt", ".hidden", ".git/config", "docs/b.md", "docs/deep/c.md"):
+		write(str(tmp_path / name), name)
+
+	assert sorted(os.path.relpath(path, tmp_path) for path in iter_files(str(tmp_path))) == [
+		"a.txt",
+		os.path.join("docs", "b.md"),
+		os.path.join("docs", "deep", "c.md"),
+	]
+	assert [os.path.basename(path) for path in iter_files(str(tmp_path), recursive=False)] == ["a.txt"]
+
+
+def test_diff_reports_added_changed_and_removed_files(tmp_path):
+	paths = {name: str(tmp_path / name) for name in ("same", "touched", "edited", "gone", "deleted", "new")}
+	for path in paths.values():
+		write(path, "content")
+	manifest = FileManifest(str(tmp_path / "manifest.json"))
+	for name in ("same", "touched", "edited", "gone", "deleted"):
+		record(manifest, paths[name])
+
+	stat = os.stat(paths["touched"])
+	os.utime(paths["touched"], ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+	write(paths["edited"], "other content")
+	os.remove(paths["deleted"])
+
+	# "deleted" is still listed, as when a file disappears between the listing and the diff.
+	diff = manifest.diff([paths[name] for name in ("same", "touched", "edited", "deleted", "new")])
+
+	assert diff.added == [paths["new"]]
+	assert diff.changed == [paths["edited"]]
+	assert sorted(diff.removed) == sorted([paths["gone"], paths["deleted"]])
+	assert manifest.get(paths["touched"])["mtime_ns"] == stat.st_mtime_ns + 10**9
+	assert not manifest.diff([paths["same"], paths["touched"], paths["gone"]]).changed
+
+
+def test_manifest_persists_across_instances(tmp_path):
+	path = str(tmp_path / "file.txt")
+	write(path, "content")
+	manifest_path = str(tmp_path / "manifest.json")
+	manifest = FileManifest(manifest_path)
+	record(manifest, path)
+	manifest.save()
+
+	loaded = FileManifest(manifest_path)
+	assert loaded.get(path)["source_hash"] == "hash-file.txt"
+	assert not loaded.diff([path])
+
+	loaded.forget(path)
+	loaded.save()
+	assert FileManifest(manifest_path).diff([path]).added == [path]
+
+	with open(manifest_path, "w") as file:
+		file.write('{"version": 0, "files": {"x": {}}}')
+	assert FileManifest(manifest_path).files == {}
@@ -0,0 +1,153 @@
+import bz2
+import gzip
+import lzma
+import os
+
+import pytest
+
+from crewai_tools.tools.file_read_tool.file_decoding import decode, detect_encoding
+from crewai_tools.tools.file_read_tool.file_ranges import LineIndex, read_lines, tail_lines
+from crewai_tools.tools.file_read_tool.file_read_tool import FileReadTool
+from crewai_tools.tools.file_read_tool.read_cache import ReadCache
+
+
+def line(n):
+	return f"line {n} {'x' * (n % 7)}"
+
+
+def write_log(tmp_path, lines=5000):
+	path = tmp_path / "server.log"
+	path.write_text("".join(f"{line(n)}\n" for n in range(lines)))
+	return str(path)
+
+
+def test_line_index_seeks_to_any_line(tmp_path):
+	path = write_log(tmp_path)
+	index = LineIndex.build(path, every=64)
+
+	assert index.lines == 5000
+	assert len(index.offsets) == 79
+	assert read_lines(path, 4095, 4098, index=index).data.decode().splitlines() == [line(4095), line(4096), line(4097)]
+	assert read_lines(path, 4998, 6000, index=index).data.decode().splitlines() == [line(4998), line(4999)]
+
+
+def test_line_index_is_persisted_per_file_version(tmp_path):
+	path = write_log(tmp_path)
+	directory = str(tmp_path / "index")
+	LineIndex.for_file(path, directory=directory)
+	assert len(os.listdir(directory)) == 1
+	assert LineIndex.for_file(path, directory=directory).lines == 5000
+
+	with open(path, "a") as file:
+		file.write("one more\n")
+	os.utime(path, ns=(0, 1))
+	assert LineIndex.for_file(path, directory=directory).lines == 5001
+	assert len(os.listdir(directory)) == 2
+
+
+def test_tail_lines(tmp_path):
+	path = write_log(tmp_path)
+	assert tail_lines(path, 2).data.decode() == f"{line(4998)}\n{line(4999)}\n"
+	assert tail_lines(path, 100, max_bytes=30).data.decode() == f"{line(4998)}\n{line(4999)}\n"
+
+
+def test_file_read_tool_reads_ranges_within_budget(tmp_path, storage_dir):
+	path = write_log(tmp_path)
+	tool = FileReadTool(file_path=path, max_bytes=1000)
+
+	assert tool._run(start_line=3, end_line=4) == f"{line(2)}\n{line(3)}\n"
+	assert tool._run(tail_lines=1) == f"{line(4999)}\n"
+	assert tool._run(start_byte=0, end_byte=6) == "line 0"
+	text = tool._run()
+	assert text.startswith(f"{line(0)}\n{line(1)}\n")
+	assert "[Truncated to" in text and text.split("\n[Truncated")[0].endswith("\n")
+	assert FileReadTool(file_path=path, max_bytes=None)._run() == open(path).read()
+
+
+def test_read_cache_serves_unchanged_files(tmp_path):
+	path = tmp_path / "config.yaml"
+	path.write_text("retries: 3\n")
+	cache = ReadCache(max_bytes=30, max_file_bytes=20)
+	tools = [FileReadTool(file_path=str(path), read_cache=cache) for _ in range(2)]
+
+	assert [tool._run() for tool in tools] == ["retries: 3\n", "retries: 3\n"]
+	assert (cache.hits, cache.misses, cache.size) == (1, 1, 11)
+
+	path.write_text("retries: 5\n")
+	os.utime(path, ns=(0, 1))
+	assert tools[0]._run() == "retries: 5\n"
+	assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_read_cache_hits_dont_open_the_file(tmp_path, monkeypatch):
+	path = tmp_path / "config.yaml"
+	path.write_text("retries: 3\n")
+	tool = FileReadTool(file_path=str(path), read_cache=ReadCache())
+	assert tool._run() == "retries: 3\n"
+
+	opened = []
+	real_open = open
+	monkeypatch.setattr("builtins.open", lambda file, *args, **kwargs: opened.append(file) or real_open(file, *args, **kwargs))
+	assert tool._run() == "retries: 3\n"
+	assert opened == []
+
+
+def test_read_cache_is_bounded_by_size(tmp_path):
+	cache = ReadCache(max_bytes=30, max_file_bytes=20)
+	for name, size in (("a", 15), ("b", 15), ("c", 15), ("big", 25)):
+		(tmp_path / name).write_text("x" * size)
+		cache.read(str(tmp_path / name), lambda path: open(path).read())
+
+	assert cache.size == 30
+	assert cache.evictions == 1
+	cache.read(str(tmp_path / "a"), lambda path: open(path).read())
+	assert cache.hit_rate == 0
+
+
+def test_file_read_tool_streams_compressed_files(tmp_path):
+	content = "".join(f"{line(n)}\n" for n in range(5000)).encode()
+	for name, compress in (("log.gz", gzip.compress), ("log.bz2", bz2.compress), ("log.xz", lzma.compress)):
+		path = tmp_path / name
+		path.write_bytes(compress(content))
+		tool = FileReadTool(file_path=str(path), max_bytes=1000)
+
+		assert tool._run(start_line=10, end_line=11) == f"{line(9)}\n{line(10)}\n"
+		assert tool._run(tail_lines=2) == f"{line(4998)}\n{line(4999)}\n"
+		assert tool._run(start_byte=0, end_byte=6) == "line 0"
+		assert tool._run().startswith(f"{line(0)}\n") and "[Truncated to" in tool._run()
+
+
+def test_detect_encoding():
+	assert detect_encoding("café".encode("utf-8")[:-1]) == "utf-8"
+	assert detect_encoding("café".encode("utf-16")) == "utf-16"
+	assert decode("résumé naïve".encode("utf-8-sig")) == "résumé naïve"
+	assert detect_encoding("déjà vu".encode("cp1252")) != "utf-8"
+	assert decode("déjà vu".encode("cp1252")).startswith("d") and "\ufffd" not in decode("déjà vu".encode("cp1252"))
+
+
+def test_excerpts_are_decoded_in_the_encoding_of_the_whole_file(tmp_path, storage_dir):
+	content = "".join(f"{line(n)} café\n" for n in range(300))
+	latin = tmp_path / "latin.log"
+	latin.write_bytes(("déjà vu\n" + content).encode("cp1252"))
+	# The encoding is detected on the start of the file, not on the few bytes of the excerpt.
+	whole = FileReadTool(file_path=str(latin), max_bytes=None)._run()
+	assert FileReadTool(file_path=str(latin))._run(tail_lines=1) == whole.splitlines(True)[-1]
+
+	for encoding in ("utf-16", "utf-16-be", "utf-32"):
+		path = tmp_path / f"{encoding}.log"
+		data = content.encode(encoding)
+		if encoding == "utf-16-be":
+			data = b"\xfe\xff" + data
+		path.write_bytes(data)
+		compressed = tmp_path / f"{encoding}.log.gz"
+		compressed.write_bytes(gzip.compress(data))
+		width = 4 if encoding == "utf-32" else 2
+		for tool in (FileReadTool(file_path=str(path), max_bytes=None), FileReadTool(file_path=str(compressed), max_bytes=None)):
+			assert tool._run() == content
+			# Byte ranges are aligned on code units, wherever they start.
+			assert tool._run(start_byte=width * 10 + 1, end_byte=width * 20 + 1) == content[9:19]
+			assert tool._run(start_byte=len(data) - width * 5) == "café\n"
+			assert "start_byte and end_byte" in tool._run(tail_lines=2)
+		truncated = FileReadTool(file_path=str(path), max_bytes=width * 8 + 1)._run()
+		assert truncated.startswith(content[:7]) and "\ufffd" not in truncated
+		assert "tail_lines" not in truncated
@@ -0,0 +1,175 @@
+import base64
+import io
+import tarfile
+
+from crewai_tools.tools.github_search_tool.github_search_tool import GithubSearchTool
+
+API = "https://api.github.com/repos/example/repo"
+
+
+class RecordedResponse:
+	def __init__(self, status_code, body=None, etag=None, next_url=None):
+		self.status_code = status_code
+		self.body = body
+		self.headers = {"ETag": etag} if etag else {}
+		self.links = {"next": {"url": next_url}} if next_url else {}
+		self.raw = io.BytesIO(body) if isinstance(body, bytes) else None
+
+	def json(self):
+		return self.body
+
+	def raise_for_status(self):
+		if self.status_code >= 400:
+			# Like requests.HTTPError, which is an OSError.
+			raise OSError(f"HTTP {self.status_code}")
+
+
+class RecordedSession:
+	"""Replays recorded GitHub API responses, answering 304 when the ETag sent still matches."""
+
+	def __init__(self, fixtures):
+		self.fixtures = fixtures
+		self.requests = []
+
+	def get(self, url, headers=None, params=None, stream=False):
+		self.requests.append((url, params))
+		response = self.fixtures.get(url, RecordedResponse(404))
+		if response.headers.get("ETag") and (headers or {}).get("If-None-Match") == response.headers["ETag"]:
+			return RecordedResponse(304)
+		return response
+
+
+def blob(text):
+	return {"encoding": "base64", "content": base64.b64encode(text.encode()).decode()}
+
+
+def tarball(prefix, files):
+	buffer = io.BytesIO()
+	with tarfile.open(fileobj=buffer, mode="w:gz") as archive:
+		for path, content in files.items():
+			info = tarfile.TarInfo(f"{prefix}/{path}")
+			info.size = len(content)
+			archive.addfile(info, io.BytesIO(content))
+	return buffer.getvalue()
+
+
+def issue(number, title, updated_at, pull_request=False):
+	thread = {
+		"number": number,
+		"title": title,
+		"state": "open",
+		"body": f"{title} body",
+		"comments": 0,
+		"updated_at": updated_at,
+		"html_url": f"https://github.com/example/repo/issues/{number}",
+	}
+	if pull_request:
+		thread["pull_request"] = {}
+	return thread
+
+
+def test_sync_fetches_only_deltas(storage_dir, fake_app):
+	session = RecordedSession({
+		f"{API}/commits/HEAD": RecordedResponse(200, {"sha": "c1"}, etag='"head-c1"'),
+		f"{API}/git/trees/c1": RecordedResponse(200, {"tree": [
+			{"path": "README.md", "type": "blob", "sha": "b1"},
+			{"path": "src/app.py", "type": "blob", "sha": "b2"},
+			{"path": "src", "type": "tree", "sha": "t1"},
+		]}),
+		f"{API}/git/blobs/b1": RecordedResponse(200, blob("Example readme")),
+		f"{API}/git/blobs/b2": RecordedResponse(200, blob("print('hello')")),
+		f"{API}/issues": RecordedResponse(200, [
+			issue(1, "Crash on start", "2024-01-01T00:00:00Z"),
+			issue(2, "Add feature", "2024-01-02T00:00:00Z", pull_request=True),
+		], etag='"issues-1"'),
+	})
+	tool = GithubSearchTool(github_repo="https://github.com/example/repo", content_types=["code", "issue"], session=session)
+	tool.app = fake_app
+
+	tool._sync_repo("example/repo")
+	assert fake_app.db.texts() == ["#1 Crash on start (open)\n\nCrash on start body", "Example readme", "print('hello')"]
+
+	# Nothing changed upstream: every conditional request is answered with a 304.
+	session.requests.clear()
+	tool._sync_repo("example/repo")
+	assert [url for url, _ in session.requests] == [f"{API}/commits/HEAD", f"{API}/issues"]
+
+	# A new commit only changes src/app.py and removes README.md.
+	session.fixtures.update({
+		f"{API}/commits/HEAD": RecordedResponse(200, {"sha": "c2"}, etag='"head-c2"'),
+		f"{API}/git/trees/c2": RecordedResponse(200, {"tree": [
+			{"path": "src/app.py", "type": "blob", "sha": "b3"},
+		]}),
+		f"{API}/git/blobs/b3": RecordedResponse(200, blob("print('bye')")),
+		f"{API}/issues": RecordedResponse(200, [issue(1, "Crash on start", "2024-01-01T00:00:00Z")], etag='"issues-2"'),
+	})
+	session.requests.clear()
+	tool._sync_repo("example/repo")
+	assert f"{API}/git/blobs/b1" not in [url for url, _ in session.requests]
+	assert [where["record_id"] for where in fake_app.db.deleted if "$in" in where["record_id"]] == [
+		{"$in": ["code:README.md", "code:src/app.py"]},
+	]
+	assert session.requests[-1] == (f"{API}/issues", {
+		"state": "all", "sort": "updated", "direction": "asc", "per_page": "100", "since": "2024-01-02T00:00:00Z",
+	})
+	assert fake_app.db.texts() == ["#1 Crash on start (open)\n\nCrash on start body", "print('bye')"]
+
+
+def test_sync_walks_truncated_trees_and_reads_first_sync_from_tarball(storage_dir, fake_app):
+	session = RecordedSession({
+		f"{API}/commits/HEAD": RecordedResponse(200, {"sha": "c1"}, etag='"head-c1"'),
+		f"{API}/git/trees/c1": RecordedResponse(200, {"truncated": True, "tree": [
+			{"path": "README.md", "type": "blob", "sha": "b1"},
+			{"path": "src", "type": "tree", "sha": "t1"},
+		]}),
+		f"{API}/git/trees/t1": RecordedResponse(200, {"tree": [
+			{"path": "app.py", "type": "blob", "sha": "b2"},
+			{"path": "logo.png", "type": "blob", "sha": "b3"},
+		]}),
+		f"{API}/tarball/c1": RecordedResponse(200, tarball("example-repo-c1", {
+			"README.md": b"Example readme",
+			"src/logo.png": b"\x89PNG\xff",
+		})),
+		f"{API}/git/blobs/b2": RecordedResponse(200, blob("print('hello')")),
+	})
+	tool = GithubSearchTool(github_repo="https://github.com/example/repo", content_types=["code"], session=session)
+	tool.app = fake_app
+
+	tool._sync_repo("example/repo")
+
+	assert fake_app.db.texts() == ["Example readme", "print('hello')"]
+	assert fake_app.db.deleted == []
+	# Only the file missing from the archive is fetched as a blob.
+	assert [url for url, _ in session.requests if "/git/blobs/" in url] == [f"{API}/git/blobs/b2"]
+
+	# The truncated listing is never taken as complete, so no file is removed.
+	session.fixtures.update({
+		f"{API}/commits/HEAD": RecordedResponse(200, {"sha": "c2"}, etag='"head-c2"'),
+		f"{API}/git/trees/c2": RecordedResponse(200, {"truncated": True, "tree": [
+			{"path": "README.md", "type": "blob", "sha": "b1"},
+			{"path": "src", "type": "tree", "sha": "t1"},
+		]}),
+	})
+	session.requests.clear()
+	tool._sync_repo("example/repo")
+	assert fake_app.db.texts() == ["Example readme", "print('hello')"]
+	assert not [url for url, _ in session.requests if "/git/blobs/" in url or "/tarball/" in url]
+
+
+def test_tools_syncing_other_content_types_keep_their_own_source(storage_dir, fake_app):
+	session = RecordedSession({
+		f"{API}/commits/HEAD": RecordedResponse(200, {"sha": "c1"}, etag='"head-c1"'),
+		f"{API}/git/trees/c1": RecordedResponse(200, {"tree": [{"path": "README.md", "type": "blob", "sha": "b1"}]}),
+		f"{API}/git/blobs/b1": RecordedResponse(200, blob("Example readme")),
+		f"{API}/issues": RecordedResponse(200, [issue(1, "Crash on start", "2024-01-01T00:00:00Z")], etag='"issues-1"'),
+	})
+	code = GithubSearchTool(github_repo="example/repo", content_types=["code"], session=session)
+	everything = GithubSearchTool(github_repo="example/repo", content_types=["code", "issue"], session=session)
+	code.app = everything.app = fake_app
+
+	everything._sync_repo("example/repo")
+	code._sync_repo("example/repo")
+
+	searched = [document for document, metadata in fake_app.db.documents.values() if metadata["hash"] == code._where["hash"]]
+	assert searched == ["Example readme"]
+	assert len(fake_app.db.documents) == 3
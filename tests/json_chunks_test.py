@@ -0,0 +1,93 @@
+import io
+import json
+
+import pytest
+
+from crewai_tools.tools.json_search_tool.json_chunks import json_chunks, json_leaves, json_tokens, path_pattern
+from crewai_tools.tools.json_search_tool.json_search_tool import JSONSearchTool
+
+DOCUMENT = {
+	"title": "Catalog",
+	"items": [
+		{"name": "Lamp", "price": 1.5, "stock": 2e10, "tags": ["desk", "led"], "author": {"name": "Ada"}},
+		{"name": "Chair \"Eames\"", "price": -12, "discontinued": True, "notes": None, "extras": {}},
+	],
+	"empty": [],
+}
+
+
+def leaves(text, block_size):
+	return [(path, value) for path, value in json_leaves(io.StringIO(text), block_size=block_size)]
+
+
+@pytest.mark.parametrize("block_size", [1, 2, 3, 5, 7, 16, 1 << 16])
+def test_tokens_are_the_same_at_any_block_size(block_size):
+	for text in (json.dumps(DOCUMENT), json.dumps(DOCUMENT, indent=2), "[1.5, 2e10, true, null, -0.25e-3]"):
+		assert leaves(text, block_size) == leaves(text, 1 << 20)
+
+
+def test_numbers_split_at_the_default_block_size():
+	text = "[" + " " * ((1 << 16) - 3) + "1.5]"
+
+	assert leaves(text, 1 << 16) == [((0,), 1.5)]
+
+
+def test_invalid_input_fails_without_reading_it_all():
+	with pytest.raises(ValueError):
+		list(json_tokens(io.StringIO("[1, oops" + " x" * 1000), block_size=4))
+	with pytest.raises(ValueError):
+		list(json_tokens(io.StringIO('["' + "a" * 100), block_size=8, max_token_size=32))
+	with pytest.raises(ValueError):
+		list(json_tokens(io.StringIO("[1.5.2]")))
+
+
+def test_chunks_are_records_annotated_with_their_path(tmp_path):
+	path = tmp_path / "catalog.json"
+	path.write_text(json.dumps(DOCUMENT))
+
+	chunks = {chunk.metadata["record"]: chunk for chunk in json_chunks(str(path))}
+
+	assert list(chunks) == ["$.title", "$.items[0]", "$.items[1]", "$.empty"]
+	assert chunks["$.items[0]"].text.splitlines() == [
+		"$.items[0]",
+		"name: Lamp",
+		"price: 1.5",
+		"stock: 20000000000.0",
+		"tags[0]: desk",
+		"tags[1]: led",
+		"author.name: Ada",
+	]
+	assert chunks["$.items[1]"].metadata["record_pattern"] == "$.items[*]"
+	assert "extras: {}" in chunks["$.items[1]"].text.splitlines()
+
+
+def test_json_lines_records_are_numbered_by_line(tmp_path):
+	path = tmp_path / "events.jsonl"
+	path.write_text('{"event": "start"}\n{"event": "stop"}\n')
+
+	assert [chunk.text for chunk in json_chunks(str(path))] == ["$[0]\nevent: start", "$[1]\nevent: stop"]
+
+
+def test_path_filter_restricts_the_record_or_pattern(storage_dir):
+	tool = JSONSearchTool()
+	tool._scope, tool._where = "JSONSearchTool:catalog.json", {"hash": "h"}
+
+	tool._filter_path("$.items[3]", path_pattern)
+	assert tool._where == {"hash": "h", "record": "$.items[3]"}
+
+	tool._scope, tool._where = "JSONSearchTool:catalog.json", {"hash": "h"}
+	tool._filter_path("$.items[*]", path_pattern)
+	assert tool._where == {"hash": "h", "record_pattern": "$.items[*]"}
+	assert tool._scope == "JSONSearchTool:catalog.json#record_pattern=$.items[*]"
+
+
+def test_tools_with_other_record_depths_keep_their_own_chunks(tmp_path, storage_dir, fake_app):
+	path = str(tmp_path / "catalog.json")
+	with open(path, "w") as file:
+		json.dump(DOCUMENT, file)
+	for tool in (JSONSearchTool(), JSONSearchTool(record_depth=3)):
+		tool.app = fake_app
+		tool._index_file(path, tool._manifest_path(), tool._json_chunks, tool._options_source(path, tool._options()))
+
+	records = [metadata["record"] for _, metadata in fake_app.db.documents.values()]
+	assert "$.items[0]" in records and "$.items[0].author" in records
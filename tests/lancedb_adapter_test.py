@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+lancedb = pytest.importorskip("lancedb")
+pytest.importorskip("lance")
+
+from crewai_tools.adapters.lancedb_adapter import LanceDBAdapter
+
+
+@pytest.fixture
+def table(tmp_path):
+	rng = np.random.default_rng(0)
+	vectors = rng.standard_normal((300, 32)).astype(np.float32)
+	db = lancedb.connect(str(tmp_path / "lancedb"))
+	db.create_table("docs", data=[{"vector": vector.tolist(), "text": f"row {index}"} for index, vector in enumerate(vectors)])
+	return str(tmp_path / "lancedb"), vectors
+
+
+def adapter(table, **kwargs):
+	uri, vectors = table
+	# Questions name the row whose vector, slightly moved, they are embedded as.
+	embed = lambda texts: [(vectors[int(text.split()[-1])] + 0.05).tolist() for text in texts]
+	return LanceDBAdapter(uri=uri, table_name="docs", embedding_function=embed, **kwargs)
+
+
+@pytest.mark.parametrize("quantization", ["float16", "int8"])
+@pytest.mark.parametrize("rescore_factor", [4, None])
+def test_quantized_search_finds_the_rows_lancedb_finds(table, quantization, rescore_factor):
+	exact = adapter(table).query("row 7").split("\n")
+	quantized = adapter(table, quantization=quantization, rescore_factor=rescore_factor).query("row 7").split("\n")
+
+	assert quantized[0] == exact[0] == "row 7"
+	if rescore_factor is not None:
+		assert quantized == exact
+	else:
+		assert len(quantized) == 3
+
+
+def test_quantized_vectors_are_reloaded_for_new_table_versions(table):
+	_, vectors = table
+	quantized = adapter(table, quantization="int8")
+	assert quantized.query("row 7").split("\n")[0] == "row 7"
+
+	vectors.resize((301, 32), refcheck=False)
+	vectors[300] = np.full(32, 3.0)
+	quantized._table.add([{"vector": vectors[300].tolist(), "text": "row 300"}])
+
+	assert quantized.query("row 300").split("\n")[0] == "row 300"
@@ -0,0 +1,55 @@
+from crewai_tools.tools.rag.ingestion import Chunk, parse_files
+
+
+def line_chunks(path, app_id=None):
+	with open(path, "r") as file:
+		lines = file.read().splitlines()
+	if not lines:
+		raise ValueError(f"{path} is empty")
+	return [Chunk(id=f"{app_id}-{number}", text=line, metadata={"path": path}) for number, line in enumerate(lines)]
+
+
+def write_files(tmp_path, count):
+	paths = []
+	for number in range(count):
+		path = tmp_path / f"{number}.txt"
+		path.write_text("" if number == 3 else "\n".join(f"line {line}" for line in range(number + 1)))
+		paths.append(str(path))
+	return paths
+
+
+def test_files_are_parsed_in_worker_processes_with_errors_reported(tmp_path):
+	paths = write_files(tmp_path, 6)
+
+	results = {path: (chunks, error) for path, chunks, error in parse_files(paths, "app", max_workers=2, parser=line_chunks)}
+
+	assert sorted(results) == sorted(paths)
+	assert isinstance(results[paths[3]][1], ValueError) and results[paths[3]][0] is None
+	assert [chunk.text for chunk in results[paths[2]][0]] == ["line 0", "line 1", "line 2"]
+	assert results[paths[5]][0][0].id == "app-0"
+
+
+def test_paths_are_submitted_at_most_max_in_flight_ahead(tmp_path):
+	paths = write_files(tmp_path, 8)
+	pulled = []
+
+	def listing():
+		for path in paths:
+			pulled.append(path)
+			yield path
+
+	parsed = parse_files(listing(), max_workers=2, max_in_flight=2, parser=line_chunks)
+	next(parsed)
+
+	# The first result frees a slot, which is refilled before it is yielded.
+	assert len(pulled) == 3
+	assert len(list(parsed)) == 7
+
+
+def test_single_worker_parses_in_process(tmp_path):
+	paths = write_files(tmp_path, 4)
+
+	results = list(parse_files(paths, max_workers=1, parser=line_chunks))
+
+	assert [path for path, _, _ in results] == paths
+	assert [error is not None for _, _, error in results] == [False, False, False, True]
@@ -0,0 +1,21 @@
+from crewai_tools.tools.pdf_search_tool import pdf_pages
+from crewai_tools.tools.pdf_search_tool.pdf_pages import PDFPageCache
+
+
+def test_pages_are_extracted_once_and_chunked_per_chunk_settings(tmp_path, monkeypatch):
+	extracted = []
+	page = " ".join(f"word{number}" for number in range(120))
+	monkeypatch.setattr(pdf_pages, "extract_pages", lambda path, max_workers=None: extracted.append(path) or [page, "Second page"])
+	cache = PDFPageCache(str(tmp_path))
+
+	default = cache.extract("doc.pdf", "digest")
+	small = cache.extract("doc.pdf", "digest", chunk_size=40, chunk_overlap=0)
+
+	assert extracted == ["doc.pdf"]
+	assert [number for number, _ in default] == [1, 2]
+	assert len(small) > len(default)
+	assert {number for number, _ in small} == {1, 2}
+	# Both chunkings are kept, so neither is computed again.
+	assert PDFPageCache(str(tmp_path)).extract("doc.pdf", "digest", chunk_size=40, chunk_overlap=0) == small
+	assert PDFPageCache(str(tmp_path)).extract("doc.pdf", "digest") == default
+	assert extracted == ["doc.pdf"]
@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+
+from crewai_tools.adapters.quantization import QuantizedVectors, exact_scores, top_k
+
+
+@pytest.fixture
+def vectors():
+	rng = np.random.default_rng(0)
+	return rng.standard_normal((500, 64)).astype(np.float32)
+
+
+@pytest.mark.parametrize("dtype,nbytes", [("float16", 2), ("int8", 1)])
+@pytest.mark.parametrize("metric", ["l2", "cosine", "dot"])
+def test_quantized_scores_track_exact_scores(vectors, dtype, nbytes, metric):
+	quantized = QuantizedVectors.from_array(vectors, dtype)
+	query = vectors[7] + 0.1
+
+	assert quantized.nbytes == 500 * (64 * nbytes + 8)
+	np.testing.assert_allclose(quantized.scores(query, metric), exact_scores(vectors, query, metric), rtol=0.05, atol=0.5)
+	rows, _ = quantized.search(query, 5, metric)
+	assert rows[0] == top_k(exact_scores(vectors, query, metric), 1)[0][0] == 7
+
+
+def test_quantized_vectors_grow_across_batches(vectors):
+	quantized = QuantizedVectors.from_batches(np.array_split(vectors, 3), count=100, dtype="int8")
+
+	assert len(quantized) == 500
+	assert quantized.search(vectors[499], 1)[0].tolist() == [499]
@@ -0,0 +1,99 @@
+import pytest
+
+from crewai_tools.tools.rag.cache import SemanticCache
+from crewai_tools.tools.rag.rag_tool import Adapter, RagTool
+
+
+def test_lookups_reuse_results_above_the_threshold():
+	cache = SemanticCache(threshold=0.95)
+	cache.set("docs", [1.0, 0.0], "first")
+
+	assert cache.get("docs", [10.0, 0.5]) == "first"
+	assert cache.get("docs", [1.0, 1.0]) is None
+	assert cache.get("other", [1.0, 0.0]) is None
+	assert (cache.hits, cache.misses) == (1, 2)
+	assert cache.hit_rate == pytest.approx(1 / 3)
+	with pytest.raises(ValueError):
+		SemanticCache(threshold=0)
+
+
+def test_entries_are_evicted_least_recently_used_first():
+	cache = SemanticCache(max_entries=2)
+	cache.set("docs", [1.0, 0.0, 0.0], "x")
+	cache.set("docs", [0.0, 1.0, 0.0], "y")
+	cache.get("docs", [1.0, 0.0, 0.0])
+	cache.set("docs", [0.0, 0.0, 1.0], "z")
+
+	assert cache.get("docs", [1.0, 0.0, 0.0]) == "x"
+	assert cache.get("docs", [0.0, 1.0, 0.0]) is None
+	assert cache.get("docs", [0.0, 0.0, 1.0]) == "z"
+
+
+def test_invalidating_a_scope_drops_its_subscopes():
+	cache = SemanticCache()
+	for scope in ("pdf:a", "pdf:a#record=p", "pdf:ab", "txt:b"):
+		cache.set(scope, [1.0], scope)
+
+	cache.invalidate("pdf:a")
+
+	assert cache.get("pdf:a", [1.0]) is None
+	assert cache.get("pdf:a#record=p", [1.0]) is None
+	assert cache.get("pdf:ab", [1.0]) == "pdf:ab"
+	cache.invalidate()
+	assert cache.get("txt:b", [1.0]) is None
+
+
+class UppercaseAdapter(Adapter):
+	def query(self, question: str) -> str:
+		return question.upper()
+
+
+class EmbeddingAdapter(UppercaseAdapter):
+	queries: int = 0
+
+	def query(self, question: str) -> str:
+		self.queries += 1
+		return super().query(question)
+
+	def embed(self, texts):
+		return [[1.0, float(len(text))] for text in texts]
+
+
+def test_tools_cache_only_through_adapters_that_embed():
+	cache = SemanticCache()
+	# Adapters are pydantic v1 models, set after construction as the search tools do.
+	plain = RagTool(cache=cache)
+	plain.adapter = UppercaseAdapter()
+
+	assert plain._run("hello") == "Relevant Content:\nHELLO"
+	assert (cache.hits, cache.misses) == (0, 0)
+
+	adapter = EmbeddingAdapter()
+	tool = RagTool(cache=cache)
+	tool.adapter = adapter
+	tool._run("hello")
+	assert tool._run("hello") == "Relevant Content:\nHELLO"
+	assert adapter.queries == 1
+
+
+class PackingAdapter(EmbeddingAdapter):
+	def query(self, question: str) -> str:
+		self.queries += 1
+		return "\n\n".join(self._pack([question, question.upper()]))
+
+
+def test_cache_hits_report_the_context_of_their_result():
+	adapter = PackingAdapter()
+	tool = RagTool(cache=SemanticCache())
+	tool.adapter = adapter
+
+	tool._run("first question")
+	packed = adapter.last_context
+	tool._run("x")
+	assert adapter.last_context.texts == ["x"]
+
+	# The upper-cased result is a near-duplicate, dropped when packing.
+	assert tool._run("first question") == "Relevant Content:\nfirst question"
+	assert adapter.queries == 2
+	assert adapter.last_context == packed
+	assert packed.duplicates == 1
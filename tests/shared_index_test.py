@@ -0,0 +1,96 @@
+from types import SimpleNamespace
+
+import embedchain
+
+from crewai_tools.tools.rag.cache import SemanticCache
+from crewai_tools.tools.rag.index import SharedIndex
+from crewai_tools.tools.rag.index_search_tool import IndexSearchTool
+from crewai_tools.tools.txt_search_tool.txt_search_tool import TXTSearchTool
+
+
+class RecordingApp:
+	"""Builds a fake app per `from_config` call, recording the configs it is given."""
+
+	configs = []
+
+	@classmethod
+	def from_config(cls, config=None, **kwargs):
+		cls.configs.append(config)
+		return cls()
+
+
+def searchable(fake_app):
+	"""Answers queries from every stored chunk matching `where`, as the vector store would."""
+	queries = []
+
+	def query(question, citations=True, dry_run=True, where=None):
+		queries.append(where)
+		sources = [
+			(document, metadata)
+			for document, metadata in fake_app.db.documents.values()
+			if all(metadata.get(key) == value for key, value in (where or {}).items())
+		]
+		return "", sorted(sources)
+
+	fake_app.query = query
+	fake_app.embedding_model = SimpleNamespace(embedding_fn=lambda texts: [[1.0, 0.0] for _ in texts])
+	return queries
+
+
+def test_index_app_is_created_once_on_first_use(monkeypatch, storage_dir):
+	RecordingApp.configs = []
+	monkeypatch.setattr(embedchain, "App", RecordingApp)
+	index = SharedIndex(name="research")
+
+	tools = [TXTSearchTool(index=index), IndexSearchTool(index=index)]
+
+	assert RecordingApp.configs == []
+	assert all(tool.app is None for tool in tools)
+	assert tools[0]._ensure_app() is index.app is tools[1]._ensure_app()
+	assert [config["vectordb"]["config"]["collection_name"] for config in RecordingApp.configs] == ["crewai-tools-research"]
+
+
+def test_tools_search_their_source_and_the_index_searches_all(tmp_path, storage_dir, fake_app):
+	queries = searchable(fake_app)
+	notes, plan = tmp_path / "notes.txt", tmp_path / "plan.txt"
+	notes.write_text("The budget was cut by ten percent.")
+	plan.write_text("The launch moves to March.")
+	index, cache = SharedIndex(app=fake_app), SemanticCache()
+	notes_tool = TXTSearchTool(txt=str(notes), index=index, cache=cache)
+	plan_tool = TXTSearchTool(txt=str(plan), index=index, cache=cache)
+	index_tool = index.as_tool(cache=cache)
+
+	assert "budget" in notes_tool._run(search_query="budget")
+	assert "March" not in notes_tool._run(search_query="budget")
+	assert "March" in plan_tool._run(search_query="launch")
+	everything = index_tool._run(search_query="news")
+	assert "budget" in everything and "March" in everything
+	assert f"[path: {notes}]" in everything
+
+	# Filters narrow the index-wide search and are cached apart from it.
+	assert "budget" not in index_tool._run(search_query="news", path=str(plan))
+	assert queries[-1] == {"path": str(plan)}
+	assert index_tool._scope == f"{index.scope}#path={plan}"
+
+	# Indexing a changed source drops the cached index-wide results.
+	calls = len(queries)
+	index_tool._run(search_query="news")
+	assert len(queries) == calls
+	notes.write_text("The budget was doubled.")
+	notes_tool._run(search_query="budget")
+	assert "doubled" in index_tool._run(search_query="news")
+
+
+def test_tools_with_other_chunk_settings_keep_their_own_chunks(tmp_path, storage_dir, fake_app):
+	searchable(fake_app)
+	notes = tmp_path / "notes.txt"
+	notes.write_text("The budget was cut by ten percent.")
+	index = SharedIndex(app=fake_app)
+	default = TXTSearchTool(txt=str(notes), index=index)
+	small = TXTSearchTool(txt=str(notes), index=index, chunk_size=100, chunk_overlap=0)
+
+	assert "budget" in default._run(search_query="budget")
+	assert "budget" in small._run(search_query="budget")
+	# Indexing the file for one tool does not drop the chunks of the other.
+	assert "budget" in default._run(search_query="budget")
+	assert len(fake_app.db.documents) == 2
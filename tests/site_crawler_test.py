@@ -0,0 +1,160 @@
+import hashlib
+import os
+import shutil
+import threading
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from crewai_tools.tools.rag import crawler as crawler_module
+from crewai_tools.tools.rag.crawler import SiteCrawler, normalize_url
+from crewai_tools.tools.website_search.website_search_tool import WebsiteSearchTool
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "data", "docs_site")
+
+
+class FixtureSiteHandler(SimpleHTTPRequestHandler):
+	"""Serves the fixture site with content based ETags, recording the requests it answers."""
+
+	requests = []
+
+	def send_head(self):
+		path = self.translate_path(self.path)
+		self.etag = None
+		if os.path.isfile(path):
+			with open(path, "rb") as file:
+				self.etag = f'"{hashlib.sha1(file.read()).hexdigest()}"'
+			if self.headers.get("If-None-Match") == self.etag:
+				self.requests.append((self.path, 304))
+				self.send_response(304)
+				self.end_headers()
+				return None
+		self.requests.append((self.path, 200 if os.path.exists(path) else 404))
+		return super().send_head()
+
+	def end_headers(self):
+		if getattr(self, "etag", None):
+			self.send_header("ETag", self.etag)
+		super().end_headers()
+
+	def log_message(self, format, *args):
+		pass
+
+
+@pytest.fixture
+def site(tmp_path):
+	root = tmp_path / "site"
+	shutil.copytree(FIXTURES, root)
+	FixtureSiteHandler.requests = []
+	server = ThreadingHTTPServer(("127.0.0.1", 0), partial(FixtureSiteHandler, directory=str(root)))
+	thread = threading.Thread(target=server.serve_forever, daemon=True)
+	thread.start()
+	url = f"http://127.0.0.1:{server.server_address[1]}"
+	(root / "sitemap.xml").write_text(
+		'<?xml version="1.0" encoding="UTF-8"?>'
+		'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+		f"<url><loc>{url}/docs/changelog.html</loc></url>"
+		f"<url><loc>{url}/outside.html</loc></url>"
+		"</urlset>"
+	)
+	yield url, root
+	server.shutdown()
+	server.server_close()
+
+
+def test_normalize_url():
+	assert normalize_url("HTTPS://Example.com:443/a/./b/../c.html?b=2&utm_source=x&a=1#top") == "https://example.com/a/c.html?a=1&b=2"
+	assert normalize_url("guide.html", "https://example.com/docs/") == "https://example.com/docs/guide.html"
+	assert normalize_url("https://example.com") == "https://example.com/"
+	assert normalize_url("mailto:team@example.com") is None
+
+
+def test_crawl_dedups_and_stays_in_scope(site, tmp_path):
+	url, _ = site
+	crawler = SiteCrawler(f"{url}/docs/index.html", str(tmp_path / "crawl.json"), per_host_concurrency=2)
+	delta = crawler.crawl()
+
+	assert sorted(page.url for page in delta.changed) == [
+		f"{url}/docs/api.html",
+		f"{url}/docs/changelog.html",
+		f"{url}/docs/guide.html",
+		f"{url}/docs/index.html",
+	]
+	assert delta.removed == []
+	index = next(page for page in delta.changed if page.url.endswith("index.html"))
+	assert index.title == "Docs"
+	assert "Welcome to the docs" in index.text
+	assert "tracking" not in index.text
+	pages = [path for path, _ in FixtureSiteHandler.requests if path.endswith(".html")]
+	assert sorted(pages) == ["/docs/api.html", "/docs/changelog.html", "/docs/guide.html", "/docs/index.html"]
+
+
+def test_recrawl_only_refetches_changed_pages(site, tmp_path):
+	url, root = site
+	state_path = str(tmp_path / "crawl.json")
+	crawler = SiteCrawler(f"{url}/docs/index.html", state_path)
+	crawler.crawl()
+	crawler.save()
+
+	FixtureSiteHandler.requests = []
+	assert not SiteCrawler(f"{url}/docs/index.html", state_path).crawl()
+	assert {status for path, status in FixtureSiteHandler.requests if path.endswith(".html")} == {304}
+
+	(root / "docs" / "guide.html").write_text("<html><head><title>Guide</title></head><body><main>Guide v2</main></body></html>")
+	(root / "docs" / "api.html").unlink()
+	delta = SiteCrawler(f"{url}/docs/index.html", state_path).crawl()
+	assert [(page.url, page.text) for page in delta.changed] == [(f"{url}/docs/guide.html", "Guide v2")]
+	assert delta.removed == [f"{url}/docs/api.html"]
+
+
+def test_pages_failing_to_parse_dont_stop_the_crawl(site, tmp_path, monkeypatch):
+	url, _ = site
+	state_path = str(tmp_path / "crawl.json")
+	crawler = SiteCrawler(f"{url}/docs/index.html", state_path, max_concurrency=1, use_sitemap=False)
+	crawler.crawl()
+	crawler.save()
+	parse_html = crawler_module.parse_html
+
+	def failing_parse_html(html, base_url):
+		if base_url.endswith("guide.html"):
+			raise RuntimeError("unparsable page")
+		return parse_html(html, base_url)
+
+	monkeypatch.setattr(crawler_module, "parse_html", failing_parse_html)
+	fresh = SiteCrawler(f"{url}/docs/index.html", str(tmp_path / "fresh.json"), max_concurrency=1, use_sitemap=False)
+	assert sorted(page.url for page in fresh.crawl().changed) == [f"{url}/docs/api.html", f"{url}/docs/index.html"]
+
+	# A page indexed before keeps its last version rather than being reported as removed.
+	(tmp_path / "site" / "docs" / "guide.html").write_text("<html><body><main>Guide v2</main></body></html>")
+	assert SiteCrawler(f"{url}/docs/index.html", state_path, max_concurrency=1, use_sitemap=False).crawl().removed == []
+
+
+def test_website_search_tool_embeds_changed_pages(site, storage_dir, fake_app):
+	url, root = site
+	tool = WebsiteSearchTool(website=f"{url}/docs/index.html", crawl_depth=1)
+	tool.app = fake_app
+
+	tool._index_site(tool.website, "website_search", max_depth=tool.crawl_depth, max_pages=tool.max_pages)
+	assert len(fake_app.db.documents) == 4
+
+	(root / "docs" / "guide.html").write_text("<html><body><main>Guide v2</main></body></html>")
+	tool._index_site(tool.website, "website_search", max_depth=tool.crawl_depth, max_pages=tool.max_pages)
+	assert len(fake_app.db.documents) == 4
+	assert "Guide v2" in fake_app.db.texts()
+	assert "Install the package and configure an agent." not in "\n".join(fake_app.db.texts())
+
+
+def test_crawls_with_other_options_keep_their_own_pages(site, storage_dir, fake_app):
+	url, _ = site
+	tools = [WebsiteSearchTool(website=f"{url}/docs/index.html", crawl_depth=depth) for depth in (0, 1)]
+	for tool in tools:
+		tool.app = fake_app
+		tool._index_site(tool.website, "website_search", max_depth=tool.crawl_depth, max_pages=tool.max_pages)
+
+	pages = [
+		sorted(metadata["record_id"] for _, metadata in fake_app.db.documents.values() if metadata["hash"] == tool._where["hash"])
+		for tool in tools
+	]
+	assert pages[0] == [f"{url}/docs/index.html"]
+	assert len(pages[1]) == 4
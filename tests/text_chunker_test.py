@@ -0,0 +1,72 @@
+import pytest
+
+from crewai_tools.tools.rag.chunker import TextChunker, TokenCounter
+from crewai_tools.tools.rag.ingestion import file_chunks
+
+
+@pytest.fixture
+def words():
+	counter = TokenCounter()
+	counter.encoding = None
+	return counter
+
+
+def test_chunks_respect_size_and_overlap(words):
+	text = "\n\n".join(f"Paragraph {n} has six words." for n in range(20))
+	chunks = TextChunker(chunk_size=20, chunk_overlap=6, counter=words).split(text)
+
+	assert all(count <= 20 for count in words.counts([chunk.text for chunk in chunks]))
+	for previous, chunk in zip(chunks, chunks[1:]):
+		assert chunk.text.startswith(previous.text.split("\n\n")[-1])
+	assert "Paragraph 19 has six words." in chunks[-1].text
+
+
+def test_long_paragraphs_overlap_by_their_last_sentences(words):
+	def paragraph(n):
+		return " ".join(f"Paragraph {n} sentence {m} carries a dozen words of filler text here." for m in range(5))
+
+	text = "\n\n".join(paragraph(n) for n in range(6))
+	chunks = TextChunker(chunk_size=130, chunk_overlap=30, counter=words).split(text)
+
+	assert min(words.counts([paragraph(0)])) > 50
+	assert len(chunks) > 2
+	assert all(count <= 130 for count in words.counts([chunk.text for chunk in chunks]))
+	for previous, chunk in zip(chunks, chunks[1:]):
+		shared = chunk.text.split("\n\n")[0]
+		assert previous.text.endswith(shared)
+		assert 0 < words.counts([shared])[0] <= 30
+		# Whole sentences are carried when they fit.
+		assert shared.startswith("Paragraph")
+
+
+def test_overlap_falls_back_to_tokens_without_sentences(words):
+	text = "\n\n".join(" ".join(f"p{n}w{m}" for m in range(40)) for n in range(3))
+	chunks = TextChunker(chunk_size=60, chunk_overlap=5, counter=words).split(text)
+
+	assert chunks[1].text.startswith("p0w35 p0w36 p0w37 p0w38 p0w39\n\np1w0")
+
+
+def test_long_lines_are_split_on_tokens(words):
+	text = " ".join(f"w{n}" for n in range(95))
+	chunks = TextChunker(chunk_size=30, chunk_overlap=0, counter=words).split(text)
+
+	assert [len(chunk.text.split()) for chunk in chunks] == [30, 30, 30, 5]
+	assert "".join(chunk.text for chunk in chunks) == text
+
+
+def test_markdown_sections_and_code_blocks(words, tmp_path):
+	path = tmp_path / "guide.mdx"
+	path.write_text(
+		"# Guide\n\nIntro text.\n\n## Install\n\n```bash\npip install crewai\n\npip install crewai-tools\n```\n\n"
+		"## Usage\n\nCreate an agent.\n\n# API\n\nReference.\n"
+	)
+	chunks = list(file_chunks(str(path), "mdx", chunk_size=50, chunk_overlap=0, markdown=True))
+
+	assert [(chunk.metadata["heading"], chunk.text.split("\n")[0]) for chunk in chunks] == [
+		("Guide", "# Guide"),
+		("Guide > Install", "## Install"),
+		("Guide > Usage", "## Usage"),
+		("API", "# API"),
+	]
+	assert "```bash\npip install crewai\n\npip install crewai-tools\n```" in chunks[1].text
+	assert all(chunk.metadata["url"] == str(path) and chunk.metadata["data_type"] == "mdx" for chunk in chunks)
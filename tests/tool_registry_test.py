@@ -0,0 +1,102 @@
+import json
+import sys
+from importlib.metadata import EntryPoint
+
+from crewai_tools.tools.tool_registry import tool_registry
+from crewai_tools.tools.tool_registry.tool_registry import ToolRegistry
+
+TOOL_MODULE = """
+from crewai_tools.tools.base_tool import BaseTool
+
+
+class EchoTool(BaseTool):
+	name: str = "Echo"
+	description: str = "Echoes its input"
+
+	def _run(self, text: str) -> str:
+		return text
+"""
+
+
+def write_tool_module(tmp_path, monkeypatch, name):
+	modules = tmp_path / "modules"
+	modules.mkdir()
+	(modules / f"{name}.py").write_text(TOOL_MODULE)
+	monkeypatch.syspath_prepend(str(modules))
+
+
+def test_json_tools_are_imported_on_first_get(tmp_path, monkeypatch, storage_dir):
+	write_tool_module(tmp_path, monkeypatch, "lazy_echo_tool")
+	tools_json = tmp_path / "tools.json"
+	tools_json.write_text(json.dumps([
+		{"name": "Echo", "module": "lazy_echo_tool", "class": "EchoTool"},
+		{"name": "Missing", "module": "no_such_tool_module", "class": "Missing"},
+	]))
+
+	registry = ToolRegistry(json_file=str(tools_json), entry_point_group=None)
+
+	assert registry.list_tools() == ["Echo", "Missing"]
+	assert "lazy_echo_tool" not in sys.modules
+	assert registry.get("Echo").__name__ == "EchoTool"
+	assert "lazy_echo_tool" in sys.modules
+	assert registry.get("Echo") is registry.get("Echo")
+	assert registry.get("Missing") is None
+	assert registry.get("Unknown") is None
+
+
+def test_entry_points_are_discovered_and_cached(tmp_path, monkeypatch, storage_dir):
+	write_tool_module(tmp_path, monkeypatch, "plugin_echo_tool")
+	calls = []
+
+	def fake_entry_points(group):
+		calls.append(group)
+		return [EntryPoint("PluginEcho", "plugin_echo_tool:EchoTool", group)]
+
+	monkeypatch.setattr(tool_registry, "entry_points", fake_entry_points)
+
+	assert ToolRegistry(json_file=None).list_tools() == ["PluginEcho"]
+	registry = ToolRegistry(json_file=None)
+	assert calls == ["crewai_tools.tools"]
+	assert registry.get("PluginEcho").__name__ == "EchoTool"
+
+	ToolRegistry(json_file=None, cache_discovery=False)
+	assert len(calls) == 2
+
+
+def test_entry_points_are_discovered_without_a_writable_cache(tmp_path, monkeypatch):
+	write_tool_module(tmp_path, monkeypatch, "readonly_echo_tool")
+	monkeypatch.setattr(tool_registry, "entry_points", lambda group: [EntryPoint("PluginEcho", "readonly_echo_tool:EchoTool", group)])
+	# The storage directory can't be created under a file.
+	blocker = tmp_path / "blocker"
+	blocker.write_text("")
+	monkeypatch.setenv("CREWAI_TOOLS_STORAGE_DIR", str(blocker / "storage"))
+	assert ToolRegistry(json_file=None).list_tools() == ["PluginEcho"]
+
+	def read_only(source, destination):
+		raise PermissionError(destination)
+
+	monkeypatch.setenv("CREWAI_TOOLS_STORAGE_DIR", str(tmp_path / "storage"))
+	monkeypatch.setattr(tool_registry.os, "replace", read_only)
+	assert ToolRegistry(json_file=None).list_tools() == ["PluginEcho"]
+
+
+def test_pool_shares_instances_per_config_until_released(tmp_path, monkeypatch, storage_dir):
+	write_tool_module(tmp_path, monkeypatch, "pooled_echo_tool")
+	registry = ToolRegistry(json_file=None, entry_point_group=None)
+	registry.register_spec("Echo", "pooled_echo_tool", "EchoTool")
+
+	first = registry.acquire("Echo", {"description": "a", "name": "Echo"})
+	second = registry.acquire("Echo", {"name": "Echo", "description": "a"})
+	other = registry.acquire("Echo", {"name": "Echo", "description": "b"})
+
+	assert first is second
+	assert other is not first
+	assert registry.pooled_tools() == {"Echo": 2}
+	assert registry.acquire("Unknown") is None
+
+	assert registry.release(first)
+	assert registry.acquire("Echo", {"name": "Echo", "description": "a"}) is first
+	assert registry.release(first) and registry.release(second)
+	assert registry.pooled_tools() == {"Echo": 1}
+	assert registry.acquire("Echo", {"name": "Echo", "description": "a"}) is not first
+	assert not registry.release(object())
@@ -0,0 +1,44 @@
+from crewai_tools.tools.xml_search_tool.xml_chunks import path_pattern, xml_chunks
+from crewai_tools.tools.xml_search_tool.xml_search_tool import XMLSearchTool
+
+FEED = """<?xml version="1.0"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+	<title>Releases</title>
+	<entry id="1"><title>First</title><author><name>Ada</name></author></entry>
+	<entry id="2"><title>Second</title>Mixed <b>bold</b> tail</entry>
+</feed>
+"""
+
+
+def test_chunks_are_records_annotated_with_their_xpath(tmp_path):
+	path = tmp_path / "feed.xml"
+	path.write_text(FEED)
+
+	chunks = {chunk.metadata["record"]: chunk for chunk in xml_chunks(str(path))}
+
+	assert list(chunks) == ["/feed/title[1]", "/feed/entry[1]", "/feed/entry[2]"]
+	assert chunks["/feed/entry[1]"].text.splitlines() == ["/feed/entry[1]", "@id: 1", "title[1]: First", "author[1]/name[1]: Ada"]
+	assert chunks["/feed/entry[2]"].text.splitlines()[-1] == "Mixed tail"
+	assert chunks["/feed/entry[2]"].metadata["record_pattern"] == "/feed/entry"
+
+
+def test_record_depth_and_chunk_size(tmp_path):
+	path = tmp_path / "feed.xml"
+	path.write_text(FEED)
+
+	records = [chunk.metadata["record"] for chunk in xml_chunks(str(path), record_depth=3)]
+	assert "/feed/entry[1]/author[1]" in records
+	# A record longer than the chunk size is split across chunks of the same record.
+	assert [chunk.metadata["record"] for chunk in xml_chunks(str(path), chunk_size=30)].count("/feed/entry[1]") > 1
+
+
+def test_path_filter_restricts_the_record_or_pattern(storage_dir):
+	tool = XMLSearchTool()
+	tool._scope, tool._where = "XMLSearchTool:feed.xml", {"hash": "h"}
+
+	tool._filter_path("/feed/entry[2]", path_pattern)
+	assert tool._where == {"hash": "h", "record": "/feed/entry[2]"}
+
+	tool._scope, tool._where = "XMLSearchTool:feed.xml", {"hash": "h"}
+	tool._filter_path("/feed/entry", path_pattern)
+	assert tool._where == {"hash": "h", "record_pattern": "/feed/entry"}
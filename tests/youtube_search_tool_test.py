@@ -0,0 +1,94 @@
+from crewai_tools.tools.youtube_channel_search_tool.youtube_channel_search_tool import YoutubeChannelSearchTool
+from crewai_tools.tools.youtube_video_search_tool.youtube_transcripts import TranscriptSource, youtube_video_id
+from crewai_tools.tools.youtube_video_search_tool.youtube_video_search_tool import YoutubeVideoSearchTool
+
+
+class FixtureTranscriptSource(TranscriptSource):
+	"""Serves channel listings and transcripts from fixtures, counting transcript fetches."""
+
+	def __init__(self, videos):
+		self.videos = videos
+		self.fetched = []
+
+	def channel_videos(self, handle, limit=None):
+		return [{"id": video_id, "title": title} for video_id, title, _ in self.videos][:limit]
+
+	def transcript(self, video_id):
+		self.fetched.append(video_id)
+		for fixture_id, title, text in self.videos:
+			if fixture_id == video_id:
+				return {"text": text, "title": title}
+		raise KeyError(video_id)
+
+
+def test_youtube_video_id():
+	assert youtube_video_id("https://www.youtube.com/watch?v=abc123&t=10") == "abc123"
+	assert youtube_video_id("https://youtu.be/abc123") == "abc123"
+	assert youtube_video_id("https://www.youtube.com/shorts/abc123") == "abc123"
+	assert youtube_video_id("abc123") == "abc123"
+
+
+def test_channel_sync_only_processes_new_videos(storage_dir, fake_app):
+	source = FixtureTranscriptSource([
+		("v2", "Second", "second video transcript"),
+		("v1", "First", "first video transcript"),
+	])
+	tool = YoutubeChannelSearchTool(youtube_channel_handle="@example", transcript_source=source, refresh_interval=0)
+	tool.app = fake_app
+
+	tool._sync_channel("@example")
+	assert sorted(source.fetched) == ["v1", "v2"]
+	assert fake_app.db.texts() == ["first video transcript", "second video transcript"]
+
+	source.videos.insert(0, ("v3", "Third", "third video transcript"))
+	tool._sync_channel("@example")
+	assert sorted(source.fetched) == ["v1", "v2", "v3"]
+	assert len(fake_app.db.texts()) == 3
+
+
+def test_channel_sync_limits_to_newest_videos(storage_dir, fake_app):
+	source = FixtureTranscriptSource([
+		("v3", "Third", "third video transcript"),
+		("v2", "Second", "second video transcript"),
+		("v1", "First", "first video transcript"),
+	])
+	tool = YoutubeChannelSearchTool(youtube_channel_handle="@example", transcript_source=source, max_videos=2)
+	tool.app = fake_app
+
+	tool._sync_channel("@example")
+	assert sorted(source.fetched) == ["v2", "v3"]
+
+	# Within the refresh interval the channel is not listed again.
+	source.videos.insert(0, ("v4", "Fourth", "fourth video transcript"))
+	tool._sync_channel("@example")
+	assert sorted(source.fetched) == ["v2", "v3"]
+
+
+def test_video_transcripts_are_fetched_once(storage_dir, fake_app):
+	source = FixtureTranscriptSource([("v1", "First", "first video transcript")])
+	channel_tool = YoutubeChannelSearchTool(youtube_channel_handle="@example", transcript_source=source)
+	channel_tool.app = fake_app
+	channel_tool._sync_channel("@example")
+
+	video_tool = YoutubeVideoSearchTool(youtube_video_url="https://youtu.be/v1", transcript_source=source)
+	video_tool.app = fake_app
+	video_tool._sync_video("v1")
+	video_tool._sync_video("v1")
+	assert source.fetched == ["v1"]
+	# The video is stored under both sources, so each tool's searches still find it.
+	hashes = sorted(metadata["hash"] for _, metadata in fake_app.db.documents.values())
+	assert hashes == sorted([channel_tool._where["hash"], video_tool._where["hash"]])
+
+
+def test_tools_with_other_chunk_settings_index_videos_again(storage_dir, fake_app):
+	source = FixtureTranscriptSource([("v1", "First", "first video transcript")])
+	tools = [
+		YoutubeVideoSearchTool(youtube_video_url="https://youtu.be/v1", transcript_source=source, chunk_size=size)
+		for size in (500, 200)
+	]
+	for tool in tools:
+		tool.app = fake_app
+		tool._sync_video("v1")
+
+	hashes = sorted(metadata["hash"] for _, metadata in fake_app.db.documents.values())
+	assert hashes == sorted(tool._where["hash"] for tool in tools)